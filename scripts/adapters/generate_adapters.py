@@ -3,226 +3,1013 @@
 from __future__ import annotations
 
 import argparse
-import difflib
+import hashlib
 import json
+import os
 import re
+import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
 
-TOKEN_RE = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+from scripts.checks import files, gitobjects, integrity, profiling  # noqa: E402
+from scripts.checks.manifest import DEFAULT_CACHE_PATH as MANIFEST_CACHE_PATH  # noqa: E402
+from scripts.checks.manifest import Manifest, ManifestError, load_manifest, parse_manifest  # noqa: E402
+from scripts.skills import validate_skills  # noqa: E402
 
 
-def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
-
-
-def resolve_repo_path(root: Path, raw: str, label: str) -> Path:
-    candidate = Path(raw)
-    if candidate.is_absolute():
-        raise ValueError(f"{label} must be a repository-relative path, got absolute path: {raw}")
-    resolved = (root / candidate).resolve(strict=False)
-    root_resolved = root.resolve(strict=False)
-    try:
-        resolved.relative_to(root_resolved)
-    except ValueError as exc:
-        raise ValueError(f"{label} escapes repository root: {raw}") from exc
-    return resolved
+# {{TOKEN}} substitutions and {{> name}} partial includes, in one pass.
+TOKEN_RE = re.compile(r"\{\{(?:>\s*([A-Za-z0-9_./-]+)\s*|([A-Z0-9_]+))\}\}")
+PARTIAL_SUFFIX = ".md.tmpl"
+TEMPLATE_KEYS = frozenset({"RUNNER_TITLE", "ADAPTER_ROOT"})
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = ".cache/adapters/generate-cache.json"
+STAGING_PARENT = ".cache/adapters"
 
 
-def render_template(path: Path, values: dict[str, str]) -> str:
-    text = read_text(path)
-    for key, value in values.items():
-        text = text.replace(f"{{{{{key}}}}}", value)
-
-    unresolved = sorted({m.group(1) for m in TOKEN_RE.finditer(text)})
+def read_text(path: Path) -> str:
+    return files.read_text(path)
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split once into literal text and placeholder names.
+
+    ``literals`` always has one more entry than ``tokens``; rendering interleaves
+    them. Partials are inlined at compile time, so ``partials`` lists every partial
+    file the template depends on (transitively) and ``digest`` covers their content
+    too. Renders are memoized per (digest, referenced values).
+    """
+
+    path: Path
+    digest: str
+    literals: tuple[str, ...]
+    tokens: tuple[str, ...]
+    partials: tuple[Path, ...] = ()
+
+    @property
+    def keys(self) -> frozenset[str]:
+        return frozenset(self.tokens)
+
+    def bind(self, values: dict[str, str]) -> tuple[tuple[str, str], ...]:
+        return tuple(sorted((key, values[key]) for key in self.keys))
+
+    def input_digest(self, values: dict[str, str]) -> str:
+        payload = json.dumps([self.digest, self.bind(values)], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def render(self, values: dict[str, str]) -> str:
+        cache_key = (self.digest, self.bind(values))
+        cached = _RENDER_CACHE.get(cache_key)
+        if cached is not None:
+            profiling.count("adapters.render_cache_hits")
+            return cached
+        profiling.count(f"adapters.renders:{self.path.parent.name}/{self.path.name}")
+
+        parts = [self.literals[0]]
+        for token, literal in zip(self.tokens, self.literals[1:]):
+            parts.append(values[token])
+            parts.append(literal)
+        text = "".join(parts)
+        if not text.endswith("\n"):
+            text += "\n"
+        _RENDER_CACHE[cache_key] = text
+        return text
+
+
+_TEMPLATE_CACHE: dict[Path, CompiledTemplate] = {}
+_RENDER_CACHE: dict[tuple[str, tuple[tuple[str, str], ...]], str] = {}
+
+
+def partial_path(partial_root: Path, name: str) -> Path:
+    """File for ``{{> name}}``: ``<partial_root>/<name>.md.tmpl``, which must stay under the root."""
+    path = Path(os.path.normpath(partial_root / f"{name}{PARTIAL_SUFFIX}"))
+    if not path.is_relative_to(partial_root):
+        raise ValueError(f"partial escapes the template root: {name}")
+    return path
+
+
+def compile_template(path: Path, partial_root: Path | None = None) -> CompiledTemplate:
+    """Compile ``path`` once; partials resolve under ``partial_root`` and are compiled once too."""
+    return compile_tree(path, partial_root, read_text, _TEMPLATE_CACHE)
+
+
+def compile_tree(
+    path: Path,
+    partial_root: Path | None,
+    source: Callable[[Path], str],
+    cache: dict[Path, CompiledTemplate],
+    active: tuple[Path, ...] = (),
+) -> CompiledTemplate:
+    """Compile ``path`` and its partials through ``cache``, reading files with ``source``.
+
+    ``active`` is the chain of templates being compiled; meeting one of them
+    again is an include cycle.
+    """
+    cached = cache.get(path)
+    if cached is not None:
+        return cached
+    if path in active:
+        chain = [*active[active.index(path) :], path]
+        names = " -> ".join(
+            item.relative_to(partial_root).as_posix() if partial_root else str(item) for item in chain
+        )
+        raise ValueError(f"partial include cycle: {names}")
+
+    def load(name: str) -> CompiledTemplate:
+        if partial_root is None:
+            raise ValueError(f"{path}: partial '{name}' used without a template root")
+        partial = partial_path(partial_root, name)
+        try:
+            return compile_tree(partial, partial_root, source, cache, (*active, path))
+        except FileNotFoundError:
+            raise ValueError(f"{path}: missing partial '{name}' ({partial})") from None
+
+    compiled = cache[path] = compile_text(path, source(path), load)
+    return compiled
+
+
+def compile_text(
+    path: Path, text: str, load_partial: Callable[[str], CompiledTemplate] | None = None
+) -> CompiledTemplate:
+    """Compile template ``text``; ``path`` is only used in messages and counters.
+
+    ``{{> name}}`` is replaced by the compiled partial from ``load_partial``,
+    minus one trailing newline, so a partial on a line of its own stays one block.
+    """
+    profiling.count("adapters.template_compiles")
+    literals: list[str] = [""]
+    tokens: list[str] = []
+    partials: dict[Path, None] = {}
+    digests = [text]
+    pos = 0
+    for match in TOKEN_RE.finditer(text):
+        literals[-1] += text[pos : match.start()]
+        pos = match.end()
+        name, token = match.groups()
+        if token:
+            tokens.append(token)
+            literals.append("")
+            continue
+        if load_partial is None:
+            raise ValueError(f"{path}: partial '{name}' used without a template root")
+        partial = load_partial(name)
+        partials.update(dict.fromkeys((partial.path, *partial.partials)))
+        digests.append(partial.digest)
+        inlined = list(partial.literals)
+        inlined[-1] = inlined[-1].removesuffix("\n")
+        literals[-1] += inlined[0]
+        for partial_token, literal in zip(partial.tokens, inlined[1:]):
+            tokens.append(partial_token)
+            literals.append(literal)
+    literals[-1] += text[pos:]
+
+    unresolved = sorted(set(tokens) - TEMPLATE_KEYS)
     if unresolved:
         names = ", ".join(unresolved)
         raise ValueError(f"{path}: unresolved template token(s): {names}")
 
-    if not text.endswith("\n"):
-        text += "\n"
-    return text
+    return CompiledTemplate(
+        path=path,
+        digest=hashlib.sha256("\0".join(digests).encode("utf-8")).hexdigest(),
+        literals=tuple(literals),
+        tokens=tuple(tokens),
+        partials=tuple(partials),
+    )
 
 
-def compare_or_write(
-    path: Path, content: str, check_only: bool, diffs: list[str], *, optional: bool = False
-) -> None:
-    current = read_text(path) if path.exists() else None
-    if check_only:
-        if optional and current is None:
-            return
-        if current != content:
-            old = current.splitlines() if current is not None else []
-            new = content.splitlines()
-            diff = "\n".join(
-                difflib.unified_diff(old, new, fromfile=f"{path} (current)", tofile=f"{path} (expected)", n=2)
-            )
-            diffs.append(diff)
-        return
+def invalidate_template(path: Path) -> None:
+    """Drop the compiled form of ``path``, of every template including it, and their memoized renders."""
+    stale = [
+        compiled
+        for template, compiled in _TEMPLATE_CACHE.items()
+        if template == path or path in compiled.partials
+    ]
+    digests = {compiled.digest for compiled in stale}
+    for compiled in stale:
+        del _TEMPLATE_CACHE[compiled.path]
+    for key in [key for key in _RENDER_CACHE if key[0] in digests]:
+        del _RENDER_CACHE[key]
 
-    if current == content:
-        return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
 
+def render_template(path: Path, values: dict[str, str], partial_root: Path | None = None) -> str:
+    return compile_template(path, partial_root).render(values)
 
-def resolve_runner_titles(manifest: dict) -> dict[str, str]:
-    runners = manifest.get("runners", [])
-    titles: dict[str, str] = {}
-    for item in runners:
-        name = item.get("name")
-        if not name:
-            continue
-        title = item.get("title") or name.capitalize()
-        titles[name] = title
-    return titles
 
+def compare_or_stage(
+    path: Path, content: str, check_only: bool, staged: Path | None, *, optional: bool = False
+) -> bool:
+    """Return True when ``path`` differs from ``content``.
 
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Generate adapter files from templates and validate sync with committed outputs."
-    )
-    parser.add_argument("--check", action="store_true", help="Check mode: do not write files, fail on drift.")
-    parser.add_argument("--runner", action="append", help="Limit generation/check to one or more runner IDs.")
-    parser.add_argument(
-        "--manifest",
-        default="adapters/spec/adapter-manifest.json",
-        help="Adapter manifest path (default: adapters/spec/adapter-manifest.json).",
+    The comparison is on bytes: a size mismatch is decided from ``stat`` alone and
+    the file is only read when sizes agree. In write mode, differing content is
+    written to ``staged`` so that nothing under the repository is touched until
+    every target has rendered successfully.
+    """
+    expected = content.encode("utf-8")
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        if check_only and optional:
+            return False
+        matches = False
+    else:
+        matches = size == len(expected) and files.read_bytes(path) == expected
+
+    if matches:
+        return False
+    if not check_only and staged is not None:
+        staged.parent.mkdir(parents=True, exist_ok=True)
+        staged.write_bytes(expected)
+    return True
+
+
+def render_diff(path: Path, content: str, context: int) -> str:
+    import difflib
+
+    current = files.read_text(path, errors="replace") if path.exists() else None
+    old = current.splitlines() if current is not None else []
+    new = content.splitlines()
+    return "\n".join(
+        difflib.unified_diff(old, new, fromfile=f"{path} (current)", tofile=f"{path} (expected)", n=context)
     )
-    args = parser.parse_args()
 
-    root = Path(__file__).resolve().parents[2]
-    manifest_path = root / args.manifest
-    manifest = json.loads(read_text(manifest_path))
 
-    generation = manifest.get("generation", {})
-    template_root_rel = generation.get("template_root", "adapters/templates")
-    template_root = resolve_repo_path(root, template_root_rel, "generation.template_root")
-    if not template_root.exists():
-        print(f"Template root not found: {template_root}", file=sys.stderr)
-        return 2
+class BuildCache:
+    """Persisted record of what each generated output was rendered from.
 
-    runners = manifest.get("runners", [])
-    if not runners:
-        print("Manifest has no runners.", file=sys.stderr)
-        return 2
+    An entry maps an output path to the digest of its inputs (template digest plus
+    referenced values), the digest of the content written, and the size/mtime the
+    file had when it was last known to be in sync. A target whose inputs and stat
+    still match is skipped without rendering or reading it.
+    """
 
-    available = {item.get("name") for item in runners if item.get("name")}
-    requested = set(args.runner or available)
-    unknown = sorted(requested - available)
-    if unknown:
-        print(f"Unknown runner(s): {', '.join(unknown)}", file=sys.stderr)
-        return 2
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(read_text(path))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            entries = data.get("entries")
+            if isinstance(entries, dict):
+                self.entries = entries
+
+    def is_fresh(self, key: str, inputs: str, target: Path) -> bool:
+        entry = self.entries.get(key)
+        if not entry or entry.get("inputs") != inputs:
+            return False
+        try:
+            stat = target.stat()
+        except OSError:
+            return False
+        return entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+
+    def record(self, key: str, inputs: str, target: Path, content: str) -> None:
+        if self.path is None:
+            return
+        try:
+            stat = target.stat()
+        except OSError:
+            self.entries.pop(key, None)
+            return
+        self.entries[key] = {
+            "inputs": inputs,
+            "content": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        self.dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": CACHE_VERSION, "entries": dict(sorted(self.entries.items()))}
+        tmp = self.path.with_name(self.path.name + ".partial")
+        tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        tmp.replace(self.path)
+
+
+@dataclass(frozen=True)
+class Target:
+    path: Path
+    template: Path
+    values: dict[str, str]
+    optional: bool = False
+    partial_root: Path | None = None
+
+
+@dataclass(frozen=True)
+class TargetResult:
+    target: Target
+    key: str
+    inputs: str
+    content: str | None = None
+    changed: bool = False
+    staged: Path | None = None
+    link: Path | None = None
+
+
+def sync_target(
+    target: Target, root: Path, cache: BuildCache, check_only: bool, staging_dir: Path | None
+) -> TargetResult:
+    compiled = compile_template(target.template, target.partial_root)
+    inputs = compiled.input_digest(target.values)
+    key = target.path.relative_to(root).as_posix()
+    if cache.is_fresh(key, inputs, target.path):
+        profiling.count("adapters.build_cache_hits")
+        return TargetResult(target, key, inputs)
+
+    profiling.count("adapters.build_cache_misses")
+    with profiling.phase("adapters.render"):
+        rendered = compiled.render(target.values)
+    staged = staging_dir / key if staging_dir is not None else None
+    with profiling.phase("adapters.compare"):
+        changed = compare_or_stage(target.path, rendered, check_only, staged, optional=target.optional)
+    return TargetResult(
+        target, key, inputs, content=rendered, changed=changed, staged=staged if changed else None
+    )
 
-    stage_order = manifest.get("stage_order", [])
-    if not stage_order:
-        print("Manifest missing stage_order.", file=sys.stderr)
-        return 2
 
-    runner_titles = resolve_runner_titles(manifest)
-    legacy = generation.get("legacy_mirrors", {})
-    cursor_mirror_root = legacy.get("cursor_skills_root")
-    codex_playbook_target = legacy.get("codex_playbook")
-    root_entries = legacy.get("root_entries", {})
-    if not isinstance(root_entries, dict):
-        raise ValueError("generation.legacy_mirrors.root_entries must be an object")
+def plan_targets(
+    manifest: Manifest, requested: set[str], exists: Callable[[Path], bool] = Path.exists
+) -> list[Target]:
+    """Resolve every output the manifest declares for ``requested`` runners, in generation order.
 
-    diffs: list[str] = []
-    writes = 0
+    ``exists`` decides whether a template is present; revision audits pass one
+    that looks in a commit's tree instead of the working tree.
+    """
+    template_root = manifest.template_root.path
+    targets: list[Target] = []
 
-    for runner in runners:
-        runner_id = runner.get("name")
+    for runner_id, runner in manifest.runners.items():
         if runner_id not in requested:
             continue
 
-        stage_map = runner.get("stage_adapters", {})
-        if not isinstance(stage_map, dict):
-            raise ValueError(f"runner '{runner_id}' stage_adapters must be an object")
-        runner_title = runner_titles.get(runner_id, runner_id.capitalize())
-        adapter_root = runner.get("skills_root") or f"adapters/{runner_id}/skills"
-        resolve_repo_path(root, adapter_root, f"runner '{runner_id}' skills_root")
-
         values = {
-            "RUNNER_TITLE": runner_title,
-            "ADAPTER_ROOT": adapter_root,
+            "RUNNER_TITLE": runner.title,
+            "ADAPTER_ROOT": runner.skills_root.rel,
         }
 
-        for stage in stage_order:
-            target_rel = stage_map.get(stage)
-            if not target_rel:
-                raise ValueError(f"Runner '{runner_id}' has no adapter path for stage '{stage}'.")
-            if not isinstance(target_rel, str):
-                raise ValueError(f"Runner '{runner_id}' stage '{stage}' path must be a string.")
-            stage_dir = Path(target_rel).parent.name
+        for stage in manifest.stage_order:
+            adapter = runner.stage_adapters[stage]
+            stage_dir = Path(adapter.rel).parent.name
             tmpl = template_root / "skills" / stage_dir / "SKILL.md.tmpl"
-            if not tmpl.exists():
+            if not exists(tmpl):
                 raise FileNotFoundError(f"Missing template for stage '{stage}': {tmpl}")
+            targets.append(Target(adapter.path, tmpl, values, partial_root=template_root))
 
-            rendered = render_template(tmpl, values)
-            target_path = resolve_repo_path(root, target_rel, f"runner '{runner_id}' stage '{stage}'")
-            before = target_path.read_text(encoding="utf-8") if target_path.exists() else None
-            compare_or_write(target_path, rendered, args.check, diffs)
-            if not args.check and before != rendered:
-                writes += 1
-
-            if runner_id == "cursor" and cursor_mirror_root:
-                mirror_root = resolve_repo_path(root, cursor_mirror_root, "legacy_mirrors.cursor_skills_root")
+            if runner_id == "cursor" and manifest.cursor_skills_root:
+                mirror_root = manifest.cursor_skills_root.path
                 mirror = mirror_root / stage_dir / "SKILL.md"
-                before = mirror.read_text(encoding="utf-8") if mirror.exists() else None
-                compare_or_write(mirror, rendered, args.check, diffs, optional=True)
-                if not args.check and before != rendered:
-                    writes += 1
-
-        pipeline_skill_rel = runner.get("pipeline_skill")
-        if pipeline_skill_rel:
-            if not isinstance(pipeline_skill_rel, str):
-                raise ValueError(f"Runner '{runner_id}' pipeline_skill must be a string.")
+                targets.append(Target(mirror, tmpl, values, optional=True, partial_root=template_root))
+
+        if runner.pipeline_skill:
             pipeline_tmpl = template_root / "skills" / "orchestration-pipeline" / "SKILL.md.tmpl"
-            if not pipeline_tmpl.exists():
+            if not exists(pipeline_tmpl):
                 raise FileNotFoundError(f"Missing pipeline skill template: {pipeline_tmpl}")
-            rendered_pipeline = render_template(pipeline_tmpl, values)
-            pipeline_path = resolve_repo_path(root, pipeline_skill_rel, f"runner '{runner_id}' pipeline_skill")
-            before = pipeline_path.read_text(encoding="utf-8") if pipeline_path.exists() else None
-            compare_or_write(pipeline_path, rendered_pipeline, args.check, diffs)
-            if not args.check and before != rendered_pipeline:
-                writes += 1
-
-        if runner_id == "codex" and codex_playbook_target:
+            targets.append(
+                Target(runner.pipeline_skill.path, pipeline_tmpl, values, partial_root=template_root)
+            )
+
+        if runner_id == "codex" and manifest.codex_playbook:
             legacy_tmpl = template_root / "skills" / "orchestration" / "SKILL.md.tmpl"
-            rendered_legacy = render_template(legacy_tmpl, values)
-            legacy_path = resolve_repo_path(root, codex_playbook_target, "legacy_mirrors.codex_playbook")
-            before = legacy_path.read_text(encoding="utf-8") if legacy_path.exists() else None
-            compare_or_write(legacy_path, rendered_legacy, args.check, diffs, optional=True)
-            if not args.check and before != rendered_legacy:
-                writes += 1
-
-        root_entry_path = root_entries.get(runner_id)
-        if root_entry_path:
-            if not isinstance(root_entry_path, str):
-                raise ValueError(f"legacy root entry for '{runner_id}' must be a string path")
+            playbook = manifest.codex_playbook.path
+            targets.append(Target(playbook, legacy_tmpl, values, optional=True, partial_root=template_root))
+
+        root_entry = manifest.root_entries.get(runner_id)
+        if root_entry:
             root_tmpl = template_root / "root" / f"{runner_id.upper()}.md.tmpl"
-            if not root_tmpl.exists():
+            if not exists(root_tmpl):
                 raise FileNotFoundError(f"Missing root entry template: {root_tmpl}")
-            rendered_root = render_template(root_tmpl, values)
-            target = resolve_repo_path(root, root_entry_path, f"legacy root entry for '{runner_id}'")
-            before = target.read_text(encoding="utf-8") if target.exists() else None
-            compare_or_write(target, rendered_root, args.check, diffs, optional=True)
-            if not args.check and before != rendered_root:
-                writes += 1
+            targets.append(
+                Target(root_entry.path, root_tmpl, values, optional=True, partial_root=template_root)
+            )
+
+    return targets
+
+
+def load_targets(
+    root: Path, manifest_path: Path, runner_ids: list[str] | None, cache_path: Path | None = None
+) -> list[Target]:
+    return targets_from_manifest(load_manifest(root, manifest_path, cache_path), runner_ids)
+
+
+def targets_from_manifest(
+    manifest: Manifest, runner_ids: list[str] | None, exists: Callable[[Path], bool] = Path.exists
+) -> list[Target]:
+    if not exists(manifest.template_root.path):
+        raise ManifestError(f"Template root not found: {manifest.template_root.path}")
+
+    requested = set(runner_ids or manifest.runners)
+    unknown = sorted(requested - set(manifest.runners))
+    if unknown:
+        raise ManifestError(f"Unknown runner(s): {', '.join(unknown)}")
+
+    return plan_targets(manifest, requested, exists)
+
+
+def validate_rendered(targets: list[Target], manifest: Manifest) -> list[str]:
+    """Validate every rendered output in memory, before anything is written.
+
+    ``SKILL.md`` outputs get the skill rules (frontmatter, name, line limit, deep
+    references). Outputs the manifest declares as stage adapters, pipeline skills
+    or the core playbook also get the integrity rules (gate and pmatch tokens,
+    stage order). Each rule set runs once per unique rendered content.
+    """
+    rules = integrity.expectations(manifest)
+    index = integrity.TokenIndex(
+        token for rule in rules.values() for token in (rule.gate, *rule.required, *rule.ordered) if token
+    )
+    skill_results: dict[tuple[str, str], list[str]] = {}
+    integrity_results: dict[tuple[str, integrity.Expectation], list[str]] = {}
+    failures: list[str] = []
+    for target in targets:
+        text = compile_template(target.template, target.partial_root).render(target.values)
+        messages: list[str] = []
+        if target.path.name == "SKILL.md":
+            skill_key = (text, target.path.parent.name)
+            if skill_key not in skill_results:
+                profiling.count("adapters.validations")
+                skill_results[skill_key] = validate_skills.validate_skill_text(text, target.path.parent.name)
+            messages += skill_results[skill_key]
+        rule = rules.get(target.path)
+        if rule is not None:
+            rule_key = (text, rule)
+            if rule_key not in integrity_results:
+                profiling.count("adapters.validations")
+                integrity_results[rule_key] = integrity.check_text(text, rule, index)
+            messages += integrity_results[rule_key]
+        output = target.path.relative_to(manifest.root).as_posix()
+        source = f"{output} (from {target.template.relative_to(manifest.root).as_posix()})"
+        failures.extend(f"{source}: {message}" for message in messages)
+    return failures
+
+
+def _verify_member(
+    path: Path, expected: bytes, verified: set[tuple[int, int]]
+) -> tuple[bool | None, tuple[int, int] | None]:
+    """Return whether ``path`` holds ``expected`` (None when missing) and its (device, inode).
+
+    A file whose inode is already in ``verified`` matches without being read.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None, None
+    ident = (stat.st_dev, stat.st_ino)
+    if ident in verified:
+        profiling.count("adapters.store_inode_hits")
+        return True, ident
+    if stat.st_size != len(expected) or files.read_bytes(path) != expected:
+        return False, ident
+    verified.add(ident)
+    return True, ident
+
+
+def store_results(
+    targets: list[Target], root: Path, check_only: bool, staging_dir: Path | None, pool: Executor | None = None
+) -> list[TargetResult]:
+    """Store mode: compare, and in write mode stage, each unique rendered content once.
+
+    Outputs are grouped by the digest of their rendered bytes. Within a group the
+    first matching file marks its inode as verified, so members hardlinked to it
+    pass on ``stat`` alone; other members are compared by size and only read when
+    sizes agree. In write mode one member holds the content (a file that already
+    matches, or the group's single staged blob) and every other member that is not
+    already a hardlink of it gets ``link`` set to that member's path. With a
+    ``pool``, targets render and groups are verified concurrently.
+    """
+    run = pool.map if pool is not None else map
+
+    def render(target: Target) -> tuple[bytes, str]:
+        compiled = compile_template(target.template, target.partial_root)
+        with profiling.phase("adapters.render"):
+            expected = compiled.render(target.values).encode("utf-8")
+        return expected, compiled.input_digest(target.values)
+
+    groups: dict[str, list[tuple[int, Target, str]]] = {}
+    contents: dict[str, bytes] = {}
+    for position, (target, (expected, inputs)) in enumerate(zip(targets, run(render, targets))):
+        digest = hashlib.sha256(expected).hexdigest()
+        groups.setdefault(digest, []).append((position, target, inputs))
+        contents[digest] = expected
+    profiling.count("adapters.store_groups", len(groups))
+
+    def verify(digest: str) -> list[tuple[tuple[int, Target, str], bool | None, tuple[int, int] | None]]:
+        # Members of one group share the inode set, so each group is verified in order.
+        expected = contents[digest]
+        verified: set[tuple[int, int]] = set()
+        with profiling.phase("adapters.compare"):
+            return [(member, *_verify_member(member[1].path, expected, verified)) for member in groups[digest]]
+
+    results: list[tuple[int, TargetResult]] = []
+    for digest, states in zip(groups, run(verify, list(groups))):
+        expected = contents[digest]
+        content = expected.decode("utf-8")
+        if check_only:
+            for (position, target, inputs), matches, _ in states:
+                changed = matches is False or (matches is None and not target.optional)
+                key = target.path.relative_to(root).as_posix()
+                results.append((position, TargetResult(target, key, inputs, content=content, changed=changed)))
+            continue
+
+        holder = next(((member[1].path, ident) for member, matches, ident in states if matches), None)
+        for (position, target, inputs), matches, ident in states:
+            key = target.path.relative_to(root).as_posix()
+            if holder is None:
+                blob = staging_dir / "store" / digest
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                blob.write_bytes(expected)
+                holder = (target.path, None)
+                result = TargetResult(target, key, inputs, content=content, changed=True, staged=blob)
+            elif target.path == holder[0] or (ident is not None and ident == holder[1]):
+                result = TargetResult(target, key, inputs, content=content)
+            elif matches and holder[1] is not None and ident[0] != holder[1][0]:
+                # A matching copy on another device cannot become a hardlink; leave it.
+                result = TargetResult(target, key, inputs, content=content)
+            else:
+                result = TargetResult(target, key, inputs, content=content, changed=True, link=holder[0])
+            results.append((position, result))
+    return [result for _, result in sorted(results, key=lambda item: item[0])]
+
+
+def link_or_copy(source: Path, dest: Path) -> None:
+    """Replace ``dest`` with a hardlink to ``source``, or a copy where links are not allowed."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.link")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp)
+        profiling.count("adapters.store_links")
+    except OSError:
+        shutil.copyfile(source, tmp)
+        profiling.count("adapters.store_copies")
+    os.replace(tmp, dest)
+
+
+def sync_targets(
+    targets: list[Target], root: Path, cache: BuildCache, args: argparse.Namespace
+) -> tuple[int, int]:
+    """Render, compare and (in write mode) update ``targets``.
+
+    Returns ``(mismatches, updated)``. Drift is reported on stderr as it is found.
+    With ``--store`` identical outputs are handled once per group and linked; see
+    ``store_results``.
+    """
+    staging_dir: Path | None = None
+    if not args.check:
+        staging_parent = root / STAGING_PARENT
+        staging_parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix="staging-", dir=staging_parent))
+
+    def work(target: Target) -> TargetResult:
+        return sync_target(target, root, cache, args.check, staging_dir)
+
+    mismatches = 0
+    staged: list[TargetResult] = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            # map() yields in submission order, so diffs stream deterministically
+            # while later targets are still rendering.
+            if args.store:
+                results = store_results(targets, root, args.check, staging_dir, pool)
+            else:
+                results = pool.map(work, targets)
+            for result in results:
+                if args.check and result.changed:
+                    mismatches += 1
+                    if args.list_only:
+                        print(result.key, flush=True)
+                        continue
+                    if mismatches == 1:
+                        print("FAIL: adapter sync check failed. Regenerate with:", file=sys.stderr)
+                        print("  python3 scripts/adapters/generate_adapters.py", file=sys.stderr)
+                    if mismatches <= args.max_diffs:
+                        with profiling.phase("adapters.diff"):
+                            diff = render_diff(result.target.path, result.content, args.diff_context)
+                        print(f"\n--- mismatch {mismatches} ---", file=sys.stderr)
+                        print(diff, file=sys.stderr, flush=True)
+                    continue
+                if result.staged is not None or result.link is not None:
+                    staged.append(result)
+                elif result.content is not None:
+                    cache.record(result.key, result.inputs, result.target.path, result.content)
+
+        # Every target rendered; move staged outputs into place, then link store members to them.
+        for result in sorted(staged, key=lambda result: result.link is not None):
+            if result.link is not None:
+                link_or_copy(result.link, result.target.path)
+            else:
+                result.target.path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(result.staged, result.target.path)
+            files.forget(result.target.path)
+            cache.record(result.key, result.inputs, result.target.path, result.content)
+    finally:
+        if staging_dir is not None:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        with profiling.phase("adapters.cache_save"):
+            cache.save()
+
+    return mismatches, len(staged)
+
+
+def dependency_graph(targets: list[Target]) -> dict[Path, list[Target]]:
+    """Map each template and each partial it includes to the outputs rendered from it."""
+    graph: dict[Path, list[Target]] = {}
+    for target in targets:
+        graph.setdefault(target.template, []).append(target)
+        try:
+            partials = compile_template(target.template, target.partial_root).partials
+        except (OSError, ValueError):
+            # Reported when the target renders; the template itself is still watched.
+            continue
+        for partial in partials:
+            graph.setdefault(partial, []).append(target)
+    return graph
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _manifest_cache(root: Path, args: argparse.Namespace) -> Path | None:
+    return None if args.no_cache else root / MANIFEST_CACHE_PATH
+
+
+def watch(
+    root: Path, manifest_path: Path, targets: list[Target], cache: BuildCache, args: argparse.Namespace
+) -> int:
+    """Poll the manifest and templates, regenerating only the outputs that depend on a change."""
+    graph = dependency_graph(targets)
+    snapshot = {path: _stat_key(path) for path in [manifest_path, *graph]}
+    sync_targets(targets, root, cache, args)
+    print(
+        f"watching {manifest_path.relative_to(root)} and {len(graph)} template file(s) "
+        f"for {len(targets)} output(s); Ctrl-C to stop",
+        flush=True,
+    )
+
+    try:
+        while True:
+            time.sleep(args.watch_interval)
+            changed = [path for path, key in snapshot.items() if _stat_key(path) != key]
+            if not changed:
+                continue
+            started = time.perf_counter()
+            for path in changed:
+                snapshot[path] = _stat_key(path)
+
+            dirty: dict[Path, Target] = {}
+            if manifest_path in changed:
+                try:
+                    new_targets = load_targets(root, manifest_path, args.runner, _manifest_cache(root, args))
+                except (OSError, ValueError) as exc:
+                    print(f"manifest error: {exc}", file=sys.stderr, flush=True)
+                    continue
+                previous = {target.path: target for target in targets}
+                for target in new_targets:
+                    if previous.get(target.path) != target:
+                        dirty[target.path] = target
+                targets = new_targets
+                graph = dependency_graph(targets)
+                snapshot = {path: snapshot.get(path) or _stat_key(path) for path in [manifest_path, *graph]}
+
+            for path in changed:
+                if path == manifest_path:
+                    continue
+                invalidate_template(path)
+                for target in graph.get(path, []):
+                    dirty[target.path] = target
+
+            if not dirty:
+                continue
+            # Template edits can add or drop partial includes.
+            graph = dependency_graph(targets)
+            for path in graph:
+                if path not in snapshot:
+                    snapshot[path] = _stat_key(path)
+            try:
+                _, updated = sync_targets(list(dirty.values()), root, cache, args)
+            except (OSError, ValueError) as exc:
+                print(f"render error: {exc}", file=sys.stderr, flush=True)
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(
+                f"regenerated {len(dirty)} output(s), {updated} updated in {elapsed_ms:.0f}ms",
+                flush=True,
+            )
+    except KeyboardInterrupt:
+        return 0
+
+
+class RevisionAuditor:
+    """Check adapter sync at commits read straight from the git object store.
+
+    Every blob comes through one ``git cat-file --batch`` process. Templates are
+    compiled once per blob id (and partial blob ids) and renders are memoized as
+    usual, so commits that did not touch a template reuse its compiled form. A
+    commit whose manifest, compiled templates and outputs match an audited commit
+    reuses that result.
+    """
+
+    def __init__(
+        self, root: Path, reader: gitobjects.BlobReader, manifest_rel: str, runner_ids: list[str] | None
+    ) -> None:
+        self.root = root
+        self.reader = reader
+        self.manifest_rel = manifest_rel
+        self.runner_ids = runner_ids
+        # Template blob id -> compiled variants with the partial blob ids each was built from.
+        self._templates: dict[str, list[tuple[CompiledTemplate, tuple[tuple[Path, str], ...]]]] = {}
+        self._results: dict[tuple[str | None, ...], list[str]] = {}
+
+    def audit(self, commit: str) -> list[str]:
+        """Return the repo-relative outputs out of sync at ``commit``.
+
+        Raises ``ValueError`` (including ``ManifestError``) or ``FileNotFoundError``
+        when the commit's manifest or templates are unusable.
+        """
+        manifest_spec = f"{commit}:{self.manifest_rel}"
+        manifest_blob = self.reader.read_objects([manifest_spec])[manifest_spec]
+        if manifest_blob is None:
+            raise ManifestError(f"Manifest not found at {commit[:12]}: {self.manifest_rel}")
+        manifest = parse_manifest(self.root, manifest_blob[1])
+
+        # Plan once assuming every template exists, fetch all blobs in one batch,
+        # then re-plan against what the commit actually contains.
+        planned = targets_from_manifest(manifest, self.runner_ids, exists=lambda path: True)
+        rels = sorted({self._rel(path) for target in planned for path in (target.template, target.path)})
+        blobs = self.reader.read_objects([f"{commit}:{rel}" for rel in rels])
+        present: set[Path] = set()
+        for rel in rels:
+            if blobs[f"{commit}:{rel}"] is not None:
+                present.add(self.root / rel)
+                present.update((self.root / rel).parents)
+        targets = targets_from_manifest(manifest, self.runner_ids, exists=present.__contains__)
+
+        compiled: dict[Path, CompiledTemplate] = {}
+        cache: dict[Path, CompiledTemplate] = {}
+        oids: dict[Path, str] = {}
+        for target in targets:
+            if target.template not in compiled:
+                compiled[target.template] = self._compile(commit, blobs, target, cache, oids)
+
+        def output_oid(target: Target) -> str | None:
+            found = blobs.get(f"{commit}:{self._rel(target.path)}")
+            return found[0] if found else None
+
+        key = (
+            manifest_blob[0],
+            *(item for t in targets for item in (compiled[t.template].digest, output_oid(t))),
+        )
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        drifted: list[str] = []
+        for target in targets:
+            rel = self._rel(target.path)
+            rendered = compiled[target.template].render(target.values).encode("utf-8")
+            committed = blobs.get(f"{commit}:{rel}")
+            if committed is None:
+                if not target.optional:
+                    drifted.append(rel)
+            elif committed[1] != rendered:
+                drifted.append(rel)
+        self._results[key] = drifted
+        return drifted
+
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def _blob(
+        self, commit: str, blobs: dict[str, tuple[str, bytes] | None], path: Path
+    ) -> tuple[str, bytes] | None:
+        spec = f"{commit}:{self._rel(path)}"
+        if spec not in blobs:
+            blobs.update(self.reader.read_objects([spec]))
+        return blobs[spec]
+
+    def _compile(
+        self,
+        commit: str,
+        blobs: dict[str, tuple[str, bytes] | None],
+        target: Target,
+        cache: dict[Path, CompiledTemplate],
+        oids: dict[Path, str],
+    ) -> CompiledTemplate:
+        """Compile ``target.template`` as of ``commit``, reusing an earlier compile
+        when the template blob and every partial blob it used are unchanged."""
+        found = self._blob(commit, blobs, target.template)
+        if found is None:
+            raise FileNotFoundError(f"Missing template: {target.template}")
+        for compiled, deps in self._templates.get(found[0], []):
+            if all((self._blob(commit, blobs, path) or ("",))[0] == oid for path, oid in deps):
+                return compiled
+
+        def source(path: Path) -> str:
+            blob = self._blob(commit, blobs, path)
+            if blob is None:
+                raise FileNotFoundError(f"Missing template: {path}")
+            oids[path] = blob[0]
+            return files.decode_text(blob[1])
+
+        compiled = compile_tree(target.template, target.partial_root, source, cache)
+        deps = tuple((path, oids[path]) for path in compiled.partials)
+        self._templates.setdefault(found[0], []).append((compiled, deps))
+        return compiled
+
+
+def audit_revisions(root: Path, commits: list[str], manifest_rel: str, runner_ids: list[str] | None) -> int:
+    """Report adapter sync for each commit, oldest first; 1 if any commit fails."""
+    failed = 0
+    with gitobjects.BlobReader(root) as reader:
+        auditor = RevisionAuditor(root, reader, manifest_rel, runner_ids)
+        for commit in commits:
+            try:
+                drifted = auditor.audit(commit)
+            except (ValueError, FileNotFoundError) as exc:
+                failed += 1
+                print(f"{commit[:12]} ERROR: {exc}", file=sys.stderr)
+                continue
+            if not drifted:
+                print(f"{commit[:12]} OK")
+                continue
+            failed += 1
+            print(f"{commit[:12]} FAIL: {len(drifted)} adapter file(s) out of sync", file=sys.stderr)
+            for rel in drifted:
+                print(f"  {rel}", file=sys.stderr)
+
+    if failed:
+        print(f"FAIL: {failed} of {len(commits)} commit(s) out of sync", file=sys.stderr)
+        return 1
+    print(f"OK: adapter files in sync at {len(commits)} commit(s)")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate adapter files from templates and validate sync with committed outputs."
+    )
+    parser.add_argument("--check", action="store_true", help="Check mode: do not write files, fail on drift.")
+    parser.add_argument("--runner", action="append", help="Limit generation/check to one or more runner IDs.")
+    parser.add_argument(
+        "--manifest",
+        default="adapters/spec/adapter-manifest.json",
+        help="Adapter manifest path (default: adapters/spec/adapter-manifest.json).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and do not update the incremental build cache ({DEFAULT_CACHE_PATH}) "
+        "or manifest model cache.",
+    )
+    parser.add_argument(
+        "--max-diffs",
+        type=int,
+        default=10,
+        help="Check mode: print at most N unified diffs; remaining drift is only counted (default: 10).",
+    )
+    parser.add_argument(
+        "--diff-context",
+        type=int,
+        default=2,
+        help="Check mode: context lines per unified diff (default: 2).",
+    )
+    parser.add_argument(
+        "--list",
+        "--quiet",
+        dest="list_only",
+        action="store_true",
+        help="Check mode: print only the paths of drifted files, no diffs.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Render and compare targets with N worker threads (default: 1).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Regenerate outputs whenever the manifest or a template they depend on changes.",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Validate rendered outputs against the skill and integrity rules "
+        "before comparing or writing them.",
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Group outputs by rendered content: write each unique content once and hardlink identical "
+        "outputs to it (copying where links fail); check mode verifies each group once. "
+        "With --jobs, rendering and group verification run on the worker threads.",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.05,
+        help="Watch mode: seconds between input stat polls (default: 0.05).",
+    )
+    revisions = parser.add_mutually_exclusive_group()
+    revisions.add_argument(
+        "--rev",
+        metavar="COMMIT",
+        help="Check sync at COMMIT, reading the manifest, templates and outputs from git objects.",
+    )
+    revisions.add_argument(
+        "--rev-range",
+        metavar="A..B",
+        help="Check sync at every commit in a git range (e.g. v1.0..HEAD), oldest first.",
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.watch and args.check:
+        parser.error("--watch cannot be combined with --check")
+    if args.watch and (args.rev or args.rev_range):
+        parser.error("--watch cannot be combined with --rev or --rev-range")
+    if args.validate and (args.watch or args.rev or args.rev_range):
+        parser.error("--validate cannot be combined with --watch, --rev or --rev-range")
+    profiling.start("generate_adapters", args, argv)
+
+    root = REPO_ROOT
+    if args.rev or args.rev_range:
+        try:
+            if args.rev:
+                commits = [gitobjects.resolve_commit(root, args.rev)]
+            else:
+                commits = gitobjects.rev_list(root, args.rev_range)
+            with profiling.phase("adapters.revisions"):
+                return audit_revisions(root, commits, Path(args.manifest).as_posix(), args.runner)
+        except gitobjects.GitError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+
+    manifest_path = root / args.manifest
+    try:
+        with profiling.phase("adapters.manifest_load"):
+            manifest = load_manifest(root, manifest_path, _manifest_cache(root, args))
+            targets = targets_from_manifest(manifest, args.runner)
+    except ManifestError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    except (ValueError, FileNotFoundError) as exc:
+        print(f"template error: {exc}", file=sys.stderr)
+        return 2
+    with profiling.phase("adapters.cache_load"):
+        cache = BuildCache(None if args.no_cache else root / DEFAULT_CACHE_PATH)
+
+    # Compile errors (include cycles, missing partials, unknown tokens) are usage
+    # errors, not drift; sync_targets stages writes, so nothing has been touched.
+    try:
+        if args.validate:
+            with profiling.phase("adapters.validate"):
+                failures = validate_rendered(targets, manifest)
+            if failures:
+                print("FAIL: rendered adapter output failed validation:", file=sys.stderr)
+                for failure in failures:
+                    print(f"  - {failure}", file=sys.stderr)
+                return 1
+        if args.watch:
+            return watch(root, manifest_path, targets, cache, args)
+        with profiling.phase("adapters.sync"):
+            mismatches, updated = sync_targets(targets, root, cache, args)
+    except (ValueError, FileNotFoundError) as exc:
+        print(f"template error: {exc}", file=sys.stderr)
+        return 2
 
     if args.check:
-        if diffs:
-            print("FAIL: adapter sync check failed. Regenerate with:", file=sys.stderr)
-            print("  python3 scripts/adapters/generate_adapters.py", file=sys.stderr)
-            for idx, diff in enumerate(diffs, start=1):
-                print(f"\n--- mismatch {idx} ---", file=sys.stderr)
-                print(diff, file=sys.stderr)
+        if mismatches:
+            if args.list_only:
+                print(f"FAIL: {mismatches} adapter file(s) out of sync", file=sys.stderr)
+            elif mismatches > args.max_diffs:
+                hidden = mismatches - args.max_diffs
+                print(f"\n... {hidden} more mismatch(es) not shown (raise --max-diffs)", file=sys.stderr)
             return 1
         print("OK: adapter templates and generated files are in sync")
         return 0
 
-    print(f"OK: generated adapter files ({writes} file(s) updated)")
+    print(f"OK: generated adapter files ({updated} file(s) updated)")
     return 0
 
 
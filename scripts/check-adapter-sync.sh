@@ -8,4 +8,5 @@ if ! command -v python3 >/dev/null 2>&1; then
   exit 2
 fi
 
-python3 "$root_dir/scripts/adapters/generate_adapters.py" --check
+cd "$root_dir"
+exec python3 -m scripts.checks adapters
@@ -4,46 +4,101 @@ from __future__ import annotations
 
 import argparse
 import fnmatch
+import hashlib
+import json
+import os
 import re
+import stat
+import subprocess
 import sys
-from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-INLINE_LINK_RE = re.compile(r"!\[[^\]]*]\(([^)]+)\)|\[[^\]]+]\(([^)]+)\)")
-REFERENCE_DEF_RE = re.compile(r"^\s*\[([^\]]+)]:\s*(\S+)\s*$")
-REFERENCE_USE_RE = re.compile(r"(?<!!)\[([^\]]+)\]\[([^\]]*)\]")
-HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*$")
-SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
-
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
 
-def _read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="replace")
+from scripts.checks import files as file_cache  # noqa: E402
+from scripts.checks import gitobjects  # noqa: E402
+from scripts.checks.links import (  # noqa: E402
+    Document,
+    extract_target,
+    normalize_ref_label,
+    parse_file,
+    parse_markdown,
+)
+from scripts.checks import profiling  # noqa: E402
+from scripts.checks import urls  # noqa: E402
 
 
-def _strip_code_fences(text: str) -> str:
-    lines = text.splitlines()
-    out: list[str] = []
-    in_fence = False
-    for line in lines:
-        if line.strip().startswith("```"):
-            in_fence = not in_fence
-            continue
-        if not in_fence:
-            out.append(line)
-    return "\n".join(out)
+SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+DEFAULT_GRAPH_PATH = ".cache/links/link-graph.json"
+DEFAULT_URL_CACHE_PATH = ".cache/links/external-cache.json"
+DEFAULT_CONFIG_PATH = "scripts/check-markdown-links.json"
+# Used when the repository has no config file.
+DEFAULT_INCLUDE = ["README.md", "AGENTS.md", "docs/*.md"]
+GRAPH_VERSION = 1
 
 
-def _normalize_ref_label(label: str) -> str:
-    return re.sub(r"\s+", " ", label.strip().lower())
+def _read_text(path: Path) -> str:
+    return file_cache.read_text(path, errors="replace")
+
+
+# Per-run document index: parsed documents, resolved link paths and stat results.
+_DOCUMENTS: dict[Path, Document | None] = {}
+_LOCATIONS: dict[tuple[Path, str], Path | None] = {}
+_STATUS: dict[Path, tuple[bool, bool]] = {}
+
+
+def _document(path: Path) -> Document | None:
+    """Parse ``path`` at most once per run; None when it is not a readable file."""
+    if path in _DOCUMENTS:
+        return _DOCUMENTS[path]
+    doc = parse_file(path)
+    _DOCUMENTS[path] = doc
+    return doc
+
+
+def _index_documents(files: list[Path], jobs: int) -> None:
+    """Phase one: parse every candidate document, on a process pool when ``jobs`` > 1."""
+    pending = [file for file in files if file not in _DOCUMENTS]
+    if jobs > 1 and len(pending) > 1:
+        chunksize = max(1, len(pending) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            docs = list(pool.map(parse_file, pending, chunksize=chunksize))
+    else:
+        docs = [parse_file(file) for file in pending]
+    for file, doc in zip(pending, docs):
+        _DOCUMENTS[file] = doc
+        if doc is not None:
+            _STATUS[file] = (True, True)
+
+
+def _locate(base: Path, path_part: str, root: Path) -> Path | None:
+    """Resolve a relative link once per (directory, path); None when it escapes ``root``."""
+    key = (base, path_part)
+    if key in _LOCATIONS:
+        return _LOCATIONS[key]
+    dest: Path | None = (base / path_part).resolve(strict=False)
+    try:
+        dest.relative_to(root.resolve(strict=False))
+    except ValueError:
+        dest = None
+    _LOCATIONS[key] = dest
+    return dest
 
 
-def _extract_target(raw: str) -> str:
-    target = raw.strip()
-    if target.startswith("<") and target.endswith(">"):
-        target = target[1:-1].strip()
-    if " " in target:
-        target = target.split(" ", 1)[0]
-    return target
+def _status(path: Path) -> tuple[bool, bool]:
+    """Return ``(exists, is_file)`` for ``path``, stat-ing each path at most once."""
+    status = _STATUS.get(path)
+    if status is None:
+        profiling.count("links.stats")
+        try:
+            status = (True, stat.S_ISREG(os.stat(path).st_mode))
+        except (OSError, ValueError):
+            status = (False, False)
+        _STATUS[path] = status
+    return status
 
 
 def _is_external(target: str) -> bool:
@@ -52,51 +107,161 @@ def _is_external(target: str) -> bool:
     return SCHEME_RE.match(target) is not None
 
 
-def _slugify(text: str) -> str:
-    value = text.strip().lower()
-    value = re.sub(r"[^\w\s-]", "", value)
-    value = re.sub(r"\s+", "-", value)
-    value = re.sub(r"-{2,}", "-", value)
-    return value.strip("-")
+def _anchors_for_file(path: Path) -> set[str]:
+    profiling.count("links.anchor_cache.hits" if path in _DOCUMENTS else "links.anchor_cache.misses")
+    doc = _document(path)
+    return doc.anchors if doc is not None else set()
 
 
-@lru_cache(maxsize=512)
-def _anchors_for_file(path: Path) -> set[str]:
-    anchors: set[str] = set()
-    if not path.exists() or not path.is_file():
-        return anchors
+def _compile_globs(patterns: list[str]) -> re.Pattern[str] | None:
+    """Compile fnmatch-style globs into one alternation, matched once per path.
+
+    As with ``fnmatch``, ``*`` also matches ``/``: ``*.md`` selects Markdown files
+    at any depth, and ``docs/*`` everything under ``docs/``.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
+def _gitignore_regex(pattern: str) -> tuple[re.Pattern[str], bool]:
+    """Translate one .gitignore pattern (relative to its directory) into a regex.
+
+    Returns ``(regex, dir_only)``. Supports ``*``, ``?``, ``[...]``, ``**``,
+    leading ``/`` anchoring and trailing ``/`` for directories.
+    """
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                out.append("[" + pattern[i + 1 : end].replace("\\", "\\\\") + "]")
+                i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(prefix + "".join(out) + r"\Z"), dir_only
+
+
+def _load_gitignore(directory: Path) -> list[tuple[re.Pattern[str], bool, bool]]:
     try:
-        text = _strip_code_fences(_read_text(path))
+        lines = _read_text(directory / ".gitignore").splitlines()
     except OSError:
-        return anchors
-    for line in text.splitlines():
-        match = HEADING_RE.match(line)
-        if not match:
+        return []
+    rules: list[tuple[re.Pattern[str], bool, bool]] = []
+    for raw in lines:
+        line = raw.rstrip()
+        if not line or line.startswith("#"):
             continue
-        heading = match.group(1).strip()
-        if not heading:
+        negate = line.startswith("!")
+        regex, dir_only = _gitignore_regex(line[1:] if negate else line)
+        rules.append((regex, dir_only, negate))
+    return rules
+
+
+def _walk_files(root: Path) -> list[str]:
+    """List files under ``root`` with os.scandir, honoring nested .gitignore files."""
+    found: list[str] = []
+    # Each stack entry: (directory, repo-relative prefix, inherited rules as (base prefix, rules)).
+    stack: list[tuple[Path, str, list[tuple[str, list]]]] = [(root, "", [])]
+    while stack:
+        directory, prefix, inherited = stack.pop()
+        rules = _load_gitignore(directory)
+        scopes = inherited + [(prefix, rules)] if rules else inherited
+        try:
+            with os.scandir(directory) as entries:
+                listing = [(entry.name, entry.is_dir(follow_symlinks=False)) for entry in entries]
+        except OSError:
             continue
-        anchors.add(_slugify(heading))
-    return anchors
-
-
-def _iter_markdown_files(root: Path, excludes: list[str]) -> list[Path]:
-    candidates = [root / "README.md", root / "AGENTS.md"]
-    docs_root = root / "docs"
-    if docs_root.exists():
-        candidates.extend(sorted(docs_root.rglob("*.md")))
-
-    seen: set[Path] = set()
+        for name, is_dir in listing:
+            if name == ".git":
+                continue
+            rel = prefix + name
+            ignored = False
+            for base, scope_rules in scopes:
+                local = rel[len(base) :]
+                for regex, dir_only, negate in scope_rules:
+                    if dir_only and not is_dir:
+                        continue
+                    if regex.match(local):
+                        ignored = not negate
+            if ignored:
+                continue
+            if is_dir:
+                stack.append((directory / name, rel + "/", scopes))
+            else:
+                found.append(rel)
+    return found
+
+
+def _list_repo_files(root: Path) -> list[str]:
+    """Repo-relative paths of tracked and untracked-but-not-ignored files.
+
+    Uses one ``git ls-files -z`` call inside a work tree and falls back to a
+    .gitignore-aware directory walk otherwise.
+    """
+    try:
+        out = subprocess.run(
+            ["git", "-C", str(root), "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            check=True,
+            capture_output=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return _walk_files(root)
+    return [path for path in out.decode("utf-8", errors="surrogateescape").split("\0") if path]
+
+
+def _load_config(root: Path, config_path: str | None) -> dict[str, list[str]]:
+    path = Path(config_path) if config_path else root / DEFAULT_CONFIG_PATH
+    if not path.is_absolute():
+        path = root / path
+    config = {"include": list(DEFAULT_INCLUDE), "exclude": []}
+    if not path.exists():
+        if config_path:
+            raise ValueError(f"config file not found: {path}")
+        return config
+    data = json.loads(_read_text(path))
+    for key in ("include", "exclude"):
+        value = data.get(key, config[key])
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise ValueError(f"{path}: '{key}' must be a list of glob strings")
+        config[key] = value
+    return config
+
+
+def _iter_markdown_files(root: Path, excludes: list[str], includes: list[str] | None = None) -> list[Path]:
+    include_re = _compile_globs(includes if includes is not None else DEFAULT_INCLUDE)
+    exclude_re = _compile_globs(excludes)
     out: list[Path] = []
-    for file in candidates:
-        if not file.exists() or not file.is_file():
+    for rel in sorted(set(_list_repo_files(root))):
+        if include_re is None or not include_re.match(rel):
             continue
-        if file in seen:
+        if exclude_re is not None and exclude_re.match(rel):
             continue
-        rel = file.relative_to(root).as_posix()
-        if any(fnmatch.fnmatch(rel, pattern) for pattern in excludes):
+        file = root / rel
+        if not file.is_file():
             continue
-        seen.add(file)
         out.append(file)
     return out
 
@@ -106,6 +271,7 @@ def _validate_target(
     target: str,
     root: Path,
     strict: bool,
+    deps: set[Path] | None = None,
 ) -> str | None:
     if not target:
         return "empty link target"
@@ -121,18 +287,18 @@ def _validate_target(
         return None
 
     path_part, _, anchor = target.partition("#")
-    dest = (source_file.parent / path_part).resolve(strict=False)
-    root_real = root.resolve(strict=False)
-    try:
-        dest.relative_to(root_real)
-    except ValueError:
+    dest = _locate(source_file.parent, path_part, root)
+    if dest is None:
         return f"target escapes repository root: {target}"
 
-    if not dest.exists():
+    if deps is not None:
+        deps.add(dest)
+    exists, is_file = _status(dest)
+    if not exists:
         return f"missing target: {target}"
 
     if strict and anchor:
-        if not dest.is_file():
+        if not is_file:
             return f"anchor '#{anchor}' points to non-file target: {target}"
         anchors = _anchors_for_file(dest)
         if anchor not in anchors:
@@ -140,40 +306,328 @@ def _validate_target(
     return None
 
 
-def _check_file(path: Path, root: Path, strict: bool) -> list[str]:
-    text = _strip_code_fences(_read_text(path))
-    errors: list[str] = []
+def _link_targets(doc: Document) -> list[str | None]:
+    """Every link target in ``doc``: inline links, then used reference definitions (None if undefined)."""
+    targets: list[str | None] = [extract_target(raw) for raw in doc.links]
+    targets += [doc.reference_defs.get(normalize_ref_label(label)) for label in doc.reference_uses]
+    return targets
 
-    reference_defs: dict[str, str] = {}
-    for line in text.splitlines():
-        match = REFERENCE_DEF_RE.match(line)
-        if not match:
+
+def _check_external(files: list[Path], root: Path, args: argparse.Namespace) -> list[str]:
+    """Check every http(s) link in ``files`` once, however many files share it."""
+    sources: dict[str, list[Path]] = {}
+    for file in files:
+        doc = _document(file)
+        if doc is None:
             continue
-        label = _normalize_ref_label(match.group(1))
-        target = _extract_target(match.group(2))
-        reference_defs[label] = target
-
-    for match in INLINE_LINK_RE.finditer(text):
-        raw = match.group(1) or match.group(2) or ""
-        target = _extract_target(raw)
-        error = _validate_target(path, target, root, strict)
+        for target in _link_targets(doc):
+            if not target or not _is_external(target):
+                continue
+            url = f"https:{target}" if target.startswith("//") else target
+            if not url.lower().startswith(("http://", "https://")):
+                continue
+            url = url.partition("#")[0]
+            if file not in sources.setdefault(url, []):
+                sources[url].append(file)
+    cache_path = None if args.external_ttl <= 0 else root / DEFAULT_URL_CACHE_PATH
+    results = urls.check_urls(
+        list(sources),
+        cache_path,
+        args.external_ttl,
+        per_host=args.external_per_host,
+        timeout=args.external_timeout,
+    )
+    errors: list[str] = []
+    for url, result in results.items():
+        if not result.ok:
+            detail = f"dead external link ({result.detail}): {url}"
+            errors.extend(f"{file.relative_to(root)}: {detail}" for file in sources[url])
+    return errors
+
+
+def _check_file(path: Path, root: Path, strict: bool, deps: set[Path] | None = None) -> list[str]:
+    """Check every link in ``path``; destinations inside ``root`` are added to ``deps``."""
+    doc = _document(path)
+    if doc is None:
+        return [f"{path.relative_to(root)}: unreadable file"]
+    errors: list[str] = []
+
+    for raw in doc.links:
+        target = extract_target(raw)
+        error = _validate_target(path, target, root, strict, deps)
         if error:
             errors.append(f"{path.relative_to(root)}: {error}")
 
-    for match in REFERENCE_USE_RE.finditer(text):
-        label = _normalize_ref_label(match.group(2) or match.group(1))
-        target = reference_defs.get(label)
+    for raw_label in doc.reference_uses:
+        label = normalize_ref_label(raw_label)
+        target = doc.reference_defs.get(label)
         if not target:
             errors.append(f"{path.relative_to(root)}: missing reference definition [{label}]")
             continue
-        error = _validate_target(path, target, root, strict)
+        error = _validate_target(path, target, root, strict, deps)
         if error:
             errors.append(f"{path.relative_to(root)}: {error}")
 
     return errors
 
 
-def main() -> int:
+class LinkGraph:
+    """Persisted link graph for incremental runs.
+
+    ``sources`` maps each checked file to its content digest, the repo-relative
+    paths its links resolve to, and the errors it produced. ``nodes`` records a
+    stat signature (and digest for files) for every source and link target, and
+    ``backlinks`` is the reverse of ``targets``. A run only re-checks sources that
+    changed or that link to a node that changed, appeared or disappeared.
+    """
+
+    def __init__(self, path: Path, config: dict) -> None:
+        self.path = path
+        self.config = config
+        self.sources: dict[str, dict] = {}
+        self.nodes: dict[str, dict | None] = {}
+        self.loaded = False
+        if not path.exists():
+            return
+        try:
+            data = json.loads(_read_text(path))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != GRAPH_VERSION or data.get("config") != config:
+            return
+        self.sources = data.get("sources", {})
+        self.nodes = data.get("nodes", {})
+        self.loaded = True
+
+    def backlinks(self) -> dict[str, list[str]]:
+        reverse: dict[str, list[str]] = {}
+        for source, entry in sorted(self.sources.items()):
+            for target in entry.get("targets", []):
+                reverse.setdefault(target, []).append(source)
+        return reverse
+
+    def save(self) -> None:
+        referenced = set(self.sources)
+        for entry in self.sources.values():
+            referenced.update(entry.get("targets", []))
+        nodes = {rel: self.nodes.get(rel) for rel in sorted(referenced)}
+        payload = {
+            "version": GRAPH_VERSION,
+            "config": self.config,
+            "sources": dict(sorted(self.sources.items())),
+            "nodes": nodes,
+            "backlinks": self.backlinks(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".partial")
+        tmp.write_text(json.dumps(payload, indent=1) + "\n", encoding="utf-8")
+        tmp.replace(self.path)
+
+
+def _node_state(path: Path) -> dict | None:
+    try:
+        info = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    is_file = stat.S_ISREG(info.st_mode)
+    state: dict = {"mtime_ns": info.st_mtime_ns, "size": info.st_size, "is_file": is_file}
+    if is_file:
+        state["digest"] = hashlib.sha256(file_cache.read_bytes(path)).hexdigest()
+    return state
+
+
+def _node_changed(path: Path, recorded: dict | None) -> bool:
+    try:
+        info = os.stat(path)
+    except (OSError, ValueError):
+        return recorded is not None
+    if recorded is None:
+        return True
+    if (info.st_mtime_ns, info.st_size) == (recorded.get("mtime_ns"), recorded.get("size")):
+        return False
+    # Touched but possibly identical: fall back to the content digest.
+    current = _node_state(path)
+    if current is None or current.get("digest") is None or current.get("digest") != recorded.get("digest"):
+        return True
+    recorded.update(current)
+    return False
+
+
+def _git_changed_paths(root: Path, rev: str) -> set[str]:
+    def git(*args: str) -> list[str]:
+        out = subprocess.run(
+            ["git", "-C", str(root), *args], check=True, capture_output=True, text=True
+        ).stdout
+        return [line for line in out.splitlines() if line]
+
+    # Both commands run in ``root`` and print paths relative to it.
+    changed = git("diff", "--name-only", "--relative", rev, "--")
+    changed += git("ls-files", "--others", "--exclude-standard")
+    return set(changed)
+
+
+def _dirty_nodes(root: Path, graph: LinkGraph, changed_since: str | None) -> set[str]:
+    """Graph nodes whose stat or digest moved since the graph was saved, plus ``git diff`` paths.
+
+    ``--changed-since`` only ever adds paths: a change committed after the graph
+    was saved is invisible to ``git diff REV`` but still shows up in the stamps.
+    """
+    dirty = {rel for rel, recorded in graph.nodes.items() if _node_changed(root / rel, recorded)}
+    if changed_since:
+        dirty |= _git_changed_paths(root, changed_since)
+    return dirty
+
+
+def _check_incremental(
+    files: list[Path], root: Path, args: argparse.Namespace, graph: LinkGraph
+) -> tuple[list[str], int]:
+    """Re-check only the sources affected by changes since the graph was saved.
+
+    Returns ``(errors, rechecked)``; errors for untouched sources come from the graph.
+    """
+    rels = {file: file.relative_to(root).as_posix() for file in files}
+    dirty_nodes = _dirty_nodes(root, graph, args.changed_since) if graph.loaded else None
+
+    if dirty_nodes is None:
+        recheck = list(files)
+    else:
+        backlinks = graph.backlinks()
+        affected = set(dirty_nodes)
+        for node in dirty_nodes:
+            affected.update(backlinks.get(node, []))
+        recheck = [file for file in files if rels[file] in affected or rels[file] not in graph.sources]
+
+    with profiling.phase("links.index"):
+        _index_documents(recheck, args.jobs)
+    rechecked = set(recheck)
+    errors: list[str] = []
+    for file in files:
+        rel = rels[file]
+        if file not in rechecked:
+            errors.extend(graph.sources[rel].get("errors", []))
+            continue
+        deps: set[Path] = set()
+        file_errors = _check_file(file, root, args.strict, deps)
+        targets = sorted({dep.relative_to(root).as_posix() for dep in deps})
+        graph.sources[rel] = {"targets": targets, "errors": file_errors}
+        for node in [rel, *targets]:
+            if dirty_nodes is None or node in dirty_nodes or node not in graph.nodes:
+                graph.nodes[node] = _node_state(root / node)
+        graph.sources[rel]["digest"] = (graph.nodes.get(rel) or {}).get("digest")
+        errors.extend(file_errors)
+
+    live = set(rels.values())
+    for rel in [rel for rel in graph.sources if rel not in live]:
+        del graph.sources[rel]
+    return errors, len(recheck)
+
+
+def _check_staged(
+    root: Path, args: argparse.Namespace, includes: list[str], excludes: list[str], config: dict
+) -> tuple[list[str], int]:
+    """Check staged Markdown exactly as it will be committed.
+
+    Sources are the staged files selected by the discovery globs, plus files the
+    saved link graph records as linking to a staged path. Without a graph, a
+    staged delete or rename scans every indexed document for links to the removed
+    path instead. Their content, the existence of link targets, and anchors all
+    come from the index through one ``git cat-file --batch`` process; the working
+    tree is never read.
+    """
+    top = gitobjects.toplevel(root)
+    prefix = "" if root == top.resolve() else root.relative_to(top.resolve()).as_posix() + "/"
+
+    def to_rel(git_path: str) -> str | None:
+        return git_path[len(prefix) :] if git_path.startswith(prefix) else None
+
+    index = {rel for rel in map(to_rel, gitobjects.index_paths(top)) if rel}
+    changed, deleted = gitobjects.staged_changes(top)
+    touched = {rel for rel in map(to_rel, changed + deleted) if rel}
+    include_re = _compile_globs(includes)
+    exclude_re = _compile_globs(excludes)
+
+    def selected(rel: str) -> bool:
+        if rel not in index or include_re is None or not include_re.match(rel):
+            return False
+        return exclude_re is None or not exclude_re.match(rel)
+
+    sources = {rel for rel in touched if selected(rel)}
+    graph = LinkGraph(root / DEFAULT_GRAPH_PATH, config)
+    if graph.loaded:
+        backlinks = graph.backlinks()
+        for rel in touched:
+            sources.update(source for source in backlinks.get(rel, []) if selected(source))
+    removed = {rel for rel in map(to_rel, deleted) if rel}
+    # Without a graph nothing says who links to a deleted or renamed path; scan every indexed file.
+    scan_all = not graph.loaded and bool(removed)
+    if not sources and not scan_all:
+        return [], 0
+
+    # Seed the stat cache from the index so targets resolve as they will be committed.
+    _STATUS[root] = (True, False)
+    for rel in index:
+        _STATUS[root / rel] = (True, True)
+        parent = Path(rel).parent
+        while parent != Path(".") and (root / parent) not in _STATUS:
+            _STATUS[root / parent] = (True, False)
+            parent = parent.parent
+
+    with gitobjects.BlobReader(top) as reader:
+
+        def load(rels: list[str]) -> None:
+            blobs = reader.read_many([f":{prefix}{rel}" for rel in rels])
+            for rel in rels:
+                data = blobs.get(f":{prefix}{rel}")
+                text = data.decode("utf-8", errors="replace") if data is not None else None
+                _DOCUMENTS[root / rel] = parse_markdown(text) if text is not None else None
+
+        if scan_all:
+            candidates = sorted(rel for rel in index if selected(rel) and rel not in sources)
+            load(candidates)
+            gone: set[Path] = set()
+            for rel in removed:
+                gone.add(root / rel)
+                # A link to a directory breaks too once its last indexed file is removed.
+                gone.update(parent for parent in (root / rel).parents if parent not in _STATUS)
+            for rel in candidates:
+                doc = _DOCUMENTS[root / rel]
+                if doc is not None and _links_into(doc, (root / rel).parent, root, gone):
+                    sources.add(rel)
+        load(sorted(rel for rel in sources if root / rel not in _DOCUMENTS))
+        anchored: set[str] = set()
+        for rel in sources:
+            doc = _DOCUMENTS[root / rel]
+            if doc is None:
+                continue
+            for target in _link_targets(doc):
+                if not target or target.startswith("#") or _is_external(target):
+                    continue
+                path_part, _, anchor = target.partition("#")
+                dest = _locate((root / rel).parent, path_part, root)
+                if dest is None:
+                    continue
+                status = _STATUS.setdefault(dest, (False, False))
+                if args.strict and anchor and status == (True, True) and dest not in _DOCUMENTS:
+                    anchored.add(dest.relative_to(root).as_posix())
+        load(sorted(anchored))
+
+    errors: list[str] = []
+    for rel in sorted(sources):
+        errors.extend(_check_file(root / rel, root, args.strict))
+    return errors, len(sources)
+
+
+def _links_into(doc: Document, base: Path, root: Path, paths: set[Path]) -> bool:
+    """True when a relative link in ``doc`` (a file in ``base``) resolves to one of ``paths``."""
+    for target in _link_targets(doc):
+        if not target or target.startswith("#") or _is_external(target):
+            continue
+        if _locate(base, target.partition("#")[0], root) in paths:
+            return True
+    return False
+
+
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Check relative markdown links.")
     parser.add_argument("--root", default=".", help="Repository root (default: current directory)")
     parser.add_argument(
@@ -185,23 +639,144 @@ def main() -> int:
         "--exclude",
         action="append",
         default=[],
-        help="Glob pattern (repo-relative) to exclude, can be repeated",
+        help="Glob pattern (repo-relative, fnmatch: '*' also matches '/') to exclude, can be repeated; "
+        "added to the config excludes",
+    )
+    parser.add_argument(
+        "--config",
+        help=f"Discovery config with 'include'/'exclude' glob lists (default: <root>/{DEFAULT_CONFIG_PATH})",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse documents with N worker processes before resolving links (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Only re-check files affected by changes recorded in the link graph ({DEFAULT_GRAPH_PATH})",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--changed-since",
+        metavar="REV",
+        help="Incremental mode that also treats `git diff REV` paths (plus untracked files) as changed",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Check staged Markdown (and files linking to it) against the git index "
+        "instead of the working tree",
+    )
+    parser.add_argument(
+        "--external",
+        action="store_true",
+        help="Also check http(s) links, each URL once, concurrently with per-host connection pools",
+    )
+    parser.add_argument(
+        "--external-timeout",
+        type=float,
+        default=10.0,
+        help="External mode: seconds allowed per connection and per request (default: 10)",
+    )
+    parser.add_argument(
+        "--external-per-host",
+        type=int,
+        default=4,
+        help="External mode: concurrent connections per host (default: 4)",
+    )
+    parser.add_argument(
+        "--external-ttl",
+        type=float,
+        default=86400.0,
+        help=f"External mode: seconds a working URL stays cached in {DEFAULT_URL_CACHE_PATH}; "
+        "0 disables the cache (default: 86400)",
+    )
+    parser.add_argument(
+        "--backlinks",
+        metavar="PATH",
+        help="Print the files linking to PATH (repo-relative) from the saved link graph and exit",
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.staged and (args.incremental or args.changed_since or args.backlinks):
+        parser.error("--staged cannot be combined with --incremental, --changed-since or --backlinks")
+    if args.staged and args.external:
+        parser.error("--staged cannot be combined with --external")
+    profiling.start("check_markdown_links", args, argv)
 
     root = Path(args.root).resolve(strict=False)
     if not root.exists():
         print(f"Root does not exist: {root}", file=sys.stderr)
         return 2
 
-    files = _iter_markdown_files(root, args.exclude)
+    try:
+        with profiling.phase("links.config"):
+            discovery = _load_config(root, args.config)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    includes = discovery["include"]
+    excludes = discovery["exclude"] + args.exclude
+
+    config = {"strict": args.strict, "include": includes, "exclude": sorted(excludes)}
+    graph_path = root / DEFAULT_GRAPH_PATH
+
+    if args.backlinks:
+        graph = LinkGraph(graph_path, config)
+        if not graph.loaded:
+            print(
+                f"No link graph for these options; run with --incremental first ({DEFAULT_GRAPH_PATH}).",
+                file=sys.stderr,
+            )
+            return 2
+        target = Path(os.path.normpath(args.backlinks)).as_posix()
+        for source in graph.backlinks().get(target, []):
+            print(source)
+        return 0
+
+    if args.staged:
+        try:
+            with profiling.phase("links.staged"):
+                staged_errors, checked = _check_staged(root, args, includes, excludes, config)
+        except gitobjects.GitError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        if staged_errors:
+            print("FAIL: markdown link check failed:", file=sys.stderr)
+            for entry in sorted(set(staged_errors)):
+                print(f"  - {entry}", file=sys.stderr)
+            return 1
+        print(f"OK: markdown links validated across {checked} staged file(s)")
+        return 0
+
+    with profiling.phase("links.discover"):
+        files = _iter_markdown_files(root, excludes, includes)
     if not files:
         print("No markdown files found for checking.", file=sys.stderr)
         return 2
 
     all_errors: list[str] = []
-    for file in files:
-        all_errors.extend(_check_file(file, root, args.strict))
+    if args.incremental or args.changed_since:
+        graph = LinkGraph(graph_path, config)
+        try:
+            with profiling.phase("links.incremental"):
+                all_errors, rechecked = _check_incremental(files, root, args, graph)
+        except subprocess.CalledProcessError as exc:
+            print(f"git failed for --changed-since: {exc.stderr.strip()}", file=sys.stderr)
+            return 2
+        with profiling.phase("links.graph_save"):
+            graph.save()
+        print(f"incremental: re-checked {rechecked} of {len(files)} file(s)")
+    else:
+        with profiling.phase("links.index"):
+            _index_documents(files, args.jobs)
+        with profiling.phase("links.resolve"):
+            for file in files:
+                all_errors.extend(_check_file(file, root, args.strict))
+    if args.external:
+        with profiling.phase("links.external"):
+            all_errors.extend(_check_external(files, root, args))
 
     if all_errors:
         print("FAIL: markdown link check failed:", file=sys.stderr)
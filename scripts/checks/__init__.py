@@ -0,0 +1,28 @@
+"""Repository checks that can share one interpreter.
+
+Run ``python3 -m scripts.checks`` from the repository root to execute every
+check in a single process; see ``__main__.py``. ``python3 -m scripts.checks
+serve`` keeps them warm behind a Unix socket; see ``server.py``.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def load_script(name: str, rel_path: str) -> ModuleType:
+    """Import a script whose file name is not a valid module name."""
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, REPO_ROOT / rel_path)
+        module = importlib.util.module_from_spec(spec)
+        # dataclass() looks the module up in sys.modules while the body executes.
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,236 @@
+"""Run the repository checks concurrently in one interpreter.
+
+    python3 -m scripts.checks [skills|links|adapters|integrity ...] [--jobs N] [--incremental]
+    python3 -m scripts.checks serve | ask OP ...    (persistent server; see server.py)
+    python3 -m scripts.checks batch ROOT...          (many repositories; see batch.py)
+
+Every check runs on its own thread against a shared read-once file cache, so the
+adapter manifest is parsed once and files several checks look at (generated
+adapters, skills, docs) are read from disk once. Each check's output is buffered
+and replayed in a fixed order, followed by per-check timings. With a single check
+named, only that check's output is printed, so the shell wrappers stay
+byte-for-byte compatible with the standalone scripts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from scripts.checks import REPO_ROOT, files, integrity, load_script, profiling
+from scripts.checks.manifest import MANIFEST_PATH
+
+
+def _skills(args: argparse.Namespace) -> int:
+    module = importlib.import_module("scripts.skills.validate_skills")
+    argv = ["--manifest", str(REPO_ROOT / MANIFEST_PATH), "--jobs", str(args.jobs)]
+    if args.staged:
+        argv.append("--staged")
+    return module.main(argv)
+
+
+def _links(args: argparse.Namespace) -> int:
+    module = load_script("scripts.check_markdown_links", "scripts/check-markdown-links.py")
+    argv = ["--root", str(REPO_ROOT), "--jobs", str(args.jobs)]
+    if args.incremental:
+        argv.append("--incremental")
+    if args.staged:
+        argv.append("--staged")
+    return module.main(argv)
+
+
+def _adapters(args: argparse.Namespace) -> int:
+    module = importlib.import_module("scripts.adapters.generate_adapters")
+    return module.main(["--check", "--jobs", str(args.jobs)])
+
+
+def _integrity(args: argparse.Namespace) -> int:
+    return integrity.main(["--root", str(REPO_ROOT)])
+
+
+# Output is replayed in this order, which matches scripts/verify.sh.
+CHECKS: dict[str, Callable[[argparse.Namespace], int]] = {
+    "skills": _skills,
+    "links": _links,
+    "adapters": _adapters,
+    "integrity": _integrity,
+}
+# Checks that can read staged content from the git index instead of the working tree.
+STAGED_CHECKS = ("skills", "links")
+
+
+class _ThreadOutput(io.TextIOBase):
+    """Stand-in for sys.stdout/sys.stderr that buffers writes per check thread.
+
+    Writes from a thread running a check land in that check's chunk list, tagged
+    with the stream, so stdout/stderr interleaving is preserved on replay. Writes
+    from any other thread go straight to the real stream.
+    """
+
+    def __init__(self, stream: io.TextIOBase, is_stderr: bool, local: threading.local) -> None:
+        self.stream = stream
+        self.is_stderr = is_stderr
+        self.local = local
+
+    def write(self, text: str) -> int:
+        chunks = getattr(self.local, "chunks", None)
+        if chunks is None:
+            return self.stream.write(text)
+        chunks.append((self.is_stderr, text))
+        return len(text)
+
+    def flush(self) -> None:
+        if getattr(self.local, "chunks", None) is None:
+            self.stream.flush()
+
+
+@dataclass
+class CheckRun:
+    name: str
+    code: int = 0
+    seconds: float = 0.0
+    chunks: list[tuple[bool, str]] = field(default_factory=list)
+
+
+def _run_check(name: str, args: argparse.Namespace, local: threading.local) -> CheckRun:
+    run = CheckRun(name)
+    local.chunks = run.chunks
+    started = time.perf_counter()
+    try:
+        run.code = CHECKS[name](args)
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            run.code = exc.code or 0
+        else:
+            run.chunks.append((True, f"{exc.code}\n"))
+            run.code = 1
+    except Exception:
+        run.chunks.append((True, traceback.format_exc()))
+        run.code = 1
+    finally:
+        run.seconds = time.perf_counter() - started
+        local.chunks = None
+        # Each check started its profiling run on this thread.
+        profiling.stop(run.code)
+    return run
+
+
+def run_checks(names: list[str], args: argparse.Namespace) -> list[CheckRun]:
+    """Run ``names`` concurrently with shared file reads; results come back in ``names`` order."""
+    # Import everything up front so module initialisation never races between threads.
+    for name in names:
+        if name == "links":
+            load_script("scripts.check_markdown_links", "scripts/check-markdown-links.py")
+        elif name == "skills":
+            importlib.import_module("scripts.skills.validate_skills")
+        elif name == "adapters":
+            importlib.import_module("scripts.adapters.generate_adapters")
+
+    local = threading.local()
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    sys.stdout = _ThreadOutput(real_stdout, False, local)
+    sys.stderr = _ThreadOutput(real_stderr, True, local)
+    files.enable()
+    try:
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            return list(pool.map(lambda name: _run_check(name, args, local), names))
+    finally:
+        files.disable()
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in ("serve", "ask"):
+        from scripts.checks import server
+
+        return server.main(argv)
+    if argv and argv[0] == "batch":
+        from scripts.checks import batch
+
+        return batch.main(argv[1:])
+    parser = argparse.ArgumentParser(
+        prog="python3 -m scripts.checks",
+        description="Run repository checks concurrently in a single process.",
+    )
+    parser.add_argument(
+        "checks",
+        nargs="*",
+        metavar="CHECK",
+        help=f"Checks to run: {', '.join(CHECKS)} (default: all).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker count passed to the skills, links and adapters checks (default: 1).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Links check: only re-check files affected by changes since the last run.",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help=f"Check staged content from the git index ({', '.join(STAGED_CHECKS)} only; "
+        "the default set with this flag).",
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.checks if name not in CHECKS]
+    if unknown:
+        parser.error(f"unknown check(s): {', '.join(unknown)} (choose from {', '.join(CHECKS)})")
+    if args.staged:
+        if args.incremental:
+            parser.error("--staged cannot be combined with --incremental")
+        unsupported = [name for name in args.checks if name not in STAGED_CHECKS]
+        if unsupported:
+            parser.error(f"--staged is not supported by: {', '.join(unsupported)}")
+        args.checks = args.checks or list(STAGED_CHECKS)
+    if args.profile:
+        # The checks read the profile settings from the environment.
+        os.environ[profiling.ENV_PATH] = args.profile
+    if args.profile_cprofile:
+        os.environ[profiling.ENV_CPROFILE] = "1"
+    profiling.start("checks", args, argv)
+    names = [name for name in CHECKS if name in args.checks] if args.checks else list(CHECKS)
+
+    # Skill roots in the manifest are relative to the repository root.
+    os.chdir(REPO_ROOT)
+    started = time.perf_counter()
+    runs = run_checks(names, args)
+    elapsed = time.perf_counter() - started
+
+    for run in runs:
+        for is_stderr, text in run.chunks:
+            (sys.stderr if is_stderr else sys.stdout).write(text)
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+    if len(runs) == 1:
+        return runs[0].code
+
+    print("timing per check:")
+    for run in runs:
+        print(f"  {run.name}: {run.seconds * 1000:.1f}ms")
+    failed = [run for run in runs if run.code != 0]
+    if failed:
+        names = ", ".join(run.name for run in failed)
+        print(f"FAIL: {len(failed)} of {len(runs)} check(s) failed: {names}", file=sys.stderr)
+        return max(run.code for run in failed)
+    print(f"OK: {len(runs)} check(s) passed in {elapsed * 1000:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
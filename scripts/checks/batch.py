@@ -0,0 +1,309 @@
+"""Run the maintenance checks across many repositories in one job.
+
+    python3 -m scripts.checks batch ROOT... [--roots-file PATH] [--jobs N]
+        [--checks skills,links,adapters,integrity] [--strict] [--report PATH]
+
+Each ROOT is a repository with the vendored orchestration layout: an adapter
+manifest, templates, skills and docs. Repositories are spread over a process
+pool in chunks, so one worker checks many of them and pays interpreter start-up
+and imports once. Within a worker, work is keyed by content rather than by path:
+
+- rendered adapters are memoized per (template digest, values), so a template
+  vendored unchanged into every repository is rendered once per worker;
+- skill results are keyed by (``SKILL.md`` digest, directory name);
+- Markdown documents are parsed once per digest.
+
+Each check is built on the standalone checker's own discovery, validation and
+comparison functions, so a repository fails here exactly when it fails there.
+Link resolution, output comparison and file existence always look at each
+repository's own tree, and nothing is written into it. The JSON report (``--report``, or stdout) has per-repo,
+per-check results and timings, plus totals and reuse counters. Exit code 0 means
+every repository passed, 1 means at least one failed, and 2 means a usage error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from scripts.checks import files, integrity, load_script
+from scripts.checks.links import parse_markdown
+from scripts.checks.manifest import MANIFEST_PATH, ManifestError, load_manifest
+
+
+REPORT_VERSION = 1
+CHECK_NAMES = ("skills", "links", "adapters", "integrity")
+
+# Per-process, content-keyed results shared by every repository a worker checks.
+_SKILL_RESULTS: dict[tuple[str, str], list[str]] = {}
+_DOCUMENTS: dict[str, object] = {}
+_REUSE = {"renders": 0, "skills": 0, "documents": 0}
+
+
+def _adapters_module():
+    return importlib.import_module("scripts.adapters.generate_adapters")
+
+
+def _links_module():
+    return load_script("scripts.check_markdown_links", "scripts/check-markdown-links.py")
+
+
+def _rel(path: Path, root: Path) -> str:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _validate_skill(skill_dir: Path) -> list:
+    """``validate_skill_dir``, memoized by (``SKILL.md`` digest, directory name)."""
+    skills = importlib.import_module("scripts.skills.validate_skills")
+    skill_md = skill_dir / "SKILL.md"
+    try:
+        digest = hashlib.sha256(files.read_bytes(skill_md)).hexdigest()
+    except FileNotFoundError:
+        return skills.validate_skill_dir(skill_dir)
+    key = (digest, skill_dir.name)
+    messages = _SKILL_RESULTS.get(key)
+    if messages is None:
+        errors = skills.validate_skill_dir(skill_dir)
+        _SKILL_RESULTS[key] = [error.message for error in errors]
+        return errors
+    _REUSE["skills"] += 1
+    return [skills.SkillError(skill_md, message) for message in messages]
+
+
+def check_skills(root: Path, strict: bool) -> list[str]:
+    manifest = load_manifest(root, root / MANIFEST_PATH)
+    skills = importlib.import_module("scripts.skills.validate_skills")
+    skills_roots = list(dict.fromkeys(runner.skills_root.path for runner in manifest.runners.values()))
+    per_root, missing_roots = skills._discover_roots(skills_roots)
+    if missing_roots:
+        # As in validate_skills.py, a missing or empty root fails the check before any skill is reported.
+        return [f"{_rel(skills_root, root)}: no skill directories found" for skills_root in missing_roots]
+    failures: list[str] = []
+    for _, skill_dirs in per_root:
+        for skill_dir in skill_dirs:
+            errors = _validate_skill(skill_dir)
+            failures.extend(f"{_rel(error.path, root)}: {error.message}" for error in errors)
+    return failures
+
+
+def check_links(root: Path, strict: bool) -> list[str]:
+    links = _links_module()
+    # The checker's path-keyed caches only hold this repository.
+    links._DOCUMENTS.clear()
+    links._LOCATIONS.clear()
+    links._STATUS.clear()
+    try:
+        config = links._load_config(root, None)
+    except ValueError as exc:
+        return [str(exc)]
+    paths = links._iter_markdown_files(root, config["exclude"], config["include"])
+    if not paths:
+        return ["No markdown files found for checking."]
+    for path in paths:
+        try:
+            data = files.read_bytes(path)
+        except OSError:
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        doc = _DOCUMENTS.get(digest)
+        if doc is None:
+            doc = _DOCUMENTS[digest] = parse_markdown(files.decode_text(data, errors="replace"))
+        else:
+            _REUSE["documents"] += 1
+        links._DOCUMENTS[path] = doc
+        links._STATUS[path] = (True, True)
+    failures: list[str] = []
+    for path in paths:
+        failures.extend(links._check_file(path, root, strict))
+    return sorted(set(failures))
+
+
+def check_adapters(root: Path, strict: bool) -> list[str]:
+    adapters = _adapters_module()
+    # Compiled templates are keyed by path, so they only hold this repository; renders stay shared.
+    adapters._TEMPLATE_CACHE.clear()
+    try:
+        targets = adapters.load_targets(root, root / MANIFEST_PATH, None)
+    except ManifestError as exc:
+        return list(exc.problems)
+    # No build cache: nothing is recorded in the audited repository, and every target is compared.
+    cache = adapters.BuildCache(None)
+    drifted: list[str] = []
+    rendered = 0
+    renders_before = len(adapters._RENDER_CACHE)
+    for target in targets:
+        try:
+            result = adapters.sync_target(target, root, cache, True, None)
+        except (ValueError, FileNotFoundError) as exc:
+            return [f"template error: {exc}"]
+        rendered += 1
+        if result.changed:
+            drifted.append(f"{result.key}: out of sync with {_rel(target.template, root)}")
+    # Renders are memoized by template digest and values, so a vendored template renders once per worker.
+    _REUSE["renders"] += rendered - (len(adapters._RENDER_CACHE) - renders_before)
+    return drifted
+
+
+def check_integrity(root: Path, strict: bool) -> list[str]:
+    # No manifest cache: batch mode must not write into the repositories it audits.
+    return integrity.check(root, None)
+
+
+CHECKS: dict[str, Callable[[Path, bool], list[str]]] = {
+    "skills": check_skills,
+    "links": check_links,
+    "adapters": check_adapters,
+    "integrity": check_integrity,
+}
+
+
+def check_repo(job: tuple[str, tuple[str, ...], bool]) -> dict:
+    """Run ``checks`` on one repository and return its report entry."""
+    raw_root, checks, strict = job
+    root = Path(raw_root).resolve()
+    started = time.perf_counter()
+    reuse_before = dict(_REUSE)
+    entry: dict = {"root": raw_root, "checks": {}}
+    if not (root / MANIFEST_PATH).is_file():
+        error = f"not an orchestration repository: {MANIFEST_PATH} not found"
+        entry.update(ok=False, error=error, seconds=0.0)
+        return entry
+    for name in checks:
+        check_started = time.perf_counter()
+        try:
+            failures = CHECKS[name](root, strict)
+        except Exception as exc:
+            # One broken repository must not take down the worker's whole chunk.
+            failures = [f"error: {type(exc).__name__}: {exc}"]
+        entry["checks"][name] = {
+            "ok": not failures,
+            "seconds": round(time.perf_counter() - check_started, 6),
+            "failures": failures,
+        }
+    entry["ok"] = all(result["ok"] for result in entry["checks"].values())
+    entry["seconds"] = round(time.perf_counter() - started, 6)
+    entry["reused"] = {key: _REUSE[key] - reuse_before[key] for key in _REUSE}
+    return entry
+
+
+def run_batch(roots: list[str], checks: tuple[str, ...], strict: bool, jobs: int) -> dict:
+    started = time.perf_counter()
+    work = [(root, checks, strict) for root in roots]
+    if jobs > 1 and len(work) > 1:
+        # Large chunks keep many repositories on each worker, so content-keyed reuse pays off.
+        chunksize = max(1, len(work) // jobs)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            entries = list(pool.map(check_repo, work, chunksize=chunksize))
+    else:
+        entries = [check_repo(job) for job in work]
+
+    per_check = {
+        name: {
+            "failed": sum(1 for entry in entries if not entry["checks"].get(name, {"ok": True})["ok"]),
+            "seconds": round(
+                sum(entry["checks"].get(name, {"seconds": 0.0})["seconds"] for entry in entries), 6
+            ),
+        }
+        for name in checks
+    }
+    reused = {key: sum(entry.get("reused", {}).get(key, 0) for entry in entries) for key in _REUSE}
+    return {
+        "version": REPORT_VERSION,
+        "ok": all(entry["ok"] for entry in entries),
+        "seconds": round(time.perf_counter() - started, 6),
+        "jobs": jobs,
+        "checks": list(checks),
+        "summary": {
+            "repos": len(entries),
+            "failed": sum(1 for entry in entries if not entry["ok"]),
+            "checks": per_check,
+            "reused": reused,
+        },
+        "repos": entries,
+    }
+
+
+def _read_roots_file(path: Path) -> list[str]:
+    roots: list[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            roots.append(line)
+    return roots
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m scripts.checks batch",
+        description="Run the maintenance checks across many repositories and write one JSON report.",
+    )
+    parser.add_argument("roots", nargs="*", metavar="ROOT", help="Repository roots to check.")
+    parser.add_argument("--roots-file", help="File with one repository root per line ('#' starts a comment).")
+    parser.add_argument(
+        "--checks",
+        default=",".join(CHECK_NAMES),
+        help=f"Comma-separated checks to run (default: {','.join(CHECK_NAMES)}).",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)."
+    )
+    parser.add_argument("--strict", action="store_true", help="Links check: also validate anchors.")
+    parser.add_argument("--report", help="Write the JSON report to PATH instead of stdout.")
+    args = parser.parse_args(argv)
+
+    checks = tuple(name for name in (item.strip() for item in args.checks.split(",")) if name)
+    unknown = [name for name in checks if name not in CHECKS]
+    if unknown or not checks:
+        parser.error(
+            f"unknown check(s): {', '.join(unknown) or '(none)'} (choose from {', '.join(CHECK_NAMES)})"
+        )
+    roots = list(args.roots)
+    if args.roots_file:
+        try:
+            roots += _read_roots_file(Path(args.roots_file))
+        except OSError as exc:
+            parser.error(f"cannot read --roots-file: {exc}")
+    roots = list(dict.fromkeys(roots))
+    if not roots:
+        parser.error("no repository roots given")
+
+    report = run_batch(roots, checks, args.strict, max(1, args.jobs))
+    text = json.dumps(report, indent=2) + "\n"
+    if args.report:
+        path = Path(args.report)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".partial")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)
+        out = sys.stdout
+    else:
+        sys.stdout.write(text)
+        out = sys.stderr
+
+    summary = report["summary"]
+    for entry in report["repos"]:
+        if not entry["ok"]:
+            failed = [name for name, result in entry["checks"].items() if not result["ok"]]
+            reason = entry.get("error") or "failed " + ", ".join(failed)
+            print(f"  - {entry['root']}: {reason}", file=sys.stderr)
+    if not report["ok"]:
+        print(
+            f"FAIL: {summary['failed']} of {summary['repos']} repo(s) failed in {report['seconds']:.1f}s",
+            file=sys.stderr,
+        )
+        return 1
+    print(
+        f"OK: {summary['repos']} repo(s) passed {len(checks)} check(s) in {report['seconds']:.1f}s", file=out
+    )
+    return 0
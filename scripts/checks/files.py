@@ -0,0 +1,94 @@
+"""Read-once file access shared by checks running in the same interpreter.
+
+Until ``enable()`` is called every helper reads straight from disk, so the
+standalone scripts behave exactly as before. Once enabled, each file is read at
+most once per run and its bytes, decoded text and parsed JSON are reused by every
+check that asks for them. Parsed JSON is shared, so callers must not mutate it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from scripts.checks import profiling
+
+
+_enabled = False
+_bytes: dict[str, bytes] = {}
+_text: dict[tuple[str, str], str] = {}
+_json: dict[str, object] = {}
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+    clear()
+
+
+def clear() -> None:
+    _bytes.clear()
+    _text.clear()
+    _json.clear()
+
+
+def forget(path: Path) -> None:
+    """Drop any cached view of ``path``; call after writing to it."""
+    key = os.path.abspath(path)
+    _bytes.pop(key, None)
+    _json.pop(key, None)
+    for text_key in [text_key for text_key in _text if text_key[0] == key]:
+        _text.pop(text_key, None)
+
+
+def _read(path: Path) -> bytes:
+    data = Path(path).read_bytes()
+    profiling.count("files.read")
+    profiling.count("files.bytes_read", len(data))
+    return data
+
+
+def read_bytes(path: Path) -> bytes:
+    if not _enabled:
+        return _read(path)
+    key = os.path.abspath(path)
+    data = _bytes.get(key)
+    if data is None:
+        data = _bytes[key] = _read(path)
+    else:
+        profiling.count("files.cache_hits")
+    return data
+
+
+def decode_text(data: bytes, errors: str = "strict") -> str:
+    """Decode UTF-8 ``data`` with universal newlines, matching ``read_text``."""
+    text = data.decode("utf-8", errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_text(path: Path, errors: str = "strict") -> str:
+    """Decode ``path`` as UTF-8 with universal newlines, like ``Path.read_text``."""
+    if not _enabled:
+        return decode_text(_read(path), errors)
+    key = (os.path.abspath(path), errors)
+    text = _text.get(key)
+    if text is None:
+        text = _text[key] = decode_text(read_bytes(path), errors)
+    return text
+
+
+def read_json(path: Path) -> object:
+    if not _enabled:
+        return json.loads(read_text(path))
+    key = os.path.abspath(path)
+    if key not in _json:
+        _json[key] = json.loads(read_text(path))
+    return _json[key]
@@ -0,0 +1,130 @@
+"""Read repository content from git objects instead of the working tree.
+
+``BlobReader`` keeps one ``git cat-file --batch`` process open and streams
+requests to it, so any number of blobs (``:path`` for the index, ``<rev>:path``
+for a commit) cost one process rather than one per file. The helpers around it
+list staged changes and index paths with NUL-separated output.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+from pathlib import Path
+
+
+class GitError(RuntimeError):
+    """A git command failed or git is not available."""
+
+
+def _git(root: Path, *args: str) -> bytes:
+    try:
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, check=False)
+    except OSError as exc:
+        raise GitError(f"git is not available: {exc}") from exc
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(f"git {' '.join(args)} failed: {message}")
+    return result.stdout
+
+
+def _split(output: bytes) -> list[str]:
+    return [item.decode("utf-8", errors="surrogateescape") for item in output.split(b"\0") if item]
+
+
+def toplevel(path: Path) -> Path:
+    return Path(_git(path, "rev-parse", "--show-toplevel").decode("utf-8").strip())
+
+
+def index_paths(root: Path) -> list[str]:
+    """Every path in the index, repo-relative with forward slashes."""
+    return _split(_git(root, "ls-files", "-z", "--cached"))
+
+
+def resolve_commit(root: Path, rev: str) -> str:
+    return _git(root, "rev-parse", "--verify", "--end-of-options", f"{rev}^{{commit}}").decode("utf-8").strip()
+
+
+def rev_list(root: Path, spec: str) -> list[str]:
+    """Commits selected by a range such as ``A..B``, oldest first."""
+    return _git(root, "rev-list", "--reverse", spec, "--").decode("utf-8").split()
+
+
+def staged_changes(root: Path) -> tuple[list[str], list[str]]:
+    """Return ``(changed, deleted)`` staged paths; a rename counts as a delete plus an add."""
+    changed = _split(_git(root, "diff", "--cached", "--name-only", "-z", "--no-renames", "--diff-filter=ACMR"))
+    deleted = _split(_git(root, "diff", "--cached", "--name-only", "-z", "--no-renames", "--diff-filter=D"))
+    return changed, deleted
+
+
+class BlobReader:
+    """A long-lived ``git cat-file --batch`` process.
+
+    ``read_many`` writes every object spec from a helper thread while reading
+    the replies in order, so large batches cannot deadlock on full pipes.
+    Missing objects map to None. ``read_objects`` also returns each object id,
+    so callers can reuse work across revisions whose blobs are unchanged.
+    """
+
+    def __init__(self, root: Path) -> None:
+        try:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as exc:
+            raise GitError(f"git is not available: {exc}") from exc
+
+    def __enter__(self) -> BlobReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._proc.stdin and not self._proc.stdin.closed:
+            self._proc.stdin.close()
+        self._proc.wait()
+        if self._proc.stdout:
+            self._proc.stdout.close()
+
+    def read_many(self, specs: list[str]) -> dict[str, bytes | None]:
+        return {spec: found[1] if found else None for spec, found in self.read_objects(specs).items()}
+
+    def read_objects(self, specs: list[str]) -> dict[str, tuple[str, bytes] | None]:
+        """Map each spec to ``(oid, content)`` of its blob, or None."""
+        # cat-file reads one spec per line, so specs containing a newline cannot be asked for.
+        specs = [spec for spec in dict.fromkeys(specs) if "\n" not in spec]
+        results: dict[str, tuple[str, bytes] | None] = {}
+        if not specs:
+            return results
+        stdin, stdout = self._proc.stdin, self._proc.stdout
+
+        def feed() -> None:
+            stdin.write(b"".join(spec.encode("utf-8", errors="surrogateescape") + b"\n" for spec in specs))
+            stdin.flush()
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        try:
+            for spec in specs:
+                header = stdout.readline()
+                if not header:
+                    raise GitError("git cat-file --batch exited unexpectedly")
+                fields = header.split()
+                if len(fields) != 3 or fields[-1] in (b"missing", b"ambiguous"):
+                    results[spec] = None
+                    continue
+                size = int(fields[2])
+                data = stdout.read(size)
+                stdout.read(1)
+                results[spec] = (fields[0].decode("ascii"), data) if fields[1] == b"blob" else None
+        finally:
+            writer.join()
+        return results
+
+    def read(self, spec: str) -> bytes | None:
+        return self.read_many([spec]).get(spec)
@@ -0,0 +1,273 @@
+"""Orchestration integrity checks for the adapter manifest and its outputs.
+
+Verifies that every runner maps each stage to an adapter that exists and
+references its expected gate, that pmatch adapters carry the required tokens,
+that pipeline skills and the core playbook list stages in order, and that the
+quality gate schema covers every phase.
+
+Structural manifest problems (missing or unknown stage mappings, bad paths)
+come from ``manifest.load_manifest`` and are reported as failures as well.
+
+Each adapter and playbook is read once and scanned once by a ``TokenIndex`` that
+records the offsets of every gate, pmatch and stage token together; the
+containment and ordering checks then only look at those offsets.
+
+``expectations`` and ``check_text`` apply the same per-document rules to
+in-memory content, so rendered adapters can be checked before they are written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from scripts.checks import files, profiling
+from scripts.checks.manifest import DEFAULT_CACHE_PATH as MANIFEST_CACHE_PATH
+from scripts.checks.manifest import MANIFEST_PATH, Manifest, ManifestError, RepoPath, load_manifest
+
+
+QUALITY_GATE_PATH = "contracts/quality-gate.schema.json"
+EXPECTED_PHASES = frozenset(
+    {
+        "arm",
+        "design",
+        "adversarial-review",
+        "plan",
+        "pmatch",
+        "build",
+        "quality-static",
+        "quality-tests",
+        "denoise",
+        "quality-frontend",
+        "quality-backend",
+        "quality-docs",
+        "security-review",
+        "release-readiness",
+    }
+)
+
+
+def _trie_pattern(tokens: Iterable[str]) -> str:
+    """Regex for ``tokens`` shaped as a character trie, so matching at a position
+    walks at most one branch per character whatever the number of tokens. Optional
+    groups at token ends are greedy, so the longest token at a position wins."""
+    trie: dict = {}
+    for token in tokens:
+        node = trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class TokenIndex:
+    """Locate every occurrence of a fixed token set in one scan of a text.
+
+    Like Aho-Corasick, all tokens are matched together and overlapping matches
+    are kept: the trie-shaped pattern is tried at every position inside a
+    lookahead and yields the longest token starting there, and the other tokens
+    starting at that position are exactly its prefixes that are also tokens.
+    """
+
+    def __init__(self, tokens: Iterable[str]) -> None:
+        self.tokens = frozenset(token for token in tokens if isinstance(token, str) and token)
+        self._pattern = re.compile(f"(?=({_trie_pattern(self.tokens)}))") if self.tokens else None
+        self._prefixes = {
+            token: [token[:end] for end in range(1, len(token) + 1) if token[:end] in self.tokens]
+            for token in self.tokens
+        }
+
+    def scan(self, text: str) -> dict[str, list[int]]:
+        """Map each token found in ``text`` to its ascending start offsets."""
+        offsets: dict[str, list[int]] = {}
+        if self._pattern is None:
+            return offsets
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for token in self._prefixes[match.group(1)]:
+                offsets.setdefault(token, []).append(start)
+        return offsets
+
+
+def order_failure(offsets: dict[str, list[int]], tokens: Iterable[str]) -> str | None:
+    """Why ``tokens`` do not all occur in this order in a scanned text, or None."""
+    idx = -1
+    for token in tokens:
+        positions = offsets.get(token)
+        if not positions:
+            return f"missing stage token '{token}'"
+        after = bisect_left(positions, idx + 1)
+        if after == len(positions):
+            return f"stage token '{token}' appears out of order"
+        idx = positions[after]
+    return None
+
+
+@dataclass(frozen=True)
+class Expectation:
+    """What one manifest-declared document must contain."""
+
+    gate: str | None = None
+    required: tuple[str, ...] = ()
+    ordered: tuple[str, ...] = ()
+
+    def merge(self, other: Expectation) -> Expectation:
+        return Expectation(
+            self.gate or other.gate,
+            tuple(dict.fromkeys(self.required + other.required)),
+            self.ordered or other.ordered,
+        )
+
+
+def expectations(manifest: Manifest) -> dict[Path, Expectation]:
+    """Map each stage adapter, pipeline skill and core playbook path to its rules."""
+    found: dict[Path, Expectation] = {}
+
+    def add(target: RepoPath | None, expectation: Expectation) -> None:
+        if target is not None:
+            path = target.path
+            found[path] = found[path].merge(expectation) if path in found else expectation
+
+    for runner in manifest.runners.values():
+        for stage in manifest.stage_order:
+            add(runner.stage_adapters.get(stage), Expectation(gate=manifest.expected_gates.get(stage)))
+        add(runner.stage_adapters.get("pmatch"), Expectation(required=manifest.pmatch_tokens))
+        add(runner.pipeline_skill, Expectation(ordered=manifest.stage_order))
+    add(manifest.core_playbook, Expectation(ordered=manifest.stage_order))
+    return found
+
+
+def check_text(text: str, expectation: Expectation, index: TokenIndex | None = None) -> list[str]:
+    """Integrity failures for in-memory ``text`` held to ``expectation``."""
+    if index is None:
+        tokens = [*expectation.required, *expectation.ordered]
+        index = TokenIndex([expectation.gate, *tokens] if expectation.gate else tokens)
+    offsets = index.scan(text)
+    failures: list[str] = []
+    if expectation.gate and expectation.gate not in offsets:
+        failures.append(f"does not reference expected gate '{expectation.gate}'")
+    failures.extend(
+        f"missing required token '{token}'" for token in expectation.required if token not in offsets
+    )
+    failure = order_failure(offsets, expectation.ordered) if expectation.ordered else None
+    if failure:
+        failures.append(failure)
+    return failures
+
+
+def check(root: Path, cache_path: Path | None = None) -> list[str]:
+    """Return integrity failures for the repository at ``root``.
+
+    The parsed manifest is cached at ``cache_path`` when one is given; with None
+    nothing is written under ``root``.
+    """
+    manifest_path = root / MANIFEST_PATH
+    quality_gate_path = root / QUALITY_GATE_PATH
+    failures: list[str] = []
+    scanned: dict[Path, dict[str, list[int]]] = {}
+
+    def token_offsets(path: Path) -> dict[str, list[int]]:
+        offsets = scanned.get(path)
+        if offsets is None:
+            profiling.count("integrity.files_scanned")
+            offsets = scanned[path] = index.scan(files.read_text(path))
+        return offsets
+
+    def assert_order(path: Path, tokens: tuple[str, ...], scope: str) -> None:
+        if not path.exists():
+            failures.append(f"{scope}: missing file {path.relative_to(root)}")
+            return
+        failure = order_failure(token_offsets(path), tokens)
+        if failure:
+            failures.append(f"{scope}: {failure} in {path.relative_to(root)}")
+
+    manifest: Manifest | None = None
+    if not manifest_path.exists():
+        failures.append(f"missing adapter manifest: {manifest_path.relative_to(root)}")
+    else:
+        try:
+            manifest = load_manifest(root, manifest_path, cache_path)
+        except ManifestError as exc:
+            failures.extend(exc.problems)
+
+    if manifest is not None:
+        stage_order = manifest.stage_order
+        index = TokenIndex([*stage_order, *manifest.expected_gates.values(), *manifest.pmatch_tokens])
+
+        for name, runner in manifest.runners.items():
+            for stage in stage_order:
+                adapter = runner.stage_adapters[stage]
+                if not adapter.path.exists():
+                    failures.append(f"runner '{name}' missing adapter for stage '{stage}': {adapter.rel}")
+                    continue
+
+                gate_token = manifest.expected_gates.get(stage)
+                if gate_token and gate_token not in token_offsets(adapter.path):
+                    failures.append(
+                        f"runner '{name}' adapter '{adapter.rel}' "
+                        f"does not reference expected gate '{gate_token}'"
+                    )
+
+            pmatch = runner.stage_adapters.get("pmatch")
+            if pmatch is not None and pmatch.path.exists():
+                pmatch_offsets = token_offsets(pmatch.path)
+                for token in manifest.pmatch_tokens:
+                    if token not in pmatch_offsets:
+                        failures.append(f"runner '{name}' pmatch adapter missing required token '{token}'")
+
+            if runner.pipeline_skill is not None:
+                assert_order(runner.pipeline_skill.path, stage_order, f"runner '{name}' pipeline")
+            else:
+                failures.append(f"runner '{name}' missing pipeline_skill path")
+
+        # Skip if file does not exist (may be gitignored local-only)
+        if manifest.core_playbook is not None and manifest.core_playbook.path.exists():
+            assert_order(manifest.core_playbook.path, stage_order, "core playbook")
+
+    if not quality_gate_path.exists():
+        failures.append(f"missing quality gate schema: {quality_gate_path.relative_to(root)}")
+    else:
+        qg = files.read_json(quality_gate_path)
+        phase_enum = set(qg["properties"]["phase"]["enum"])
+        missing_phases = sorted(EXPECTED_PHASES - phase_enum)
+        if missing_phases:
+            failures.append(f"quality gate schema phase enum missing: {', '.join(missing_phases)}")
+
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check orchestration integrity of adapters and contracts.")
+    parser.add_argument("--root", default=".", help="Repository root (default: current directory).")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.start("integrity", args, argv)
+
+    with profiling.phase("integrity.check"):
+        root = Path(args.root).resolve()
+        failures = check(root, root / MANIFEST_CACHE_PATH)
+    if failures:
+        print("FAIL: orchestration integrity check failed:", file=sys.stderr)
+        for failure in failures:
+            print(f"  - {failure}", file=sys.stderr)
+        return 1
+
+    print("OK: orchestration integrity checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+"""Markdown tokenizer shared by the link checker, the check server and batch mode.
+
+``parse_markdown`` reads a document once: fenced code is skipped, ATX headings
+become anchors, ``[label]: target`` lines become reference definitions, and a
+single linear bracket scan collects inline links and ``[text][label]`` uses.
+``parse_file`` is the process-pool entry point; it lives here, in an importable
+module, so workers started with the ``spawn`` method can unpickle it.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from scripts.checks import files, profiling
+
+
+@dataclass
+class Document:
+    """Everything the checker needs from one Markdown file, produced in one sweep."""
+
+    links: list[str] = field(default_factory=list)
+    reference_defs: dict[str, str] = field(default_factory=dict)
+    reference_uses: list[str] = field(default_factory=list)
+    anchors: set[str] = field(default_factory=set)
+
+
+class _NextIndex:
+    """``text.find(char, start)`` for non-decreasing ``start`` values in amortized O(1).
+
+    The bracket scanner only ever asks for the next delimiter at or after a
+    position that never moves backwards, so each character is examined at most
+    once per finder even on malformed input (e.g. thousands of unclosed ``[``).
+    """
+
+    def __init__(self, text: str, char: str) -> None:
+        self.text = text
+        self.char = char
+        self.start = 0
+        self.found = -2
+
+    def find(self, start: int) -> int:
+        if self.found != -2 and start >= self.start and (self.found == -1 or self.found >= start):
+            return self.found
+        self.start = start
+        self.found = self.text.find(self.char, start)
+        return self.found
+
+
+def _heading_text(line: str) -> str | None:
+    """Return the heading text of an ATX heading line (``#`` .. ``######``), else None."""
+    indent = len(line) - len(line.lstrip())
+    if indent > 3 or line[indent : indent + 1] != "#":
+        return None
+    hashes = len(line) - indent - len(line[indent:].lstrip("#"))
+    pos = indent + hashes
+    if hashes > 6 or pos >= len(line) or not line[pos].isspace():
+        return None
+    heading = line[pos + 1 :].strip()
+    return heading or None
+
+
+def _reference_def(line: str) -> tuple[str, str] | None:
+    """Parse ``[label]: target`` lines."""
+    stripped = line.lstrip()
+    if not stripped.startswith("["):
+        return None
+    close = stripped.find("]")
+    if close < 2 or stripped[close + 1 : close + 2] != ":":
+        return None
+    rest = stripped[close + 2 :].strip()
+    if not rest or len(rest.split()) != 1:
+        return None
+    return stripped[1:close], rest
+
+
+def scan_brackets(text: str, doc: Document) -> None:
+    """Collect inline links/images and ``[text][label]`` uses in one left-to-right pass.
+
+    Matches are leftmost and non-overlapping within each kind, like successive
+    ``re.finditer`` calls would produce, but every delimiter lookup goes through a
+    forward-only ``_NextIndex`` so the scan is linear in the length of ``text``.
+    """
+    close = _NextIndex(text, "]")
+    second_close = _NextIndex(text, "]")
+    paren = _NextIndex(text, ")")
+    inline_resume = 0
+    ref_resume = 0
+    pos = text.find("[")
+    while pos != -1:
+        if pos >= inline_resume or pos >= ref_resume:
+            end = close.find(pos + 1)
+            if end == -1:
+                break
+            nxt = text[end + 1 : end + 2]
+            bang = pos > 0 and text[pos - 1] == "!"
+
+            if pos >= inline_resume and nxt == "(":
+                image = bang and pos - 1 >= inline_resume
+                if end > pos + 1 or image:
+                    target_end = paren.find(end + 2)
+                    if target_end > end + 2:
+                        doc.links.append(text[end + 2 : target_end])
+                        inline_resume = target_end + 1
+
+            if pos >= ref_resume and nxt == "[" and not bang and end > pos + 1:
+                label_end = second_close.find(end + 2)
+                if label_end != -1:
+                    label = text[end + 2 : label_end] or text[pos + 1 : end]
+                    doc.reference_uses.append(label)
+                    ref_resume = label_end + 1
+        pos = text.find("[", pos + 1)
+
+
+def parse_markdown(text: str) -> Document:
+    """Tokenize ``text`` once: fences, headings and reference definitions per line,
+    then links and reference uses over the unfenced content."""
+    doc = Document()
+    unfenced: list[str] = []
+    in_fence = False
+    for line in text.splitlines():
+        if line.strip().startswith("```"):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        unfenced.append(line)
+        if "#" in line:
+            heading = _heading_text(line)
+            if heading:
+                doc.anchors.add(slugify(heading))
+        if "]:" in line:
+            definition = _reference_def(line)
+            if definition:
+                label, target = definition
+                doc.reference_defs[normalize_ref_label(label)] = extract_target(target)
+    scan_brackets("\n".join(unfenced), doc)
+    return doc
+
+
+def normalize_ref_label(label: str) -> str:
+    return re.sub(r"\s+", " ", label.strip().lower())
+
+
+def extract_target(raw: str) -> str:
+    target = raw.strip()
+    if target.startswith("<") and target.endswith(">"):
+        target = target[1:-1].strip()
+    if " " in target:
+        target = target.split(" ", 1)[0]
+    return target
+
+
+def slugify(text: str) -> str:
+    value = text.strip().lower()
+    value = re.sub(r"[^\w\s-]", "", value)
+    value = re.sub(r"\s+", "-", value)
+    value = re.sub(r"-{2,}", "-", value)
+    return value.strip("-")
+
+
+def parse_file(path: Path) -> Document | None:
+    profiling.count("links.parsed")
+    try:
+        return parse_markdown(files.read_text(path, errors="replace"))
+    except OSError:
+        return None
@@ -0,0 +1,347 @@
+"""The adapter manifest, parsed and validated once for every check.
+
+``load_manifest`` turns ``adapters/spec/adapter-manifest.json`` into an immutable
+``Manifest``. Every repository path in it is resolved up front into a
+``RepoPath``, and stage lookups are plain mappings: ``Runner.stage_adapters``
+gives stage -> adapter path, and ``Manifest.expected_gates`` gives stage -> gate.
+A structurally invalid manifest raises ``ManifestError`` carrying every problem
+found, not just the first.
+
+Models are memoized per (manifest digest, root) in the interpreter, so checks
+sharing a process parse the manifest once. They are also cached on disk (see
+``DEFAULT_CACHE_PATH``), so later processes load the resolved model without
+re-validating it. The disk entry is keyed by the SHA-256 of the manifest bytes
+and the repository root. Moving a symlinked directory under the root is not
+noticed; delete the cache file after doing that.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+from scripts.checks import files, profiling
+
+
+MANIFEST_PATH = "adapters/spec/adapter-manifest.json"
+DEFAULT_CACHE_PATH = ".cache/checks/manifest-model.json"
+DEFAULT_TEMPLATE_ROOT = "adapters/templates"
+CACHE_VERSION = 1
+
+_MODELS: dict[tuple[str, str], Manifest] = {}
+
+
+class ManifestError(ValueError):
+    """The manifest is missing or invalid; ``problems`` lists every issue found."""
+
+    def __init__(self, *problems: str) -> None:
+        self.problems = problems
+        if len(problems) == 1:
+            message = problems[0]
+        else:
+            message = "invalid adapter manifest:\n" + "\n".join(f"  - {problem}" for problem in problems)
+        super().__init__(message)
+
+
+@dataclass(frozen=True, slots=True)
+class RepoPath:
+    """A repository-relative path as written in the manifest, and its resolved location."""
+
+    rel: str
+    path: Path
+
+
+@dataclass(frozen=True, slots=True)
+class Runner:
+    name: str
+    title: str
+    skills_root: RepoPath
+    pipeline_skill: RepoPath | None
+    stage_adapters: Mapping[str, RepoPath]
+
+
+@dataclass(frozen=True, slots=True)
+class Manifest:
+    root: Path
+    digest: str
+    stage_order: tuple[str, ...]
+    expected_gates: Mapping[str, str]
+    pmatch_tokens: tuple[str, ...]
+    template_root: RepoPath
+    cursor_skills_root: RepoPath | None
+    codex_playbook: RepoPath | None
+    root_entries: Mapping[str, RepoPath]
+    core_playbook: RepoPath | None
+    runners: Mapping[str, Runner]
+
+    def to_json(self) -> dict:
+        def repo_path(value: RepoPath | None) -> list[str] | None:
+            return None if value is None else [value.rel, str(value.path)]
+
+        return {
+            "root": str(self.root),
+            "digest": self.digest,
+            "stage_order": list(self.stage_order),
+            "expected_gates": dict(self.expected_gates),
+            "pmatch_tokens": list(self.pmatch_tokens),
+            "template_root": repo_path(self.template_root),
+            "cursor_skills_root": repo_path(self.cursor_skills_root),
+            "codex_playbook": repo_path(self.codex_playbook),
+            "root_entries": {name: repo_path(value) for name, value in self.root_entries.items()},
+            "core_playbook": repo_path(self.core_playbook),
+            "runners": [
+                {
+                    "name": runner.name,
+                    "title": runner.title,
+                    "skills_root": repo_path(runner.skills_root),
+                    "pipeline_skill": repo_path(runner.pipeline_skill),
+                    "stage_adapters": {
+                        stage: repo_path(value) for stage, value in runner.stage_adapters.items()
+                    },
+                }
+                for runner in self.runners.values()
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> Manifest:
+        def repo_path(value: list[str] | None) -> RepoPath | None:
+            return None if value is None else RepoPath(value[0], Path(value[1]))
+
+        runners = {
+            item["name"]: Runner(
+                item["name"],
+                item["title"],
+                repo_path(item["skills_root"]),
+                repo_path(item["pipeline_skill"]),
+                MappingProxyType({stage: repo_path(value) for stage, value in item["stage_adapters"].items()}),
+            )
+            for item in data["runners"]
+        }
+        return cls(
+            Path(data["root"]),
+            data["digest"],
+            tuple(data["stage_order"]),
+            MappingProxyType(dict(data["expected_gates"])),
+            tuple(data["pmatch_tokens"]),
+            repo_path(data["template_root"]),
+            repo_path(data["cursor_skills_root"]),
+            repo_path(data["codex_playbook"]),
+            MappingProxyType({name: repo_path(value) for name, value in data["root_entries"].items()}),
+            repo_path(data["core_playbook"]),
+            MappingProxyType(runners),
+        )
+
+
+class _Parser:
+    """Validate raw manifest JSON, collecting every problem before giving up."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root_real = root.resolve(strict=False)
+        self.problems: list[str] = []
+
+    def fail(self, problem: str) -> None:
+        self.problems.append(problem)
+
+    def path(self, raw: object, label: str, default: str | None = None) -> RepoPath | None:
+        if raw is None and default is not None:
+            raw = default
+        if raw is None:
+            return None
+        if not isinstance(raw, str) or not raw:
+            self.fail(f"{label} path must be a non-empty string")
+            return None
+        if Path(raw).is_absolute():
+            self.fail(f"{label}: path must be repository-relative, got absolute path '{raw}'")
+            return None
+        resolved = (self.root / raw).resolve(strict=False)
+        try:
+            resolved.relative_to(self.root_real)
+        except ValueError:
+            self.fail(f"{label}: path escapes repository root: '{raw}'")
+            return None
+        return RepoPath(raw, resolved)
+
+    def obj(self, raw: object, label: str) -> dict:
+        if raw is None:
+            return {}
+        if not isinstance(raw, dict):
+            self.fail(f"{label} must be an object")
+            return {}
+        return raw
+
+    def strings(self, raw: object, label: str) -> tuple[str, ...]:
+        if raw is None:
+            return ()
+        if not isinstance(raw, list) or not all(isinstance(item, str) and item for item in raw):
+            self.fail(f"{label} must be a list of non-empty strings")
+            return ()
+        return tuple(raw)
+
+    def manifest(self, data: object, digest: str) -> Manifest:
+        if not isinstance(data, dict):
+            raise ManifestError("adapter manifest must be a JSON object")
+
+        stage_order = self.strings(data.get("stage_order"), "stage_order")
+        if not stage_order:
+            self.fail("adapter manifest missing stage_order")
+        repeated = sorted({stage for stage in stage_order if stage_order.count(stage) > 1})
+        if repeated:
+            self.fail(f"stage_order repeats stage(s): {', '.join(repeated)}")
+
+        expected_gates = self.obj(data.get("expected_gates"), "expected_gates")
+        if not expected_gates:
+            self.fail("adapter manifest missing expected_gates")
+        if not all(isinstance(gate, str) and gate for gate in expected_gates.values()):
+            self.fail("expected_gates must map stages to non-empty strings")
+            expected_gates = {}
+
+        pmatch = self.obj(data.get("pmatch"), "pmatch")
+        pmatch_tokens = self.strings(pmatch.get("required_tokens"), "pmatch.required_tokens")
+
+        generation = self.obj(data.get("generation"), "generation")
+        template_root = self.path(
+            generation.get("template_root"), "generation.template_root", DEFAULT_TEMPLATE_ROOT
+        )
+        legacy = self.obj(generation.get("legacy_mirrors"), "generation.legacy_mirrors")
+        cursor_skills_root = self.path(legacy.get("cursor_skills_root"), "legacy_mirrors.cursor_skills_root")
+        codex_playbook = self.path(legacy.get("codex_playbook"), "legacy_mirrors.codex_playbook")
+        root_entries: dict[str, RepoPath] = {}
+        raw_entries = self.obj(legacy.get("root_entries"), "generation.legacy_mirrors.root_entries")
+        for name, raw in raw_entries.items():
+            entry = self.path(raw, f"legacy root entry for '{name}'")
+            if entry is not None:
+                root_entries[name] = entry
+        core_playbook = self.path(data.get("core_playbook"), "core_playbook")
+
+        runners: dict[str, Runner] = {}
+        raw_runners = data.get("runners")
+        if not isinstance(raw_runners, list) or not raw_runners:
+            self.fail("adapter manifest missing runners")
+            raw_runners = []
+        for position, raw in enumerate(raw_runners):
+            runner = self.runner(raw, position, stage_order)
+            if runner is None:
+                continue
+            if runner.name in runners:
+                self.fail(f"duplicate runner name '{runner.name}'")
+            runners[runner.name] = runner
+
+        if self.problems:
+            raise ManifestError(*self.problems)
+        return Manifest(
+            self.root,
+            digest,
+            stage_order,
+            MappingProxyType(dict(expected_gates)),
+            pmatch_tokens,
+            template_root,
+            cursor_skills_root,
+            codex_playbook,
+            MappingProxyType(root_entries),
+            core_playbook,
+            MappingProxyType(runners),
+        )
+
+    def runner(self, raw: object, position: int, stage_order: tuple[str, ...]) -> Runner | None:
+        if not isinstance(raw, dict):
+            self.fail(f"runners[{position}] must be an object")
+            return None
+        name = raw.get("name")
+        if not isinstance(name, str) or not name:
+            self.fail(f"runners[{position}] missing name")
+            return None
+        title = raw.get("title") or name.capitalize()
+        if not isinstance(title, str):
+            self.fail(f"runner '{name}' title must be a string")
+        skills_root = self.path(
+            raw.get("skills_root"), f"runner '{name}' skills_root", f"adapters/{name}/skills"
+        )
+        pipeline_skill = self.path(raw.get("pipeline_skill"), f"runner '{name}' pipeline_skill")
+
+        stage_map = raw.get("stage_adapters", {})
+        if not isinstance(stage_map, dict):
+            self.fail(f"runner '{name}' stage_adapters must be an object")
+            stage_map = {}
+        missing = [stage for stage in stage_order if stage not in stage_map]
+        if missing:
+            self.fail(f"runner '{name}' missing stage mappings: {', '.join(missing)}")
+        extra = sorted(set(stage_map) - set(stage_order))
+        if extra:
+            self.fail(f"runner '{name}' has unknown stage mappings: {', '.join(extra)}")
+        stage_adapters: dict[str, RepoPath] = {}
+        for stage in stage_order:
+            if stage in stage_map:
+                adapter = self.path(stage_map[stage], f"runner '{name}' stage '{stage}'")
+                if adapter is not None:
+                    stage_adapters[stage] = adapter
+        return Runner(name, title, skills_root, pipeline_skill, MappingProxyType(stage_adapters))
+
+
+def parse_manifest(root: Path, data: bytes) -> Manifest:
+    """Validate manifest ``data`` with paths resolved against ``root``; memoized per digest."""
+    digest = hashlib.sha256(data).hexdigest()
+    key = (digest, str(root))
+    model = _MODELS.get(key)
+    if model is None:
+        try:
+            raw = json.loads(data)
+        except ValueError as exc:
+            raise ManifestError(f"adapter manifest is not valid JSON: {exc}") from exc
+        with profiling.phase("manifest.validate"):
+            model = _MODELS[key] = _Parser(root).manifest(raw, digest)
+    else:
+        profiling.count("manifest.memo_hits")
+    return model
+
+
+def load_manifest(root: Path, path: Path, cache_path: Path | None = None) -> Manifest:
+    """Load the manifest at ``path``, reusing a model cached at ``cache_path`` when it matches."""
+    try:
+        data = files.read_bytes(path)
+    except FileNotFoundError as exc:
+        raise ManifestError(f"Manifest not found: {path}") from exc
+    digest = hashlib.sha256(data).hexdigest()
+    key = (digest, str(root))
+    if key in _MODELS or cache_path is None:
+        return parse_manifest(root, data)
+
+    cached = _read_cache(cache_path, key)
+    if cached is not None:
+        profiling.count("manifest.cache_hits")
+        _MODELS[key] = cached
+        return cached
+    model = parse_manifest(root, data)
+    _write_cache(cache_path, model)
+    return model
+
+
+def _read_cache(cache_path: Path, key: tuple[str, str]) -> Manifest | None:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        if data.get("version") != CACHE_VERSION:
+            return None
+        model = data["model"]
+        if (model["digest"], model["root"]) != key:
+            return None
+        return Manifest.from_json(model)
+    except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError):
+        return None
+
+
+def _write_cache(cache_path: Path, model: Manifest) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.partial")
+        payload = {"version": CACHE_VERSION, "model": model.to_json()}
+        tmp.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+        tmp.replace(cache_path)
+    except OSError:
+        # The cache is an optimization; a read-only checkout still works.
+        pass
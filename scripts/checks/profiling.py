@@ -0,0 +1,173 @@
+"""Phase timings and counters for the maintenance scripts, written as JSON lines.
+
+Profiling is off unless a script is given ``--profile PATH`` or ``CHECKS_PROFILE``
+is set. While off, ``phase()`` returns a shared no-op context manager and
+``count()`` returns immediately, so instrumented code pays one attribute lookup
+and call per site. Instrumentation sites are per file or per phase, never per
+line. ``--profile-cprofile`` (or ``CHECKS_PROFILE_CPROFILE=1``) also dumps a
+``cProfile`` of each tool to ``PATH.<tool>.prof``.
+
+Records are appended at interpreter exit, one JSON object per line:
+
+- ``{"kind": "run", "tool", "argv", "seconds", "exit", ...}`` for each tool run;
+- ``{"kind": "phase", "name", "seconds", "calls", ...}`` summed per phase name;
+- ``{"kind": "counter", "name", "value", ...}`` per counter.
+
+Every record carries ``session`` (start time), ``pid`` and ``commit`` (``git
+rev-parse HEAD`` when available), so appended runs from CI can be grouped and
+compared across commits. Counters from process-pool workers are not collected.
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+
+ENV_PATH = "CHECKS_PROFILE"
+ENV_CPROFILE = "CHECKS_PROFILE_CPROFILE"
+
+_enabled = False
+_path: Path | None = None
+_session = ""
+_lock = threading.Lock()
+_phases: dict[str, list[float]] = {}
+_counters: dict[str, int] = {}
+_runs: list[dict] = []
+# Active tool runs by thread id: (tool, argv, started, cProfile.Profile or None).
+_active: dict[int, tuple[str, list[str], float, object]] = {}
+_NULL_PHASE = contextlib.nullcontext()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help=f"Append JSON-lines phase timings and counters to PATH (default: ${ENV_PATH} if set).",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        action="store_true",
+        help=f"With --profile, also dump cProfile stats to PATH.<tool>.prof (or set {ENV_CPROFILE}=1).",
+    )
+
+
+def start(tool: str, args: argparse.Namespace, argv: list[str] | None = None) -> None:
+    """Begin profiling ``tool`` on this thread when requested by ``args`` or the environment."""
+    global _enabled, _path, _session
+    path = getattr(args, "profile", None) or os.environ.get(ENV_PATH)
+    if not path:
+        return
+    with _lock:
+        if not _enabled:
+            _enabled = True
+            _path = Path(path)
+            _session = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+            atexit.register(flush)
+    profile = None
+    if getattr(args, "profile_cprofile", False) or os.environ.get(ENV_CPROFILE) == "1":
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active (Python 3.12+ allows one per process).
+            profile = None
+    tool_argv = list(sys.argv[1:] if argv is None else argv)
+    _active[threading.get_ident()] = (tool, tool_argv, time.perf_counter(), profile)
+
+
+def stop(exit_code: int | None = None) -> None:
+    """Finish the tool run started on this thread; ``flush()`` calls it for the main thread."""
+    run = _active.pop(threading.get_ident(), None)
+    if run is None:
+        return
+    tool, argv, started, profile = run
+    record = {"kind": "run", "tool": tool, "argv": argv, "seconds": round(time.perf_counter() - started, 6)}
+    if exit_code is not None:
+        record["exit"] = exit_code
+    if profile is not None:
+        profile.disable()
+        dump = f"{_path}.{tool}.prof"
+        profile.dump_stats(dump)
+        record["cprofile"] = dump
+    with _lock:
+        _runs.append(record)
+
+
+@contextlib.contextmanager
+def _timed(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            entry = _phases.setdefault(name, [0.0, 0])
+            entry[0] += elapsed
+            entry[1] += 1
+
+
+def phase(name: str) -> contextlib.AbstractContextManager:
+    """Time the enclosed block under ``name``; repeated phases are summed."""
+    if not _enabled:
+        return _NULL_PHASE
+    return _timed(name)
+
+
+def count(name: str, value: int = 1) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def flush() -> None:
+    """Append everything recorded so far to the profile file and reset."""
+    if not _enabled or _path is None:
+        return
+    stop()
+    with _lock:
+        runs, phases, counters = list(_runs), dict(_phases), dict(_counters)
+        _runs.clear()
+        _phases.clear()
+        _counters.clear()
+    if not (runs or phases or counters):
+        return
+    common = {"session": _session, "pid": os.getpid(), "commit": _commit()}
+    lines = [{**run, **common} for run in runs]
+    lines += [
+        {"kind": "phase", "name": name, "seconds": round(seconds, 6), "calls": calls, **common}
+        for name, (seconds, calls) in sorted(phases.items())
+    ]
+    lines += [
+        {"kind": "counter", "name": name, "value": value, **common} for name, value in sorted(counters.items())
+    ]
+    _path.parent.mkdir(parents=True, exist_ok=True)
+    with _path.open("a", encoding="utf-8") as handle:
+        for line in lines:
+            handle.write(json.dumps(line, sort_keys=True) + "\n")
@@ -0,0 +1,344 @@
+"""Long-running check server for editors and agents.
+
+    python3 -m scripts.checks serve [--socket PATH]
+    python3 -m scripts.checks ask [--socket PATH] OP [PATH ...] [--strict] [--runner ID]
+
+``serve`` listens on a Unix socket (default ``.cache/checks/server.sock``) and
+keeps the adapter plan, compiled templates, skill results and parsed Markdown
+documents in memory between requests. Every cached entry remembers the
+``(mtime_ns, size, inode)`` of the file it came from and is dropped when that
+changes, so answers always reflect the working tree.
+
+The protocol is one JSON object per line in each direction. Requests:
+
+- ``{"op": "ping"}``
+- ``{"op": "validate", "paths": [...], "strict": false}``: validate each path as a
+  skill (a skill directory or its ``SKILL.md``) or as Markdown (link targets, and
+  anchors when ``strict``). Other paths are listed under ``skipped``. Paths are
+  repository-relative; an absolute one, or one escaping the root, is an error.
+- ``{"op": "adapters", "runners": [...], "paths": [...]}``: report generated
+  outputs that are out of sync, optionally limited to runners or output paths.
+- ``{"op": "stats"}``: cache sizes and request count.
+- ``{"op": "shutdown"}``
+
+Each reply carries ``ok`` and ``ms``; a malformed request, or one whose op raises,
+gets ``ok: false`` and ``error``. ``ask`` prints the reply and exits 0 when ``ok``, 1 otherwise and 2
+when no server is listening.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+from scripts.checks import REPO_ROOT, load_script
+from scripts.checks.manifest import DEFAULT_CACHE_PATH as MANIFEST_CACHE_PATH
+from scripts.checks.manifest import MANIFEST_PATH
+
+
+DEFAULT_SOCKET_PATH = ".cache/checks/server.sock"
+
+Stamp = tuple[int, int, int]
+
+
+def _stamp(path: Path) -> Stamp | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class CheckServer:
+    """The in-memory state behind the socket; ``handle`` is not thread-safe."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.adapters = importlib.import_module("scripts.adapters.generate_adapters")
+        self.skills = importlib.import_module("scripts.skills.validate_skills")
+        self.links = load_script("scripts.check_markdown_links", "scripts/check-markdown-links.py")
+        self.requests = 0
+        self._manifest_stamp: Stamp | None = None
+        self._plans: dict[tuple[str, ...] | None, list] = {}
+        self._template_stamps: dict[Path, Stamp | None] = {}
+        self._sync: dict[Path, tuple[tuple, bool]] = {}
+        self._skill_results: dict[Path, tuple[Stamp, list[str]]] = {}
+        self._doc_stamps: dict[Path, Stamp | None] = {}
+
+    def handle(self, request: object) -> dict:
+        started = time.perf_counter()
+        self.requests += 1
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get("op"), str):
+                raise ValueError("request must be a JSON object with an 'op' string")
+            handler = getattr(self, f"op_{request['op']}", None)
+            if handler is None:
+                raise ValueError(f"unknown op: {request['op']}")
+            reply = handler(request)
+        except (ValueError, OSError) as exc:
+            reply = {"ok": False, "error": str(exc)}
+        except Exception as exc:
+            # A failing op must not drop the client's connection or the server thread.
+            reply = {"ok": False, "error": f"internal error: {type(exc).__name__}: {exc}"}
+        reply["ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return reply
+
+    def op_ping(self, request: dict) -> dict:
+        return {"ok": True, "pid": os.getpid(), "root": str(self.root)}
+
+    def op_stats(self, request: dict) -> dict:
+        return {
+            "ok": True,
+            "requests": self.requests,
+            "adapter_plans": len(self._plans),
+            "templates": len(self.adapters._TEMPLATE_CACHE),
+            "adapter_results": len(self._sync),
+            "skills": len(self._skill_results),
+            "documents": len(self.links._DOCUMENTS),
+        }
+
+    def op_validate(self, request: dict) -> dict:
+        paths = _string_list(request, "paths")
+        strict = bool(request.get("strict", False))
+        self._refresh_documents()
+        errors: list[str] = []
+        checked = {"skills": 0, "markdown": 0}
+        skipped: list[str] = []
+        for raw in paths:
+            path = self._resolve(raw)
+            if path.is_dir() or path.name == "SKILL.md":
+                skill_dir = path if path.is_dir() else path.parent
+                skill_md = self._rel(skill_dir / "SKILL.md")
+                errors.extend(f"{skill_md}: {message}" for message in self._skill(skill_dir))
+                checked["skills"] += 1
+            elif path.suffix == ".md":
+                errors.extend(self.links._check_file(path, self.root, strict))
+                checked["markdown"] += 1
+            else:
+                skipped.append(raw)
+        self._stamp_new_documents()
+        return {"ok": not errors, "errors": errors, "checked": checked, "skipped": skipped}
+
+    def op_adapters(self, request: dict) -> dict:
+        runners = _string_list(request, "runners")
+        wanted = {self._resolve(raw) for raw in _string_list(request, "paths")}
+        targets = self._targets(tuple(sorted(runners)) if runners else None)
+        if wanted:
+            targets = [target for target in targets if target.path in wanted]
+        self._refresh_templates(targets)
+        drifted = [self._rel(target.path) for target in targets if not self._in_sync(target)]
+        return {"ok": not drifted, "drifted": drifted, "checked": len(targets)}
+
+    def op_shutdown(self, request: dict) -> dict:
+        return {"ok": True, "shutdown": True}
+
+    def _resolve(self, raw: str) -> Path:
+        path = Path(os.path.normpath(self.root / raw))
+        if os.path.isabs(raw) or not path.is_relative_to(self.root):
+            raise ValueError(f"path must be relative to the repository root: {raw}")
+        return path
+
+    def _rel(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _skill(self, skill_dir: Path) -> list[str]:
+        skill_md = skill_dir / "SKILL.md"
+        stamp = _stamp(skill_md)
+        if stamp is None:
+            self._skill_results.pop(skill_md, None)
+            return ["Missing SKILL.md"]
+        cached = self._skill_results.get(skill_md)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        messages = [error.message for error in self.skills.validate_skill_dir(skill_dir)]
+        self._skill_results[skill_md] = (stamp, messages)
+        return messages
+
+    def _refresh_documents(self) -> None:
+        # Existence can change between requests; resolved locations are pure path math.
+        self.links._STATUS.clear()
+        for path, stamp in list(self._doc_stamps.items()):
+            if _stamp(path) != stamp:
+                self.links._DOCUMENTS.pop(path, None)
+                del self._doc_stamps[path]
+
+    def _stamp_new_documents(self) -> None:
+        for path in self.links._DOCUMENTS:
+            if path not in self._doc_stamps:
+                self._doc_stamps[path] = _stamp(path)
+
+    def _targets(self, runners: tuple[str, ...] | None) -> list:
+        manifest_path = self.root / MANIFEST_PATH
+        stamp = _stamp(manifest_path)
+        if stamp != self._manifest_stamp:
+            self._plans.clear()
+            self._manifest_stamp = stamp
+        plan = self._plans.get(runners)
+        if plan is None:
+            if stamp is None:
+                raise ValueError(f"Manifest not found: {MANIFEST_PATH}")
+            plan = self._plans[runners] = self.adapters.load_targets(
+                self.root, manifest_path, list(runners) if runners else None, self.root / MANIFEST_CACHE_PATH
+            )
+        return plan
+
+    def _refresh_templates(self, targets: list) -> None:
+        paths: set[Path] = set()
+        for target in targets:
+            paths.add(target.template)
+            compiled = self.adapters._TEMPLATE_CACHE.get(target.template)
+            if compiled is not None:
+                # Partials are stamped too; invalidating one drops every template that includes it.
+                paths.update(compiled.partials)
+        for path in paths:
+            stamp = _stamp(path)
+            if self._template_stamps.get(path) != stamp:
+                self.adapters.invalidate_template(path)
+                self._template_stamps[path] = stamp
+
+    def _in_sync(self, target) -> bool:
+        compiled = self.adapters.compile_template(target.template, target.partial_root)
+        key = (_stamp(target.path), compiled.digest, compiled.bind(target.values), target.optional)
+        cached = self._sync.get(target.path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        rendered = compiled.render(target.values)
+        in_sync = not self.adapters.compare_or_stage(
+            target.path, rendered, True, None, optional=target.optional
+        )
+        self._sync[target.path] = (key, in_sync)
+        return in_sync
+
+
+def _string_list(request: dict, key: str) -> list[str]:
+    value = request.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"'{key}' must be a list of strings")
+    return value
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                reply = {"ok": False, "error": f"invalid JSON: {exc}"}
+            else:
+                with self.server.lock:
+                    reply = self.server.state.handle(request)
+            self.wfile.write(json.dumps(reply, sort_keys=True).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if reply.get("shutdown"):
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, state: CheckServer) -> None:
+        super().__init__(path, _Handler)
+        self.state = state
+        self.lock = threading.Lock()
+
+
+def _connect(path: Path) -> socket.socket:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path))
+    except OSError:
+        client.close()
+        raise
+    return client
+
+
+def serve(socket_path: Path) -> int:
+    if socket_path.exists():
+        try:
+            _connect(socket_path).close()
+        except OSError:
+            socket_path.unlink()
+        else:
+            print(f"A check server is already listening on {socket_path}", file=sys.stderr)
+            return 2
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    # Relative paths in requests, and skill roots, are relative to the repository root.
+    os.chdir(REPO_ROOT)
+    server = _Server(str(socket_path), CheckServer(REPO_ROOT))
+    print(f"check server listening on {socket_path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+    return 0
+
+
+def ask(socket_path: Path, request: dict) -> int:
+    try:
+        client = _connect(socket_path)
+    except OSError as exc:
+        print(f"No check server on {socket_path}: {exc}", file=sys.stderr)
+        return 2
+    with client, client.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        print("Check server closed the connection without replying", file=sys.stderr)
+        return 2
+    reply = json.loads(line)
+    print(json.dumps(reply, indent=2, sort_keys=True))
+    return 0 if reply.get("ok") else 1
+
+
+def main(argv: list[str]) -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--socket",
+        default=str(REPO_ROOT / DEFAULT_SOCKET_PATH),
+        help=f"Unix socket path (default: <repo>/{DEFAULT_SOCKET_PATH}).",
+    )
+    parser = argparse.ArgumentParser(
+        prog="python3 -m scripts.checks", description="Persistent check server and client."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", parents=[common], help="Run the check server in the foreground.")
+    client = commands.add_parser(
+        "ask", parents=[common], help="Send one request to a running server and print the JSON reply."
+    )
+    client.add_argument("op", choices=["ping", "validate", "adapters", "stats", "shutdown"])
+    client.add_argument(
+        "paths", nargs="*", help="validate: files or skill directories; adapters: output paths."
+    )
+    client.add_argument("--strict", action="store_true", help="validate: also check Markdown anchors.")
+    client.add_argument(
+        "--runner", action="append", default=[], help="adapters: limit to runner ID (repeatable)."
+    )
+    args = parser.parse_args(argv)
+
+    socket_path = Path(args.socket)
+    if args.command == "serve":
+        return serve(socket_path)
+    request: dict = {"op": args.op}
+    if args.op == "validate":
+        request.update(paths=args.paths, strict=args.strict)
+    elif args.op == "adapters":
+        request.update(paths=args.paths, runners=args.runner)
+    return ask(socket_path, request)
@@ -0,0 +1,29 @@
+"""Shared fixtures for the maintenance script tests."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.checks import REPO_ROOT
+
+
+@pytest.fixture
+def repo_copy(tmp_path: Path) -> Path:
+    """A copy of this repository's working tree, without git metadata or caches."""
+    root = tmp_path / "repo"
+    shutil.copytree(
+        REPO_ROOT, root, ignore=shutil.ignore_patterns(".git", "node_modules", ".cache", "__pycache__")
+    )
+    return root
+
+
+def run_script(root: Path, script: str, *args: str) -> subprocess.CompletedProcess:
+    """Run ``script`` from the repository copy at ``root`` in a fresh interpreter."""
+    return subprocess.run(
+        [sys.executable, str(root / script), *args], cwd=root, capture_output=True, text=True, timeout=120
+    )
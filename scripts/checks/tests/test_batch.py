@@ -0,0 +1,61 @@
+"""Batch mode across two repository copies: one in sync, one with drift and a broken link."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from scripts.checks import REPO_ROOT
+from scripts.checks.manifest import DEFAULT_CACHE_PATH as MANIFEST_CACHE_PATH
+
+
+def run_batch(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "scripts.checks", "batch", *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_batch_reports_each_repository(repo_copy: Path, tmp_path: Path) -> None:
+    broken = tmp_path / "broken"
+    shutil.copytree(repo_copy, broken)
+    adapter = broken / "adapters/codex/skills/orchestration-plan/SKILL.md"
+    adapter.write_text(adapter.read_text(encoding="utf-8") + "\nHand edit.\n", encoding="utf-8")
+    index = broken / "docs/INDEX.md"
+    index.write_text(index.read_text(encoding="utf-8") + "\n[Gone](gone.md)\n", encoding="utf-8")
+    report_path = tmp_path / "report.json"
+
+    result = run_batch(str(repo_copy), str(broken), "--jobs", "2", "--report", str(report_path))
+
+    assert result.returncode == 1, result.stderr
+    assert f"  - {broken}: failed links, adapters" in result.stderr
+    assert "FAIL: 1 of 2 repo(s) failed" in result.stderr
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert not report["ok"]
+    good, bad = report["repos"]
+    assert good["root"] == str(repo_copy) and good["ok"]
+    assert all(check["ok"] and not check["failures"] for check in good["checks"].values())
+    assert bad["root"] == str(broken) and not bad["ok"]
+    assert bad["checks"]["skills"]["ok"] and bad["checks"]["integrity"]["ok"]
+    assert bad["checks"]["adapters"]["failures"] == [
+        "adapters/codex/skills/orchestration-plan/SKILL.md: out of sync with "
+        "adapters/templates/skills/orchestration-plan/SKILL.md.tmpl"
+    ]
+    assert [failure for failure in bad["checks"]["links"]["failures"] if "gone.md" in failure]
+    assert report["summary"]["failed"] == 1
+
+
+def test_batch_passes_without_writing_into_the_repository(repo_copy: Path) -> None:
+    result = run_batch(str(repo_copy), "--jobs", "1", "--checks", "integrity")
+
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout)
+    assert report["ok"] and report["checks"] == ["integrity"]
+    assert "OK: 1 repo(s) passed 1 check(s)" in result.stderr
+    assert not (repo_copy / MANIFEST_CACHE_PATH).exists()
@@ -0,0 +1,77 @@
+"""The read-once cache serves repeat reads and drops entries when told to."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts.checks import files
+
+
+@pytest.fixture
+def cached():
+    files.enable()
+    yield
+    files.disable()
+
+
+def test_disabled_reads_disk_every_time(tmp_path: Path) -> None:
+    path = tmp_path / "a.json"
+    path.write_text('{"v": 1}', encoding="utf-8")
+    assert files.read_json(path) == {"v": 1}
+    path.write_text('{"v": 2}', encoding="utf-8")
+    assert files.read_json(path) == {"v": 2}
+
+
+def test_enabled_reads_once(tmp_path: Path, cached) -> None:
+    path = tmp_path / "a.json"
+    path.write_text('{"v": 1}', encoding="utf-8")
+    assert files.read_json(path) == {"v": 1}
+    path.write_text('{"v": 2}', encoding="utf-8")
+    assert files.read_bytes(path) == b'{"v": 1}'
+    assert files.read_text(path) == '{"v": 1}'
+    assert files.read_json(path) == {"v": 1}
+
+
+def test_forget_drops_every_view(tmp_path: Path, cached) -> None:
+    path = tmp_path / "a.md"
+    path.write_bytes(b"one\r\n")
+    assert files.read_text(path) == "one\n"
+    assert files.read_text(path, errors="replace") == "one\n"
+    path.write_bytes(b"two\xff\n")
+    files.forget(path)
+    assert files.read_bytes(path) == b"two\xff\n"
+    assert files.read_text(path, errors="replace") == "two�\n"
+    with pytest.raises(UnicodeDecodeError):
+        files.read_text(path)
+
+
+def test_forget_matches_relative_and_absolute_paths(tmp_path: Path, cached, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("a.txt").write_text("one", encoding="utf-8")
+    assert files.read_text(Path("a.txt")) == "one"
+    Path("a.txt").write_text("two", encoding="utf-8")
+    files.forget(tmp_path / "a.txt")
+    assert files.read_text(Path("a.txt")) == "two"
+
+
+def test_clear_and_disable_empty_the_cache(tmp_path: Path, cached) -> None:
+    path = tmp_path / "a.txt"
+    path.write_text("one", encoding="utf-8")
+    files.read_text(path)
+    path.write_text("two", encoding="utf-8")
+    files.clear()
+    assert files.read_text(path) == "two"
+    files.disable()
+    path.write_text("three", encoding="utf-8")
+    files.enable()
+    assert files.read_text(path) == "three"
+
+
+def test_missing_file_is_not_cached(tmp_path: Path, cached) -> None:
+    path = tmp_path / "late.txt"
+    with pytest.raises(FileNotFoundError):
+        files.read_bytes(path)
+    path.write_text("here", encoding="utf-8")
+    assert files.read_text(path) == "here"
@@ -0,0 +1,253 @@
+"""generate_adapters.py write paths, run against a copy of the repository."""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+import subprocess
+from pathlib import Path
+
+from conftest import run_script
+
+from scripts.adapters import generate_adapters as adapters
+from scripts.checks import gitobjects
+from scripts.checks.manifest import MANIFEST_PATH
+
+
+SCRIPT = "scripts/adapters/generate_adapters.py"
+PLAN = "adapters/claude/skills/orchestration-plan/SKILL.md"
+
+
+def claude_targets(root: Path) -> list[adapters.Target]:
+    targets = adapters.load_targets(root, root / MANIFEST_PATH, ["claude"])
+    return [target for target in targets if target.path.exists()]
+
+
+def is_hit(target: adapters.Target, root: Path, cache: adapters.BuildCache) -> bool:
+    # A fresh entry skips rendering, so the result carries no content.
+    return adapters.sync_target(target, root, cache, True, None).content is None
+
+
+def test_build_cache_hits_until_an_input_or_the_output_changes(repo_copy: Path) -> None:
+    cache_path = repo_copy / adapters.DEFAULT_CACHE_PATH
+    targets = claude_targets(repo_copy)
+    cache = adapters.BuildCache(cache_path)
+    for target in targets:
+        result = adapters.sync_target(target, repo_copy, cache, True, None)
+        assert result.content is not None and not result.changed
+        cache.record(result.key, result.inputs, target.path, result.content)
+    cache.save()
+
+    cache = adapters.BuildCache(cache_path)
+    assert all(is_hit(target, repo_copy, cache) for target in targets)
+
+    plan = next(target for target in targets if target.path == repo_copy / PLAN)
+    retitled = dataclasses.replace(plan, values={**plan.values, "RUNNER_TITLE": "Other"})
+    assert not is_hit(retitled, repo_copy, cache)
+
+    stat = plan.path.stat()
+    os.utime(plan.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not is_hit(plan, repo_copy, cache)
+    os.utime(plan.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert is_hit(plan, repo_copy, cache)
+
+    plan.path.write_text(plan.path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    os.utime(plan.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert not is_hit(plan, repo_copy, cache)
+
+    plan.template.write_text(plan.template.read_text(encoding="utf-8") + "\nMore.\n", encoding="utf-8")
+    adapters.invalidate_template(plan.template)
+    assert not is_hit(plan, repo_copy, cache)
+
+
+def test_no_cache_neither_trusts_nor_updates_the_build_cache(repo_copy: Path) -> None:
+    cache_path = repo_copy / adapters.DEFAULT_CACHE_PATH
+    assert run_script(repo_copy, SCRIPT, "--check", "--no-cache").returncode == 0
+    assert not cache_path.exists()
+    assert run_script(repo_copy, SCRIPT, "--check").returncode == 0
+    recorded = cache_path.read_bytes()
+
+    # Same size and mtime: the cache trusts the stat, --no-cache reads the file.
+    plan = repo_copy / PLAN
+    stat = plan.stat()
+    text = plan.read_text(encoding="utf-8")
+    plan.write_text(text.replace("Plan", "PLAN", 1), encoding="utf-8")
+    os.utime(plan, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert run_script(repo_copy, SCRIPT, "--check").returncode == 0
+    result = run_script(repo_copy, SCRIPT, "--check", "--no-cache", "--list")
+    assert result.returncode == 1
+    assert result.stdout.splitlines() == [PLAN]
+    assert cache_path.read_bytes() == recorded
+
+
+def staging_dirs(root: Path) -> list[Path]:
+    return sorted((root / adapters.STAGING_PARENT).glob("staging-*"))
+
+
+def test_writes_replace_outputs_instead_of_rewriting_them(repo_copy: Path) -> None:
+    plan = repo_copy / PLAN
+    expected = plan.read_text(encoding="utf-8")
+    plan.write_text(expected + "Hand edit.\n", encoding="utf-8")
+    old = repo_copy / "old-plan.md"
+    os.link(plan, old)
+
+    result = run_script(repo_copy, SCRIPT, "--jobs", "4")
+
+    assert result.returncode == 0, result.stderr
+    assert plan.read_text(encoding="utf-8") == expected
+    # os.replace swaps in a new inode; a file rewritten in place would change the link too.
+    assert old.read_text(encoding="utf-8") == expected + "Hand edit.\n"
+    assert staging_dirs(repo_copy) == []
+
+
+def test_a_failing_target_leaves_every_output_untouched(repo_copy: Path) -> None:
+    first = repo_copy / "adapters/codex/skills/orchestration-arm/SKILL.md"
+    first.unlink()
+    plan = repo_copy / PLAN
+    plan.write_text("stale\n", encoding="utf-8")
+    # KILO.md is the last target, so every other output has rendered and staged by then.
+    kilo = repo_copy / "adapters/templates/root/KILO.md.tmpl"
+    kilo.write_text(kilo.read_text(encoding="utf-8") + "{{UNKNOWN}}\n", encoding="utf-8")
+
+    for args in ([], ["--jobs", "4"]):
+        result = run_script(repo_copy, SCRIPT, "--no-cache", *args)
+        assert result.returncode == 2, result.stderr
+        assert not first.exists()
+        assert plan.read_text(encoding="utf-8") == "stale\n"
+        assert staging_dirs(repo_copy) == []
+
+
+def identical_outputs(root: Path) -> list[Path]:
+    """Make the plan template runner-independent; return its required outputs, which now render identically."""
+    template = root / "adapters/templates/skills/orchestration-plan/SKILL.md.tmpl"
+    template.write_text("---\nname: orchestration-plan\ndescription: Shared plan.\n---\n", encoding="utf-8")
+    targets = adapters.load_targets(root, root / MANIFEST_PATH, None)
+    return [target.path for target in targets if target.template == template and not target.optional]
+
+
+def test_store_hardlinks_identical_outputs(repo_copy: Path) -> None:
+    group = identical_outputs(repo_copy)
+    assert len(group) > 3
+
+    result = run_script(repo_copy, SCRIPT, "--store", "--jobs", "4")
+
+    assert result.returncode == 0, result.stderr
+    assert len({path.stat().st_ino for path in group}) == 1
+    assert group[0].stat().st_nlink >= len(group)
+    rerun = run_script(repo_copy, SCRIPT, "--store")
+    assert rerun.stdout == "OK: generated adapter files (0 file(s) updated)\n"
+
+
+def test_link_or_copy_falls_back_to_a_copy(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source.md"
+    source.write_text("shared\n", encoding="utf-8")
+    linked = tmp_path / "out/linked.md"
+    adapters.link_or_copy(source, linked)
+    assert linked.stat().st_ino == source.stat().st_ino
+
+    def refuse(src, dst):
+        raise PermissionError("links not allowed")
+
+    monkeypatch.setattr(adapters.os, "link", refuse)
+    copied = tmp_path / "out/copied.md"
+    copied.write_text("old\n", encoding="utf-8")
+    adapters.link_or_copy(source, copied)
+    assert copied.read_text(encoding="utf-8") == "shared\n"
+    assert copied.stat().st_ino != source.stat().st_ino
+    assert sorted(path.name for path in copied.parent.iterdir()) == ["copied.md", "linked.md"]
+
+
+def test_check_store_compares_each_member(repo_copy: Path) -> None:
+    group = identical_outputs(repo_copy)
+    assert run_script(repo_copy, SCRIPT, "--store").returncode == 0
+    assert run_script(repo_copy, SCRIPT, "--check", "--store", "--no-cache").returncode == 0
+
+    # An unlinked copy with the right bytes passes; a member with other bytes or none at all does not.
+    copy_member, drifted, missing = group[:3]
+    content = copy_member.read_bytes()
+    copy_member.unlink()
+    copy_member.write_bytes(content)
+    drifted.unlink()
+    drifted.write_bytes(content + b"Hand edit.\n")
+    missing.unlink()
+
+    result = run_script(repo_copy, SCRIPT, "--check", "--store", "--no-cache", "--list", "--jobs", "4")
+
+    assert result.returncode == 1
+    assert result.stdout.splitlines() == [
+        path.relative_to(repo_copy).as_posix() for path in group if path in (drifted, missing)
+    ]
+    assert group[3].read_bytes() == content
+
+
+def commit(root: Path, message: str) -> str:
+    for args in (["add", "-A"], ["-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", message]):
+        subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True)
+    return gitobjects.resolve_commit(root, "HEAD")
+
+
+def revision_history(root: Path) -> list[str]:
+    """Commits: in sync, an unrelated edit, a drifted output, a broken manifest."""
+    subprocess.run(["git", "init", "-q", str(root)], check=True, capture_output=True)
+    commits = [commit(root, "in sync")]
+    (root / "README.md").write_text("# Renamed\n", encoding="utf-8")
+    commits.append(commit(root, "unrelated"))
+    (root / PLAN).write_text("Hand edit.\n", encoding="utf-8")
+    commits.append(commit(root, "drift"))
+    (root / MANIFEST_PATH).write_text("{", encoding="utf-8")
+    commits.append(commit(root, "broken manifest"))
+    return commits
+
+
+def test_rev_range_reports_each_commit(repo_copy: Path) -> None:
+    first, unrelated, drift, broken = revision_history(repo_copy)
+
+    # The working tree has the broken manifest too; revisions are read from git objects only.
+    result = run_script(repo_copy, SCRIPT, "--rev", first)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == f"{first[:12]} OK\nOK: adapter files in sync at 1 commit(s)\n"
+
+    result = run_script(repo_copy, SCRIPT, "--rev-range", f"{first}..HEAD")
+
+    assert result.returncode == 1
+    assert result.stdout == f"{unrelated[:12]} OK\n"
+    lines = result.stderr.splitlines()
+    assert lines[:2] == [f"{drift[:12]} FAIL: 1 adapter file(s) out of sync", f"  {PLAN}"]
+    assert lines[2].startswith(f"{broken[:12]} ERROR: ")
+    assert lines[3:] == ["FAIL: 2 of 3 commit(s) out of sync"]
+
+
+def test_revision_auditor_reuses_unchanged_commits(repo_copy: Path) -> None:
+    first, unrelated, drift, _ = revision_history(repo_copy)
+    with gitobjects.BlobReader(repo_copy) as reader:
+        auditor = adapters.RevisionAuditor(repo_copy, reader, MANIFEST_PATH, None)
+        clean = auditor.audit(first)
+        compiled = sum(len(variants) for variants in auditor._templates.values())
+        assert clean == []
+        assert auditor.audit(unrelated) is clean
+        assert auditor.audit(drift) == [PLAN]
+        assert sum(len(variants) for variants in auditor._templates.values()) == compiled
+
+
+def test_validate_rejects_rendered_output_before_writing(repo_copy: Path) -> None:
+    assert run_script(repo_copy, SCRIPT, "--validate", "--check").returncode == 0
+
+    template = repo_copy / "adapters/templates/skills/orchestration-plan/SKILL.md.tmpl"
+    text = template.read_text(encoding="utf-8")
+    text = text.replace("name: orchestration-plan", "name: orchestration-planner", 1)
+    template.write_text(text, encoding="utf-8")
+    plan = repo_copy / PLAN
+    plan.unlink()
+    other = repo_copy / "adapters/claude/skills/orchestration-arm/SKILL.md"
+    other.unlink()
+
+    for args in ([], ["--check"], ["--store", "--jobs", "4"]):
+        result = run_script(repo_copy, SCRIPT, "--validate", *args)
+        assert result.returncode == 1, (args, result.stderr)
+        lines = result.stderr.splitlines()
+        assert lines[0] == "FAIL: rendered adapter output failed validation:"
+        assert (
+            f"  - {PLAN} (from adapters/templates/skills/orchestration-plan/SKILL.md.tmpl): "
+            "name 'orchestration-planner' does not match directory 'orchestration-plan'"
+        ) in lines
+        assert not plan.exists() and not other.exists()
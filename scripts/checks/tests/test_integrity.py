@@ -0,0 +1,55 @@
+"""TokenIndex finds every overlapping token occurrence in one scan."""
+
+from __future__ import annotations
+
+import random
+
+from scripts.checks.integrity import TokenIndex, order_failure
+
+
+def naive_offsets(tokens: set[str], text: str) -> dict[str, list[int]]:
+    offsets: dict[str, list[int]] = {}
+    for token in tokens:
+        found = [start for start in range(len(text)) if text.startswith(token, start)]
+        if found:
+            offsets[token] = found
+    return offsets
+
+
+def test_overlapping_and_prefix_tokens() -> None:
+    index = TokenIndex(["gate", "gate:build", "build", "ate", "e:b"])
+    assert index.scan("gate:build gate") == {
+        "gate": [0, 11],
+        "gate:build": [0],
+        "ate": [1, 12],
+        "e:b": [3],
+        "build": [5],
+    }
+
+
+def test_special_characters_are_literal() -> None:
+    index = TokenIndex(["a.b", "(x)", "[y]*", "$1"])
+    assert index.scan("axb (x) [y]* a.b $1") == {"(x)": [4], "[y]*": [8], "a.b": [13], "$1": [17]}
+
+
+def test_empty_and_non_string_tokens_are_ignored() -> None:
+    index = TokenIndex(["", None, 3, "ok"])
+    assert index.tokens == frozenset({"ok"})
+    assert TokenIndex([]).scan("anything") == {}
+
+
+def test_matches_naive_search_on_random_input() -> None:
+    rng = random.Random(1018)
+    for _ in range(500):
+        tokens = {
+            "".join(rng.choice("ab:") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))
+        }
+        text = "".join(rng.choice("ab: ") for _ in range(rng.randint(0, 40)))
+        assert TokenIndex(tokens).scan(text) == naive_offsets(tokens, text), (tokens, text)
+
+
+def test_order_failure() -> None:
+    offsets = TokenIndex(["arm", "design", "plan"]).scan("plan arm design plan")
+    assert order_failure(offsets, ["arm", "design", "plan"]) is None
+    assert order_failure(offsets, ["design", "arm"]) == "stage token 'arm' appears out of order"
+    assert order_failure(offsets, ["arm", "build"]) == "missing stage token 'build'"
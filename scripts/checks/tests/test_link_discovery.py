@@ -0,0 +1,85 @@
+"""Markdown discovery for the link checker: config globs and the walk outside git."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.checks import load_script
+
+
+links = load_script("scripts.check_markdown_links", "scripts/check-markdown-links.py")
+
+
+def touch(root: Path, *rels: str) -> None:
+    for rel in rels:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# Title\n", encoding="utf-8")
+
+
+def rels(root: Path, paths: list[Path]) -> list[str]:
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def test_config_defaults_and_errors(tmp_path: Path) -> None:
+    assert links._load_config(tmp_path, None) == {"include": links.DEFAULT_INCLUDE, "exclude": []}
+    with pytest.raises(ValueError, match="config file not found"):
+        links._load_config(tmp_path, "missing.json")
+    (tmp_path / "links.json").write_text(json.dumps({"exclude": "drafts/*"}), encoding="utf-8")
+    with pytest.raises(ValueError, match="'exclude' must be a list of glob strings"):
+        links._load_config(tmp_path, "links.json")
+    (tmp_path / "links.json").write_text(json.dumps({"include": ["*.md"]}), encoding="utf-8")
+    assert links._load_config(tmp_path, "links.json") == {"include": ["*.md"], "exclude": []}
+
+
+def test_globs_match_across_directories(tmp_path: Path) -> None:
+    touch(
+        tmp_path,
+        "README.md",
+        "notes.txt",
+        "docs/guide.md",
+        "docs/deep/more.md",
+        "dist/top.md",
+        "pkg/dist/built.md",
+        "pkg/src/dist/built.md",
+        "drafts/wip.md",
+    )
+    found = links._iter_markdown_files(tmp_path, ["*/dist/*", "drafts/*"], ["*.md"])
+    # '*' also matches '/': '*.md' reaches every depth, '*/dist/*' any dist directory but the top one.
+    assert rels(tmp_path, found) == ["README.md", "dist/top.md", "docs/deep/more.md", "docs/guide.md"]
+    # The default includes: 'docs/*.md' covers nested docs too.
+    assert rels(tmp_path, links._iter_markdown_files(tmp_path, [])) == [
+        "README.md",
+        "docs/deep/more.md",
+        "docs/guide.md",
+    ]
+
+
+def test_walk_honours_nested_gitignore_files_outside_git(tmp_path: Path) -> None:
+    touch(
+        tmp_path,
+        "README.md",
+        "build/out.md",
+        "debug.log",
+        "keep.log",
+        "docs/guide.md",
+        "docs/local.md",
+        "docs/sub/local.md",
+        "docs/sub/cache/page.md",
+        ".git/HEAD.md",
+    )
+    (tmp_path / ".gitignore").write_text("build/\n*.log\n!keep.log\n# comment\n", encoding="utf-8")
+    (tmp_path / "docs/.gitignore").write_text("/local.md\n**/cache/\n", encoding="utf-8")
+
+    expected = [".gitignore", "README.md", "docs/.gitignore", "docs/guide.md", "docs/sub/local.md", "keep.log"]
+    assert sorted(links._walk_files(tmp_path)) == expected
+    # Not a git work tree, so discovery falls back to the walk.
+    assert sorted(links._list_repo_files(tmp_path)) == expected
+    assert rels(tmp_path, links._iter_markdown_files(tmp_path, [], ["*.md"])) == [
+        "README.md",
+        "docs/guide.md",
+        "docs/sub/local.md",
+    ]
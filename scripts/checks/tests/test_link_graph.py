@@ -0,0 +1,115 @@
+"""Incremental link checks: dirty nodes and reverse-dependency propagation."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from scripts.checks import load_script
+
+
+links = load_script("scripts.check_markdown_links", "scripts/check-markdown-links.py")
+
+
+def git(root: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    (root / "docs").mkdir(parents=True)
+    (root / "README.md").write_text("[a](docs/a.md#intro) and [b](docs/b.md)\n", encoding="utf-8")
+    (root / "docs/a.md").write_text("# Intro\n\nText.\n", encoding="utf-8")
+    (root / "docs/b.md").write_text("[home](../README.md)\n", encoding="utf-8")
+    (root / "docs/c.md").write_text("[a](a.md)\n", encoding="utf-8")
+    git(root, "init", "-q")
+    git(root, "add", ".")
+    git(root, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    return root
+
+
+def run(root: Path, capsys, *args: str) -> tuple[int, str, str]:
+    # Each run is a fresh process in practice; drop the per-run caches.
+    links._DOCUMENTS.clear()
+    links._LOCATIONS.clear()
+    links._STATUS.clear()
+    code = links.main(["--root", str(root), "--strict", *args])
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+def test_first_run_checks_everything_then_nothing(repo: Path, capsys) -> None:
+    code, out, _ = run(repo, capsys, "--incremental")
+    assert code == 0
+    assert "re-checked 4 of 4" in out
+    assert "re-checked 0 of 4" in run(repo, capsys, "--incremental")[1]
+
+
+def test_editing_a_target_rechecks_its_sources(repo: Path, capsys) -> None:
+    run(repo, capsys, "--incremental")
+    (repo / "docs/a.md").write_text("# Renamed\n", encoding="utf-8")
+    code, out, err = run(repo, capsys, "--incremental")
+    assert code == 1
+    # a.md itself plus README.md and c.md, which link to it; b.md is untouched.
+    assert "re-checked 3 of 4" in out
+    assert "README.md: missing anchor '#intro' in docs/a.md" in err
+
+
+def test_deleting_a_target_fails_its_backlinks(repo: Path, capsys) -> None:
+    run(repo, capsys, "--incremental")
+    assert run(repo, capsys, "--backlinks", "docs/b.md")[1] == "README.md\n"
+    (repo / "docs/b.md").unlink()
+    code, out, err = run(repo, capsys, "--incremental")
+    assert code == 1
+    assert "re-checked 1 of 3" in out
+    assert "README.md: missing target: docs/b.md" in err
+    # The failure is remembered for untouched sources on the next run.
+    code, out, err = run(repo, capsys, "--incremental")
+    assert code == 1
+    assert "re-checked 0 of 3" in out
+    assert "README.md: missing target: docs/b.md" in err
+
+
+def test_changed_since_adds_git_diff_paths(repo: Path, capsys) -> None:
+    run(repo, capsys, "--incremental")
+    # Same size and mtime: the saved stat signature cannot see this edit.
+    path = repo / "docs/c.md"
+    info = path.stat()
+    path.write_text("[x](x.md)\n", encoding="utf-8")
+    os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns))
+    assert run(repo, capsys, "--incremental")[0] == 0
+    code, out, err = run(repo, capsys, "--changed-since", "HEAD")
+    assert code == 1
+    assert "docs/c.md: missing target: x.md" in err
+
+
+def test_changed_since_after_a_commit(repo: Path, capsys) -> None:
+    run(repo, capsys, "--incremental")
+    (repo / "docs/c.md").write_text("[gone](gone.md)\n", encoding="utf-8")
+    git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qam", "break")
+    # Nothing differs from HEAD, but the graph's stamps still see the committed edit.
+    code, out, err = run(repo, capsys, "--changed-since", "HEAD")
+    assert code == 1
+    assert "re-checked 1 of 4" in out
+    assert "docs/c.md: missing target: gone.md" in err
+    code, out, err = run(repo, capsys, "--changed-since", "HEAD~1")
+    assert code == 1
+    assert "docs/c.md: missing target: gone.md" in err
+
+
+def test_changed_paths_are_relative_to_a_nested_root(repo: Path) -> None:
+    # Paths under docs/docs start with the root's own name, which must not be stripped again.
+    nested = repo / "docs/docs"
+    nested.mkdir()
+    (nested / "page.md").write_text("# Page\n", encoding="utf-8")
+    git(repo, "add", ".")
+    git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "nested")
+    (nested / "page.md").write_text("# Changed\n", encoding="utf-8")
+    (repo / "docs/a.md").write_text("# Changed\n", encoding="utf-8")
+    (repo / "README.md").write_text("# Changed\n", encoding="utf-8")
+    (nested / "new.md").write_text("# New\n", encoding="utf-8")
+    assert links._git_changed_paths(repo / "docs", "HEAD") == {"docs/page.md", "a.md", "docs/new.md"}
@@ -0,0 +1,89 @@
+"""The one-pass Markdown tokenizer agrees with the regexes it replaced."""
+
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+from scripts.checks.links import Document, extract_target, normalize_ref_label, parse_markdown, slugify
+
+
+# The link checker's original regexes, kept here as the reference behaviour.
+INLINE_LINK_RE = re.compile(r"!\[[^\]]*]\(([^)]+)\)|\[[^\]]+]\(([^)]+)\)")
+REFERENCE_DEF_RE = re.compile(r"^\s*\[([^\]]+)]:\s*(\S+)\s*$")
+REFERENCE_USE_RE = re.compile(r"(?<!!)\[([^\]]+)\]\[([^\]]*)\]")
+HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*$")
+
+
+def regex_document(text: str) -> Document:
+    lines: list[str] = []
+    in_fence = False
+    for line in text.splitlines():
+        if line.strip().startswith("```"):
+            in_fence = not in_fence
+            continue
+        if not in_fence:
+            lines.append(line)
+    unfenced = "\n".join(lines)
+    doc = Document()
+    for line in unfenced.splitlines():
+        heading = HEADING_RE.match(line)
+        if heading and heading.group(1).strip():
+            doc.anchors.add(slugify(heading.group(1).strip()))
+        definition = REFERENCE_DEF_RE.match(line)
+        if definition:
+            doc.reference_defs[normalize_ref_label(definition.group(1))] = extract_target(definition.group(2))
+    doc.links = [match.group(1) or match.group(2) for match in INLINE_LINK_RE.finditer(unfenced)]
+    doc.reference_uses = [match.group(2) or match.group(1) for match in REFERENCE_USE_RE.finditer(unfenced)]
+    return doc
+
+
+CASES = {
+    "plain": "See [the guide](docs/GUIDE.md) and [home](../README.md#top).",
+    "image": "![logo](assets/logo.png) then ![](empty-alt.png) and [](not-a-link.md)",
+    "nested brackets": "[outer [inner] text](a.md) [[double]](b.md) [a [b [c]]](c.md)",
+    "bracket runs": "[[[[x](y.md) ]]]] [ ](space.md) [x]](z.md)",
+    "code span": "Use `[not](code.md)` or `` [tick](twice.md) `` before [real](real.md).",
+    "fenced code": "```\n[fenced](no.md)\n# Not a heading\n```\n[after](yes.md)\n````md\n[x](y.md)\n````",
+    "angle targets": "[a](<docs/with space.md>) [b](<x.md> \"title\") [c](d.md 'title')",
+    "reference links": (
+        "[Guide][guide] and [Other][] and ![img][logo] and [Spaced][ Mixed  Case ]\n"
+        "\n"
+        "[guide]: docs/GUIDE.md\n"
+        "  [Mixed Case]: <docs/CASE.md>\n"
+        "[logo]: assets/logo.png \"title\"\n"
+        "[other]:other.md\n"
+        "[not a def]: two words\n"
+    ),
+    "headings": "# Title\n   ### Indented  \n    #### Too deep\n#NoSpace\n####### Seven\n## Trailing ##\n#\n",
+    "unclosed": "[" * 50 + "](x.md) " + "[a](" * 20 + "]" * 10,
+    "adjacent": "[a](b.md)[c](d.md)![e](f.png)[g][h][i][]",
+}
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_matches_regexes(name: str) -> None:
+    assert parse_markdown(CASES[name]) == regex_document(CASES[name])
+
+
+def test_matches_regexes_on_random_input() -> None:
+    rng = random.Random(20261018)
+    alphabet = ["[", "]", "(", ")", "!", "#", " ", "\n", ":", "`", "<", ">", "a", "b", ".md", "```\n"]
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        assert parse_markdown(text) == regex_document(text), repr(text)
+
+
+def test_reference_labels_and_targets_are_normalized() -> None:
+    doc = parse_markdown("[x][ Mixed   CASE ]\n\n[mixed case]: <docs/a.md>\n")
+    assert doc.reference_uses == [" Mixed   CASE "]
+    assert doc.reference_defs == {"mixed case": "docs/a.md"}
+    assert normalize_ref_label(doc.reference_uses[0]) in doc.reference_defs
+
+
+def test_slugify() -> None:
+    assert slugify("Hello, World!") == "hello-world"
+    assert slugify("  A -- B  ") == "a-b"
+    assert slugify("`code` & more") == "code-more"
@@ -0,0 +1,113 @@
+"""The adapter manifest model: validation problems and the on-disk model cache."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.checks import REPO_ROOT
+from scripts.checks import manifest as manifest_module
+from scripts.checks.manifest import MANIFEST_PATH, ManifestError, load_manifest, parse_manifest
+
+
+RAW = json.loads((REPO_ROOT / MANIFEST_PATH).read_text(encoding="utf-8"))
+
+
+def encode(data: dict) -> bytes:
+    return json.dumps(data).encode("utf-8")
+
+
+def test_the_repository_manifest_parses(tmp_path: Path) -> None:
+    model = parse_manifest(tmp_path, encode(RAW))
+    assert list(model.runners) == [runner["name"] for runner in RAW["runners"]]
+    codex = model.runners["codex"]
+    assert codex.stage_adapters["plan"].rel == "adapters/codex/skills/orchestration-plan/SKILL.md"
+    assert codex.stage_adapters["plan"].path == tmp_path / "adapters/codex/skills/orchestration-plan/SKILL.md"
+    assert model.expected_gates["plan"] == "plan-gate.json"
+
+
+def test_every_problem_is_reported_at_once(tmp_path: Path) -> None:
+    data = json.loads(json.dumps(RAW))
+    first, second = data["runners"][:2]
+    first["skills_root"] = "/abs/skills"
+    first["stage_adapters"]["plan"] = "../outside/SKILL.md"
+    del first["stage_adapters"]["build"]
+    first["stage_adapters"]["deploy"] = "adapters/codex/deploy/SKILL.md"
+    second["name"] = first["name"]
+    data["generation"]["template_root"] = "../templates"
+
+    with pytest.raises(ManifestError) as raised:
+        parse_manifest(tmp_path, encode(data))
+
+    assert raised.value.problems == (
+        "generation.template_root: path escapes repository root: '../templates'",
+        "runner 'codex' skills_root: path must be repository-relative, got absolute path '/abs/skills'",
+        "runner 'codex' missing stage mappings: build",
+        "runner 'codex' has unknown stage mappings: deploy",
+        "runner 'codex' stage 'plan': path escapes repository root: '../outside/SKILL.md'",
+        "duplicate runner name 'codex'",
+    )
+    assert str(raised.value).startswith("invalid adapter manifest:\n  - generation.template_root")
+
+
+def test_unreadable_manifests_are_single_problems(tmp_path: Path) -> None:
+    with pytest.raises(ManifestError, match="not valid JSON") as raised:
+        parse_manifest(tmp_path, b"{")
+    assert len(raised.value.problems) == 1
+    with pytest.raises(ManifestError, match="Manifest not found"):
+        load_manifest(tmp_path, tmp_path / MANIFEST_PATH)
+
+
+def write_manifest(root: Path, data: dict) -> Path:
+    path = root / MANIFEST_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encode(data))
+    return path
+
+
+def test_disk_cache_is_keyed_by_digest_and_root(tmp_path: Path, monkeypatch) -> None:
+    root = tmp_path / "repo"
+    path = write_manifest(root, RAW)
+    cache_path = tmp_path / "model.json"
+    model = load_manifest(root, path, cache_path)
+    key = (model.digest, str(root))
+    assert json.loads(cache_path.read_text(encoding="utf-8"))["model"]["root"] == str(root)
+    assert manifest_module._read_cache(cache_path, key) == model
+
+    # A fresh process has no in-memory models; the disk entry is used without parsing.
+    monkeypatch.setattr(manifest_module, "_MODELS", {})
+
+    def no_parse(root: Path, data: bytes):
+        raise AssertionError("parsed despite a matching cache entry")
+
+    monkeypatch.setattr(manifest_module, "parse_manifest", no_parse)
+    assert load_manifest(root, path, cache_path) == model
+    monkeypatch.undo()
+
+    other_root = tmp_path / "other"
+    assert manifest_module._read_cache(cache_path, (model.digest, str(other_root))) is None
+    moved = load_manifest(other_root, path, cache_path)
+    assert moved.runners["codex"].skills_root.path.is_relative_to(other_root)
+
+    edited = {**RAW, "expected_gates": {**RAW["expected_gates"], "plan": "new-plan-gate.json"}}
+    write_manifest(root, edited)
+    assert manifest_module._read_cache(cache_path, key) is None
+    assert load_manifest(root, path, cache_path).expected_gates["plan"] == "new-plan-gate.json"
+
+
+def test_bad_cache_files_are_ignored(tmp_path: Path) -> None:
+    path = write_manifest(tmp_path, RAW)
+    cache_path = tmp_path / "model.json"
+    model = load_manifest(tmp_path, path, cache_path)
+    key = (model.digest, str(tmp_path))
+    payload = json.loads(cache_path.read_text(encoding="utf-8"))
+
+    stale = {**payload, "version": manifest_module.CACHE_VERSION + 1}
+    cache_path.write_text(json.dumps(stale), encoding="utf-8")
+    assert manifest_module._read_cache(cache_path, key) is None
+    cache_path.write_text("{", encoding="utf-8")
+    assert manifest_module._read_cache(cache_path, key) is None
+    cache_path.write_text(json.dumps({**payload, "model": {"digest": model.digest}}), encoding="utf-8")
+    assert manifest_module._read_cache(cache_path, key) is None
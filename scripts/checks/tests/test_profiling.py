@@ -0,0 +1,81 @@
+"""Profiling: the disabled fast path and the JSON-lines records."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import run_script
+
+from scripts.checks import profiling
+
+
+COMMON = {"session", "pid", "commit"}
+
+
+def read_records(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_disabled_profiling_records_nothing(monkeypatch) -> None:
+    monkeypatch.delenv(profiling.ENV_PATH, raising=False)
+    monkeypatch.setattr(profiling, "_enabled", False)
+    monkeypatch.setattr(profiling, "_path", None)
+    monkeypatch.setattr(profiling, "_phases", {})
+    monkeypatch.setattr(profiling, "_counters", {})
+    monkeypatch.setattr(profiling, "_active", {})
+
+    profiling.start("tool", argparse.Namespace(profile=None, profile_cprofile=False), [])
+    assert profiling.phase("a") is profiling.phase("b") is profiling._NULL_PHASE
+    with profiling.phase("a"):
+        profiling.count("b", 3)
+    profiling.stop(0)
+    profiling.flush()
+    assert not profiling._enabled
+    assert profiling._phases == profiling._counters == profiling._active == {}
+
+
+def test_runs_append_run_phase_and_counter_records(repo_copy: Path, tmp_path: Path) -> None:
+    profile = tmp_path / "profile.jsonl"
+    script = "scripts/adapters/generate_adapters.py"
+    for _ in range(2):
+        assert run_script(repo_copy, script, "--check", "--profile", str(profile)).returncode == 0
+
+    records = read_records(profile)
+    runs = [record for record in records if record["kind"] == "run"]
+    argv = ["--check", "--profile", str(profile)]
+    assert [(run["tool"], run["argv"]) for run in runs] == [("generate_adapters", argv)] * 2
+    assert len({run["pid"] for run in runs}) == 2
+    for record in records:
+        assert COMMON <= set(record)
+        if record["kind"] == "run":
+            assert set(record) == COMMON | {"kind", "tool", "argv", "seconds"}
+        elif record["kind"] == "phase":
+            assert set(record) == COMMON | {"kind", "name", "seconds", "calls"}
+            assert record["calls"] >= 1 and record["seconds"] >= 0
+        else:
+            assert record["kind"] == "counter"
+            assert set(record) == COMMON | {"kind", "name", "value"}
+            assert isinstance(record["value"], int)
+    phases = {record["name"] for record in records if record["kind"] == "phase"}
+    assert {"adapters.manifest_load", "adapters.cache_load", "adapters.sync"} <= phases
+
+
+def test_engine_records_one_run_per_check(repo_copy: Path, tmp_path: Path) -> None:
+    profile = tmp_path / "profile.jsonl"
+    result = subprocess.run(
+        [sys.executable, "-m", "scripts.checks", "skills", "integrity", "--profile", str(profile)],
+        cwd=repo_copy,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+
+    runs = {record["tool"]: record for record in read_records(profile) if record["kind"] == "run"}
+    assert set(runs) == {"checks", "validate_skills", "integrity"}
+    assert runs["validate_skills"]["exit"] == 0 and runs["integrity"]["exit"] == 0
+    assert len({record["session"] for record in runs.values()}) == 1
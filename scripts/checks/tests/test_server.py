@@ -0,0 +1,126 @@
+"""Round trips through the check server's Unix socket against a copy of the repository."""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from scripts.checks.server import CheckServer, _Server
+
+
+@pytest.fixture
+def repo(repo_copy: Path) -> Path:
+    return repo_copy
+
+
+@pytest.fixture
+def server(repo: Path, tmp_path: Path):
+    path = str(tmp_path / "checks.sock")
+    server = _Server(path, CheckServer(repo))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, path, thread
+    server.shutdown()
+    thread.join(timeout=10)
+    server.server_close()
+
+
+class Client:
+    def __init__(self, path: str) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(30)
+        self.socket.connect(path)
+        self.stream = self.socket.makefile("rwb")
+
+    def send_line(self, line: bytes) -> dict:
+        self.stream.write(line + b"\n")
+        self.stream.flush()
+        return json.loads(self.stream.readline())
+
+    def ask(self, request: dict) -> dict:
+        return self.send_line(json.dumps(request).encode("utf-8"))
+
+    def close(self) -> None:
+        self.stream.close()
+        self.socket.close()
+
+
+@pytest.fixture
+def client(server):
+    client = Client(server[1])
+    yield client
+    client.close()
+
+
+def test_ping(client: Client, repo: Path) -> None:
+    reply = client.ask({"op": "ping"})
+    assert reply["ok"] is True
+    assert reply["root"] == str(repo)
+    assert "ms" in reply
+
+
+def test_validate(client: Client, repo: Path) -> None:
+    (repo / "good.md").write_text("[readme](README.md)\n", encoding="utf-8")
+    (repo / "bad.md").write_text("[gone](nope.md)\n", encoding="utf-8")
+    reply = client.ask({"op": "validate", "paths": ["good.md", "bad.md", "Makefile"]})
+    assert reply["ok"] is False
+    assert reply["errors"] == ["bad.md: missing target: nope.md"]
+    assert reply["checked"] == {"skills": 0, "markdown": 2}
+    assert reply["skipped"] == ["Makefile"]
+
+    # The parsed document is dropped once the file changes.
+    (repo / "bad.md").write_text("[readme](README.md)\n", encoding="utf-8")
+    assert client.ask({"op": "validate", "paths": ["bad.md"]})["ok"] is True
+
+
+def test_adapters_after_template_edit(client: Client, repo: Path) -> None:
+    reply = client.ask({"op": "adapters", "runners": ["claude"]})
+    assert reply["ok"] is True, reply
+    assert reply["checked"] > 0
+
+    template = repo / "adapters/templates/skills/orchestration-plan/SKILL.md.tmpl"
+    template.write_text(template.read_text(encoding="utf-8") + "\nEdited.\n", encoding="utf-8")
+    reply = client.ask({"op": "adapters", "runners": ["claude"]})
+    assert reply["ok"] is False
+    assert reply["drifted"] == ["adapters/claude/skills/orchestration-plan/SKILL.md"]
+
+
+def test_bad_requests_keep_the_connection(client: Client, server) -> None:
+    reply = client.send_line(b"{not json")
+    assert reply["ok"] is False
+    assert reply["error"].startswith("invalid JSON")
+    assert client.ask({"op": "nope"})["error"] == "unknown op: nope"
+    assert client.ask({"op": "validate", "paths": "README.md"})["ok"] is False
+
+    def op_boom(request: dict) -> dict:
+        raise RuntimeError("boom")
+
+    server[0].state.op_boom = op_boom
+    reply = client.ask({"op": "boom"})
+    assert reply["ok"] is False
+    assert reply["error"] == "internal error: RuntimeError: boom"
+    assert client.ask({"op": "ping"})["ok"] is True
+
+
+def test_paths_outside_the_root_are_rejected(client: Client, repo: Path) -> None:
+    outside = repo.parent / "outside.md"
+    outside.write_text("[x](missing.md)\n", encoding="utf-8")
+    for raw in (str(outside), "../outside.md", "docs/../../outside.md"):
+        reply = client.ask({"op": "validate", "paths": [raw]})
+        assert reply["ok"] is False
+        assert reply["error"] == f"path must be relative to the repository root: {raw}"
+    reply = client.ask({"op": "adapters", "paths": [str(repo / "CLAUDE.md")]})
+    assert reply["ok"] is False and "error" in reply
+    assert client.ask({"op": "validate", "paths": ["docs/../README.md"]})["ok"] is True
+
+
+def test_shutdown(client: Client, server) -> None:
+    assert client.ask({"op": "shutdown"})["shutdown"] is True
+    assert client.stream.readline() == b""
+    # serve_forever returns once the shutdown reply has been sent.
+    server[2].join(timeout=10)
+    assert not server[2].is_alive()
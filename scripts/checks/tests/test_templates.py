@@ -0,0 +1,94 @@
+"""Adapter template partials: includes, cycles, bad names and invalidation."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from conftest import run_script
+
+from scripts.adapters import generate_adapters as adapters
+
+
+ROOT = Path("/templates")
+
+
+def compile_sources(sources: dict[str, str], name: str = "main") -> adapters.CompiledTemplate:
+    def source(path: Path) -> str:
+        rel = path.relative_to(ROOT).as_posix().removesuffix(adapters.PARTIAL_SUFFIX)
+        if rel not in sources:
+            raise FileNotFoundError(path)
+        return sources[rel]
+
+    return adapters.compile_tree(ROOT / f"{name}{adapters.PARTIAL_SUFFIX}", ROOT, source, {})
+
+
+def test_partials_are_inlined_with_their_tokens() -> None:
+    compiled = compile_sources(
+        {
+            "main": "# {{RUNNER_TITLE}}\n{{> shared/body}}\nend\n",
+            "shared/body": "root: {{ADAPTER_ROOT}}\n{{> shared/footer}}\n",
+            "shared/footer": "footer\n",
+        }
+    )
+    rendered = compiled.render({"RUNNER_TITLE": "Kilo", "ADAPTER_ROOT": ".kilo"})
+    assert rendered == "# Kilo\nroot: .kilo\nfooter\nend\n"
+    assert compiled.partials == (ROOT / "shared/body.md.tmpl", ROOT / "shared/footer.md.tmpl")
+
+
+def test_cycle_reports_the_include_chain() -> None:
+    with pytest.raises(ValueError, match=r"partial include cycle: a\.md\.tmpl -> b\.md\.tmpl -> a\.md\.tmpl"):
+        compile_sources({"main": "{{> a}}", "a": "{{> b}}", "b": "{{> a}}"})
+    with pytest.raises(ValueError, match=r"cycle: shared/loop\.md\.tmpl -> shared/loop\.md\.tmpl"):
+        compile_sources({"main": "{{> shared/loop}}", "shared/loop": "x {{> shared/loop}}"})
+
+
+def test_missing_partial() -> None:
+    with pytest.raises(ValueError, match=r"missing partial 'shared/nope'"):
+        compile_sources({"main": "{{> shared/nope}}"})
+
+
+def test_partial_name_cannot_escape_the_template_root() -> None:
+    with pytest.raises(ValueError, match=r"partial escapes the template root: \.\./\.\./etc/passwd"):
+        compile_sources({"main": "{{> ../../etc/passwd}}"})
+
+
+def test_unknown_token_in_a_partial() -> None:
+    with pytest.raises(ValueError, match=r"unresolved template token\(s\): UNKNOWN"):
+        compile_sources({"main": "{{> part}}", "part": "{{UNKNOWN}}"})
+
+
+def test_partial_edit_invalidates_the_includer(tmp_path: Path) -> None:
+    (tmp_path / "shared").mkdir()
+    main = tmp_path / "main.md.tmpl"
+    partial = tmp_path / "shared/part.md.tmpl"
+    main.write_text("before\n{{> shared/part}}\nafter\n", encoding="utf-8")
+    partial.write_text("one\n", encoding="utf-8")
+    first = adapters.compile_template(main, tmp_path)
+    assert first.render({}) == "before\none\nafter\n"
+    assert adapters.compile_template(main, tmp_path) is first
+
+    partial.write_text("two\n", encoding="utf-8")
+    adapters.invalidate_template(partial)
+    second = adapters.compile_template(main, tmp_path)
+    assert second.digest != first.digest
+    assert second.input_digest({}) != first.input_digest({})
+    assert second.render({}) == "before\ntwo\nafter\n"
+
+
+@pytest.mark.parametrize(
+    "template, text, message",
+    [
+        ("shared/adapter-entry.md.tmpl", "{{> shared/adapter-entry}}\n", "partial include cycle"),
+        ("root/KILO.md.tmpl", "{{UNKNOWN}}\n", "unresolved template token(s): UNKNOWN"),
+        ("root/KILO.md.tmpl", "{{> shared/missing}}\n", "missing partial 'shared/missing'"),
+    ],
+)
+def test_template_errors_exit_2(repo_copy: Path, template: str, text: str, message: str) -> None:
+    (repo_copy / "adapters/templates" / template).write_text(text, encoding="utf-8")
+    for args in (["--check"], ["--check", "--jobs", "4"], ["--check", "--store"], []):
+        result = run_script(repo_copy, "scripts/adapters/generate_adapters.py", "--no-cache", *args)
+        assert result.returncode == 2, (args, result.stderr)
+        assert result.stderr.startswith("template error: "), result.stderr
+        assert message in result.stderr
+        assert "Traceback" not in result.stderr
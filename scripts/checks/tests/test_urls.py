@@ -0,0 +1,149 @@
+"""External link checks against a stand-in HTTP server on 127.0.0.1."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from scripts.checks.urls import MAX_REDIRECTS, UrlCache, check_urls
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _reply(self, status: int, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _route(self) -> None:
+        self.server.seen.append((self.command, self.path))
+        if self.path in ("/ok", "/caf%C3%A9/na%C3%AFve.md?q=%C3%BC"):
+            self._reply(200)
+        elif self.path == "/no-head":
+            self._reply(405 if self.command == "HEAD" else 200)
+        elif self.path == "/drop-head":
+            if self.command == "HEAD":
+                # Hang up without a reply, as some servers do for HEAD.
+                self.close_connection = True
+                return
+            self._reply(200)
+        elif self.path == "/missing":
+            self._reply(404)
+        elif self.path == "/moved":
+            self._reply(301, {"Location": "/ok"})
+        elif self.path.startswith("/loop/"):
+            self._reply(302, {"Location": f"/loop/{int(self.path[6:]) + 1}"})
+        elif self.path == "/slow":
+            self.server.release.wait(10)
+            self._reply(200)
+        else:
+            self._reply(500)
+
+    do_HEAD = _route
+    do_GET = _route
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.seen = []
+    server.release = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=10)
+
+
+def test_head_then_get_fallback(site) -> None:
+    server, base = site
+    results = check_urls([f"{base}/ok", f"{base}/no-head", f"{base}/missing"], None, 60)
+    assert results[f"{base}/ok"].ok and results[f"{base}/ok"].status == 200
+    assert results[f"{base}/no-head"].ok and results[f"{base}/no-head"].status == 200
+    assert not results[f"{base}/missing"].ok
+    assert results[f"{base}/missing"].detail == "HTTP 404"
+    assert sorted(server.seen) == [
+        ("GET", "/missing"),
+        ("GET", "/no-head"),
+        ("HEAD", "/missing"),
+        ("HEAD", "/no-head"),
+        ("HEAD", "/ok"),
+    ]
+
+
+def test_get_fallback_when_head_drops_the_connection(site) -> None:
+    server, base = site
+    # /ok first leaves a keep-alive connection in the pool; the GET must not reuse it.
+    results = check_urls([f"{base}/ok", f"{base}/drop-head"], None, 60, per_host=1)
+    result = results[f"{base}/drop-head"]
+    assert result.ok and result.status == 200, result
+    assert ("HEAD", "/drop-head") in server.seen
+    assert ("GET", "/drop-head") in server.seen
+
+
+def test_redirects(site) -> None:
+    server, base = site
+    results = check_urls([f"{base}/moved", f"{base}/loop/0"], None, 60)
+    assert results[f"{base}/moved"].ok
+    loop = results[f"{base}/loop/0"]
+    assert not loop.ok
+    assert loop.error == "too many redirects"
+    assert sum(1 for _, path in server.seen if path.startswith("/loop/")) == MAX_REDIRECTS + 1
+
+
+def test_timeout(site) -> None:
+    _, base = site
+    started = time.perf_counter()
+    result = check_urls([f"{base}/slow"], None, 60, timeout=0.3)[f"{base}/slow"]
+    assert not result.ok
+    assert result.error == "timed out after 0.3s"
+    assert time.perf_counter() - started < 5
+
+
+def test_non_ascii_paths_are_percent_encoded(site) -> None:
+    server, base = site
+    url = f"{base}/café/naïve.md?q=ü"
+    assert check_urls([url], None, 60)[url].ok
+    assert server.seen == [("HEAD", "/caf%C3%A9/na%C3%AFve.md?q=%C3%BC")]
+    # Already-encoded URLs are sent unchanged.
+    server.seen.clear()
+    encoded = f"{base}/caf%C3%A9/na%C3%AFve.md?q=%C3%BC"
+    assert check_urls([encoded], None, 60)[encoded].ok
+    assert server.seen == [("HEAD", "/caf%C3%A9/na%C3%AFve.md?q=%C3%BC")]
+
+
+def test_ttl_cache_hit_and_expiry(site, tmp_path: Path) -> None:
+    server, base = site
+    cache_path = tmp_path / "external-links.json"
+    urls = [f"{base}/ok", f"{base}/missing"]
+    check_urls(urls, cache_path, 3600)
+    assert len(server.seen) == 3
+    # Only the success is cached; the failure is retried.
+    assert list(json.loads(cache_path.read_text(encoding="utf-8"))["entries"]) == [f"{base}/ok"]
+
+    server.seen.clear()
+    results = check_urls(urls, cache_path, 3600)
+    assert results[f"{base}/ok"].ok
+    assert ("HEAD", "/ok") not in server.seen
+
+    # Age the entry past the TTL: it is checked again.
+    data = json.loads(cache_path.read_text(encoding="utf-8"))
+    data["entries"][f"{base}/ok"]["checked"] -= 7200
+    cache_path.write_text(json.dumps(data), encoding="utf-8")
+    assert UrlCache(cache_path, 3600).get(f"{base}/ok", time.time()) is None
+    server.seen.clear()
+    assert check_urls([f"{base}/ok"], cache_path, 3600)[f"{base}/ok"].ok
+    assert server.seen == [("HEAD", "/ok")]
@@ -0,0 +1,203 @@
+"""validate_skills.py: the streaming scan, multi-root runs and the result cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+from scripts.skills import validate_skills as skills
+
+
+def skill_text(name: str = "demo", front: int = 0, body: int = 1) -> str:
+    """SKILL.md with ``front`` extra frontmatter comment lines and ``body`` body lines."""
+    lines = ["---", f"name: {name}", "description: A demo skill.", *["# note"] * front, "---"]
+    lines += [f"line {number}" for number in range(body)]
+    return "\n".join(lines) + "\n"
+
+
+def counting(text: str, consumed: list[int]) -> Iterator[str]:
+    for line in text.splitlines(keepends=True):
+        consumed[0] += 1
+        yield line
+
+
+def test_scan_collects_fields_and_the_first_deep_reference() -> None:
+    text = skill_text() + "See references/a/b.md and scripts/c/d.py.\n"
+    scan = skills._scan_lines(counting(text, [0]))
+    assert (scan.name, scan.description, scan.frontmatter_error) == ("demo", "A demo skill.", None)
+    assert scan.deep_ref == "references/a/b.md"
+    assert skills.validate_skill_text(text, "other") == [
+        "name 'demo' does not match directory 'other'",
+        "Deep file reference found: 'references/a/b.md'",
+    ]
+
+
+def test_line_limit_counts_newlines_like_the_original_rule() -> None:
+    # The original rule was ``text.count("\n") + 1 > 500``.
+    header = skill_text(body=0).count("\n")
+    assert skills.validate_skill_text(skill_text(body=skills.MAX_LINES - 1 - header), "demo") == []
+    assert skills.validate_skill_text(skill_text(body=skills.MAX_LINES - header), "demo") == [
+        "SKILL.md too long (more than 500 lines)"
+    ]
+
+
+def test_scan_stops_at_the_line_limit() -> None:
+    consumed = [0]
+    scan = skills._scan_lines(counting(skill_text(body=5000), consumed))
+    assert scan.too_long and scan.frontmatter_error is None
+    assert consumed[0] == skills.MAX_LINES
+
+
+def test_long_frontmatter_is_read_to_its_closing_line() -> None:
+    consumed = [0]
+    text = skill_text(front=600, body=5000)
+    scan = skills._scan_lines(counting(text, consumed))
+    assert scan.too_long and scan.frontmatter_error is None
+    assert (scan.name, scan.description) == ("demo", "A demo skill.")
+    # Three field lines, 600 comments and the closing ---.
+    assert consumed[0] == 604
+    assert skills.validate_skill_text(text, "demo") == ["SKILL.md too long (more than 500 lines)"]
+
+
+def test_unterminated_frontmatter_is_still_reported() -> None:
+    text = "---\nname: demo\ndescription: A demo skill.\n" + "# note\n" * 700
+    assert skills.validate_skill_text(text, "demo") == [
+        "Unterminated YAML frontmatter (missing closing ---).",
+        "SKILL.md too long (more than 500 lines)",
+    ]
+
+
+def test_validate_skill_dir_reads_the_file(tmp_path: Path) -> None:
+    skill_dir = tmp_path / "demo"
+    skill_dir.mkdir()
+    assert skills.validate_skill_dir(skill_dir) == [skills.SkillError(skill_dir, "Missing SKILL.md")]
+    (skill_dir / "SKILL.md").write_text(skill_text(name="Demo"), encoding="utf-8")
+    assert [error.message for error in skills.validate_skill_dir(skill_dir)] == [
+        "Invalid name: 'Demo'",
+        "name 'Demo' does not match directory 'demo'",
+    ]
+
+
+def make_root(path: Path, count: int) -> Path:
+    for number in range(count):
+        skill_dir = path / f"skill-{number:02d}"
+        skill_dir.mkdir(parents=True)
+        # Every other skill carries a name that does not match its directory.
+        name = skill_dir.name if number % 2 else f"wrong-{number}"
+        (skill_dir / "SKILL.md").write_text(skill_text(name=name), encoding="utf-8")
+    (path / "skill-99").mkdir()
+    return path
+
+
+def test_errors_keep_root_and_directory_order_under_jobs(tmp_path: Path, capsys, monkeypatch) -> None:
+    monkeypatch.setattr(skills, "REPO_ROOT", tmp_path)
+    first = make_root(tmp_path / "first", 12)
+    second = make_root(tmp_path / "second", 9)
+    roots = ["--root", str(second), "--root", str(first)]
+
+    outputs = []
+    for args in (["--no-cache"], ["--no-cache", "--jobs", "4"], ["--jobs", "4"], ["--jobs", "4"]):
+        assert skills.main([*roots, *args]) == 1
+        outputs.append(capsys.readouterr().err)
+
+    assert len(set(outputs)) == 1
+    paths = [line.split(":", 1)[0] for line in outputs[0].splitlines() if line.startswith(str(tmp_path))]
+    expected = [
+        str(root / name / "SKILL.md") if name != "skill-99" else str(root / name)
+        for root, count in ((second, 9), (first, 12))
+        for name in [f"skill-{number:02d}" for number in range(0, count, 2)] + ["skill-99"]
+    ]
+    assert paths == expected
+    assert outputs[0].endswith(f"\nFAIL: {len(expected)} error(s)\n")
+
+
+def test_a_missing_or_empty_root_is_a_usage_error(tmp_path: Path, capsys) -> None:
+    good = make_root(tmp_path / "good", 1)
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    missing = tmp_path / "missing"
+    roots = ["--root", str(good), "--root", str(empty), "--root", str(missing)]
+    assert skills.main(["--no-cache", "--jobs", "2", *roots]) == 2
+    assert capsys.readouterr().err == (
+        f"{empty}: no skill directories found\n{missing}: no skill directories found\n"
+        "\nFAIL: 2 root(s) missing or empty\n"
+    )
+
+
+def count_validations(monkeypatch) -> list[tuple[str, str]]:
+    validated: list[tuple[str, str]] = []
+    real = skills._validate_text_job
+
+    def job(args: tuple[str, str]) -> tuple[list[str], float]:
+        validated.append(args)
+        return real(args)
+
+    monkeypatch.setattr(skills, "_validate_text_job", job)
+    return validated
+
+
+def write_skill(path: Path, text: str) -> Path:
+    path.mkdir(parents=True)
+    (path / "SKILL.md").write_text(text, encoding="utf-8")
+    return path
+
+
+def test_cache_keys_results_by_content_and_directory_name(tmp_path: Path, monkeypatch) -> None:
+    validated = count_validations(monkeypatch)
+    text = skill_text(name="shared")
+    dirs = [
+        write_skill(tmp_path / "a/shared", text),
+        write_skill(tmp_path / "b/shared", text),
+        write_skill(tmp_path / "b/renamed", text),
+    ]
+    cache_path = tmp_path / "cache.json"
+    cache = skills.ValidationCache(cache_path)
+
+    results = skills._validate_cached(dirs, cache, 1)
+
+    # Identical copies are validated once; a different directory name is a different result.
+    assert [name for _, name in validated] == ["shared", "renamed"]
+    assert [[error.message for error in errors] for errors, _ in results] == [
+        [],
+        [],
+        ["name 'shared' does not match directory 'renamed'"],
+    ]
+    cache.save()
+
+    validated.clear()
+    again = skills._validate_cached(dirs, skills.ValidationCache(cache_path), 1)
+    assert validated == []
+    assert [errors for errors, _ in again] == [errors for errors, _ in results]
+
+    (dirs[0] / "SKILL.md").write_text(skill_text(name="shared") + "More.\n", encoding="utf-8")
+    skills._validate_cached(dirs, skills.ValidationCache(cache_path), 1)
+    assert [name for _, name in validated] == ["shared"]
+
+
+def test_validator_version_bump_discards_the_cache(tmp_path: Path, monkeypatch) -> None:
+    validated = count_validations(monkeypatch)
+    dirs = [write_skill(tmp_path / "demo", skill_text())]
+    cache_path = tmp_path / "cache.json"
+    cache = skills.ValidationCache(cache_path)
+    skills._validate_cached(dirs, cache, 1)
+    cache.save()
+    assert skills.ValidationCache(cache_path).results
+
+    monkeypatch.setattr(skills, "VALIDATOR_VERSION", skills.VALIDATOR_VERSION + 1)
+    validated.clear()
+    cache = skills.ValidationCache(cache_path)
+    assert cache.files == {} and cache.results == {}
+    skills._validate_cached(dirs, cache, 1)
+    assert len(validated) == 1
+
+
+def test_save_drops_results_for_content_no_longer_on_disk(tmp_path: Path) -> None:
+    skill_dir = write_skill(tmp_path / "demo", skill_text())
+    cache_path = tmp_path / "cache.json"
+    cache = skills.ValidationCache(cache_path)
+    skills._validate_cached([skill_dir], cache, 1)
+    (skill_dir / "SKILL.md").write_text(skill_text() + "More.\n", encoding="utf-8")
+    skills._validate_cached([skill_dir], cache, 1)
+    assert len(cache.results) == 2
+    cache.save()
+    assert len(skills.ValidationCache(cache_path).results) == 1
@@ -0,0 +1,244 @@
+"""Check external http(s) URLs concurrently, with results cached on disk.
+
+``check_urls`` takes an already de-duplicated set of URLs and checks those not
+fresh in the cache on one asyncio event loop. A small HTTP/1.1 client keeps a
+pool of keep-alive connections per host, so many URLs on one host share a few
+sockets. Each URL gets a ``HEAD``. If that is refused with an error status, or
+the connection is dropped or reset (some servers mishandle ``HEAD``), a ``GET``
+is sent, on a new connection after a failure, and only its headers are read.
+Redirects are followed up to ``MAX_REDIRECTS``. Only successes are cached;
+failures are retried on the next run so a fixed link or a transient outage
+clears itself. The standard library is enough, so the checker works offline
+against a local stand-in server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import ssl
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote, urljoin, urlsplit
+
+from scripts.checks import profiling
+
+
+CACHE_VERSION = 1
+# Characters left as-is when percent-encoding a request target: RFC 3986 path
+# characters, plus "%" so targets that are already encoded pass through unchanged.
+PATH_SAFE = "/%:@!$&'()*+,;="
+MAX_REDIRECTS = 5
+MAX_CONNECTIONS = 32
+USER_AGENT = "check-markdown-links"
+
+
+@dataclass(frozen=True)
+class UrlResult:
+    url: str
+    ok: bool
+    status: int | None = None
+    error: str | None = None
+
+    @property
+    def detail(self) -> str:
+        return self.error or f"HTTP {self.status}"
+
+
+class UrlCache:
+    """``{url: {"status", "checked"}}`` for URLs that answered successfully."""
+
+    def __init__(self, path: Path | None, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
+        if isinstance(data.get("entries"), dict):
+            self.entries = data["entries"]
+
+    def get(self, url: str, now: float) -> UrlResult | None:
+        entry = self.entries.get(url)
+        if not entry or now - entry.get("checked", 0) > self.ttl:
+            return None
+        return UrlResult(url, True, entry.get("status"))
+
+    def record(self, result: UrlResult, now: float) -> None:
+        if result.ok:
+            self.entries[result.url] = {"status": result.status, "checked": now}
+        else:
+            self.entries.pop(result.url, None)
+        self.dirty = True
+
+    def save(self, now: float) -> None:
+        if self.path is None or not self.dirty:
+            return
+        live = {url: entry for url, entry in sorted(self.entries.items()) if self.get(url, now) is not None}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".partial")
+        payload = {"version": CACHE_VERSION, "entries": live}
+        tmp.write_text(json.dumps(payload, indent=1) + "\n", encoding="utf-8")
+        tmp.replace(self.path)
+
+
+class _HostPool:
+    """Keep-alive connections to one ``(scheme, host, port)``, at most ``limit`` in use."""
+
+    def __init__(self, scheme: str, host: str, port: int, netloc: str, limit: int, timeout: float) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.netloc = netloc
+        self.timeout = timeout
+        self.slots = asyncio.Semaphore(limit)
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.scheme == "https":
+            context = ssl.create_default_context()
+            return await asyncio.open_connection(self.host, self.port, ssl=context, server_hostname=self.host)
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, target: str, fresh: bool = False) -> tuple[int, dict[str, str]]:
+        async with self.slots:
+            while True:
+                pooled = bool(self.idle) and not fresh
+                conn = self.idle.pop() if pooled else await asyncio.wait_for(self._open(), self.timeout)
+                try:
+                    status, headers, keep = await asyncio.wait_for(
+                        self._exchange(conn, method, target), self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    conn[1].close()
+                    raise
+                except (OSError, asyncio.IncompleteReadError):
+                    conn[1].close()
+                    if pooled:
+                        # The server closed an idle keep-alive connection; try the next one.
+                        continue
+                    raise
+                if keep:
+                    self.idle.append(conn)
+                else:
+                    conn[1].close()
+                return status, headers
+
+    async def _exchange(
+        self, conn: tuple[asyncio.StreamReader, asyncio.StreamWriter], method: str, target: str
+    ) -> tuple[int, dict[str, str], bool]:
+        reader, writer = conn
+        profiling.count("links.external.requests")
+        writer.write(
+            f"{method} {target} HTTP/1.1\r\nHost: {self.netloc}\r\nUser-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\nConnection: keep-alive\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
+        while True:
+            # Raises LimitOverrunError past the stream's 64 KiB limit.
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            fields = lines[0].split(" ", 2)
+            if len(fields) < 2 or not fields[0].startswith("HTTP/") or not fields[1].isdigit():
+                raise ConnectionError(f"malformed status line: {lines[0][:80]!r}")
+            status = int(fields[1])
+            if status >= 200 or status == 101:
+                break
+            # Skip interim 1xx responses.
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        # Only a bodiless HEAD reply leaves the connection ready for the next request.
+        closing = headers.get("connection", "").lower() == "close"
+        keep = method == "HEAD" and fields[0] == "HTTP/1.1" and not closing
+        return status, headers, keep
+
+    def close(self) -> None:
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+async def _check_all(urls: list[str], per_host: int, timeout: float) -> list[UrlResult]:
+    pools: dict[tuple[str, str, int], _HostPool] = {}
+    overall = asyncio.Semaphore(MAX_CONNECTIONS)
+
+    def pool_for(url: str) -> tuple[_HostPool, str]:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        pool = pools.get(key)
+        if pool is None:
+            netloc = parts.netloc.rpartition("@")[2]
+            pool = pools[key] = _HostPool(parts.scheme, parts.hostname, port, netloc, per_host, timeout)
+        # The request line must be ASCII: encode non-ASCII paths as a browser would.
+        target = quote(parts.path or "/", safe=PATH_SAFE)
+        if parts.query:
+            target += "?" + quote(parts.query, safe=PATH_SAFE + "?")
+        return pool, target
+
+    async def check(url: str) -> UrlResult:
+        current = url
+        status: int | None = None
+        try:
+            async with overall:
+                for _ in range(MAX_REDIRECTS + 1):
+                    pool, target = pool_for(current)
+                    try:
+                        status, headers = await pool.request("HEAD", target)
+                    except (OSError, asyncio.IncompleteReadError):
+                        # Some servers reset or drop HEAD requests; GET on a new connection.
+                        status, headers = await pool.request("GET", target, fresh=True)
+                    if status >= 400:
+                        status, headers = await pool.request("GET", target)
+                    location = headers.get("location")
+                    if 300 <= status < 400 and location:
+                        current = urljoin(current, location)
+                        continue
+                    return UrlResult(url, status < 400, status)
+            return UrlResult(url, False, status, "too many redirects")
+        except asyncio.TimeoutError:
+            return UrlResult(url, False, status, f"timed out after {timeout:g}s")
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as exc:
+            return UrlResult(url, False, status, str(exc) or type(exc).__name__)
+
+    try:
+        return list(await asyncio.gather(*(check(url) for url in urls)))
+    finally:
+        for pool in pools.values():
+            pool.close()
+
+
+def check_urls(
+    urls: list[str], cache_path: Path | None, ttl: float, per_host: int = 4, timeout: float = 10.0
+) -> dict[str, UrlResult]:
+    """Check each of ``urls`` once, reusing cached successes younger than ``ttl`` seconds."""
+    now = time.time()
+    cache = UrlCache(cache_path, ttl)
+    results: dict[str, UrlResult] = {}
+    pending: list[str] = []
+    for url in dict.fromkeys(urls):
+        cached = cache.get(url, now)
+        if cached is not None:
+            results[url] = cached
+        else:
+            pending.append(url)
+    profiling.count("links.external.urls", len(results) + len(pending))
+    profiling.count("links.external.cache_hits", len(results))
+    if pending:
+        for result in asyncio.run(_check_all(pending, max(1, per_host), timeout)):
+            results[result.url] = result
+            cache.record(result, now)
+        cache.save(now)
+    return results
@@ -24,7 +24,7 @@ delete_matches "*.tmp"
 delete_matches "*.bak"
 delete_matches "*.orig"
 
-for cache_dir in ".pytest_cache" ".mypy_cache" ".ruff_cache"; do
+for cache_dir in ".pytest_cache" ".mypy_cache" ".ruff_cache" ".cache"; do
   if [[ -d "$cache_dir" ]]; then
     rm -rf "$cache_dir"
     echo "removed: $cache_dir/"
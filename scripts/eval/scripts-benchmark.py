@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""Benchmark the Python maintenance scripts against synthetic repositories.
+
+For each size preset a throwaway repository is generated with N runners x M
+stages in its adapter manifest, K skill directories per runner, and D Markdown
+docs with L links and H headings each (plus pathological docs: runs of unclosed
+brackets, dangling link openers and long fence sequences). The scripts are copied
+into it and each scenario is run in a fresh interpreter, recording wall time,
+peak RSS and the number of repository files opened. Results are compared against
+a JSON baseline, committed as ``scripts/eval/scripts-baseline.json``, and the run
+fails when a metric regresses past the threshold. File opens are compared on any
+machine; wall time and peak RSS only when the baseline was recorded on the same
+host, platform and Python, and are otherwise just reported.
+
+Everything runs offline with the standard library; peak RSS comes from
+``resource`` and file opens from an audit hook, so Linux (or macOS) is enough.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+# Committed next to this script: .cache/ is wiped by clean-local.sh.
+DEFAULT_BASELINE_PATH = "scripts/eval/scripts-baseline.json"
+BASELINE_VERSION = 2
+# Globs copied into every synthetic repository so the scripts resolve it as their root.
+SCRIPT_FILES = [
+    "scripts/adapters/generate_adapters.py",
+    "scripts/skills/validate_skills.py",
+    "scripts/check-markdown-links.py",
+    "scripts/check-markdown-links.json",
+    "scripts/checks/*.py",
+]
+QUALITY_GATE_PHASES = [
+    "arm",
+    "design",
+    "adversarial-review",
+    "plan",
+    "pmatch",
+    "build",
+    "quality-static",
+    "quality-tests",
+    "denoise",
+    "quality-frontend",
+    "quality-backend",
+    "quality-docs",
+    "security-review",
+    "release-readiness",
+]
+PMATCH_TOKENS = ['drift_config.mode = "dual-extractor"', "extractor_claim_sets"]
+# Noise floors below which a slower or larger result is never a regression.
+WALL_FLOOR_S = 0.05
+RSS_FLOOR_KB = 2048
+FLOORS = {"wall_s": WALL_FLOOR_S, "peak_rss_kb": RSS_FLOOR_KB, "opens": 0}
+# Wall time and RSS only mean something on the machine that recorded them; file
+# opens depend on the code alone and are compared everywhere.
+MACHINE_METRICS = frozenset({"wall_s", "peak_rss_kb"})
+
+
+@dataclass(frozen=True)
+class Size:
+    runners: int
+    stages: int
+    skills: int
+    docs: int
+    links: int
+    headings: int
+
+
+SIZES = {
+    "small": Size(runners=2, stages=8, skills=20, docs=40, links=10, headings=8),
+    "medium": Size(runners=5, stages=16, skills=60, docs=200, links=30, headings=20),
+    "large": Size(runners=10, stages=32, skills=150, docs=800, links=60, headings=40),
+}
+
+# (name, command, warm): the command runs from the synthetic root; warm scenarios
+# run once untimed first so their caches are populated, cold ones start without .cache.
+SCENARIOS = [
+    ("generate_adapters --check", ["scripts/adapters/generate_adapters.py", "--check"], False),
+    (
+        "validate_skills",
+        ["scripts/skills/validate_skills.py", "--manifest", "adapters/spec/adapter-manifest.json"],
+        False,
+    ),
+    ("check-markdown-links", ["scripts/check-markdown-links.py", "--root", "."], False),
+    ("checks engine", ["-m", "scripts.checks"], False),
+    ("checks engine (warm)", ["-m", "scripts.checks", "--incremental"], True),
+]
+
+# Runs one scenario inside the measured interpreter and writes its metrics as JSON.
+_CHILD = r"""
+import json, os, resource, runpy, sys, time
+
+root = os.getcwd() + os.sep
+opens = 0
+
+def _audit(event, args):
+    global opens
+    if event == "open" and isinstance(args[0], (str, bytes, os.PathLike)):
+        path = os.path.abspath(os.fsdecode(args[0]))
+        if path.startswith(root) and not path.endswith((".py", ".pyc")):
+            opens += 1
+
+report, *argv = sys.argv[1:]
+sys.path.insert(0, os.getcwd())
+sys.addaudithook(_audit)
+started = time.perf_counter()
+code = 0
+try:
+    if argv[0] == "-m":
+        sys.argv = [argv[1], *argv[2:]]
+        runpy.run_module(argv[1], run_name="__main__", alter_sys=True)
+    else:
+        sys.argv = argv
+        runpy.run_path(argv[0], run_name="__main__")
+except SystemExit as exc:
+    code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+wall = time.perf_counter() - started
+rss = max(
+    resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+)
+if sys.platform == "darwin":
+    rss //= 1024
+with open(report, "w", encoding="utf-8") as handle:
+    json.dump({"code": code, "wall_s": wall, "peak_rss_kb": rss, "opens": opens}, handle)
+"""
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _stage_names(count: int) -> list[str]:
+    # One stage is always "pmatch" so the pmatch adapter checks have something to read.
+    names = [f"stage-{index:03d}" for index in range(1, count + 1)]
+    names[len(names) // 2] = "pmatch"
+    return names
+
+
+def _stage_template(stage: str, gate: str) -> str:
+    lines = [
+        "---",
+        f"name: orchestration-{stage}",
+        f'description: "Run the {stage} stage for {{{{RUNNER_TITLE}}}} and write its gate."',
+        "---",
+        "",
+        f"# {stage} ({{{{RUNNER_TITLE}}}})",
+        "",
+        f"Adapters live under `{{{{ADAPTER_ROOT}}}}`. Write `{gate}` when the stage completes.",
+        "",
+    ]
+    if stage == "pmatch":
+        lines += ["```text", *PMATCH_TOKENS, "```", ""]
+    return "\n".join(lines)
+
+
+def _pipeline_template(stages: list[str]) -> str:
+    lines = [
+        "---",
+        "name: orchestration-pipeline",
+        'description: "Run every stage for {{RUNNER_TITLE}} in order."',
+        "---",
+        "",
+        "# Pipeline ({{RUNNER_TITLE}})",
+        "",
+    ]
+    lines += [f"{index}. `{stage}`" for index, stage in enumerate(stages, 1)]
+    return "\n".join(lines) + "\n"
+
+
+def _skill(name: str, body_lines: int) -> str:
+    step = "follow the {} checklist and record the outcome."
+    body = [f"Step {index}: {step.format(name)}" for index in range(body_lines)]
+    return "\n".join(["---", f"name: {name}", f'description: "Synthetic skill {name}."', "---", "", *body, ""])
+
+
+def _doc(index: int, size: Size) -> str:
+    lines = [f"# Doc {index}", "", "Back to the [index](../README.md).", ""]
+    per_section = max(1, size.links // max(1, size.headings))
+    link = 0
+    for heading in range(1, size.headings + 1):
+        lines += [f"## Section {heading}", ""]
+        for _ in range(per_section):
+            if link >= size.links:
+                break
+            target = (index + link * 7 + 1) % size.docs
+            section = link % size.headings + 1
+            if link % 3 == 0:
+                lines.append(f"See [doc {target}][ref-{link}].")
+                lines.append(f"[ref-{link}]: doc-{target:04d}.md#section-{section}")
+            elif link % 3 == 1:
+                lines.append(
+                    f"Continue in [doc {target}](doc-{target:04d}.md#section-{section}) "
+                    f"or <https://example.com/{link}>."
+                )
+            else:
+                lines.append(f"Jump to [section {section}](#section-{section}) in this doc.")
+            link += 1
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _pathological_doc(index: int) -> str:
+    fences = []
+    for depth in range(200):
+        fence = "`" * (3 + depth % 5)
+        fences += [fence + "markdown", f"[inside fence {depth}](doc-0000.md)", "    " + fence, fence]
+    return "\n".join(
+        [
+            f"# Pathological {index}",
+            "",
+            "## Mismatched closers",
+            "",
+            "](" * 5000 + "[x] " * 2000,
+            "",
+            "## Unclosed brackets",
+            "",
+            "[" * 20000,
+            "",
+            "## Deep fences",
+            "",
+            *fences,
+            "",
+            "Back to the [index](../README.md).",
+            "",
+            # Last, so no later ")" closes them and every opener scans to the end of the file.
+            "## Dangling openers",
+            "",
+            "[a](" * 5000,
+            "",
+        ]
+    )
+
+
+def generate_repo(root: Path, size: Size) -> None:
+    """Write a synthetic repository for ``size`` under ``root`` (generated adapters excluded)."""
+    stages = _stage_names(size.stages)
+    gates = {stage: f"{stage}-gate.json" for stage in stages}
+    runners = []
+    for number in range(1, size.runners + 1):
+        runner = f"runner{number:02d}"
+        skills_root = f"adapters/{runner}/skills"
+        runners.append(
+            {
+                "name": runner,
+                "title": f"Runner {number}",
+                "skills_root": skills_root,
+                "pipeline_skill": f"{skills_root}/orchestration-pipeline/SKILL.md",
+                "stage_adapters": {stage: f"{skills_root}/orchestration-{stage}/SKILL.md" for stage in stages},
+            }
+        )
+        # Hand-written skills fill the root up to K directories alongside the generated ones.
+        for extra in range(max(0, size.skills - len(stages) - 1)):
+            name = f"skill-{extra:04d}"
+            _write(root / skills_root / name / "SKILL.md", _skill(name, 20 + extra % 40))
+
+    manifest = {
+        "version": 1,
+        "stage_order": stages,
+        "expected_gates": gates,
+        "pmatch": {"required_tokens": PMATCH_TOKENS},
+        "generation": {"template_root": "adapters/templates"},
+        "runners": runners,
+    }
+    _write(root / "adapters/spec/adapter-manifest.json", json.dumps(manifest, indent=2) + "\n")
+    for stage in stages:
+        _write(
+            root / f"adapters/templates/skills/orchestration-{stage}/SKILL.md.tmpl",
+            _stage_template(stage, gates[stage]),
+        )
+    _write(root / "adapters/templates/skills/orchestration-pipeline/SKILL.md.tmpl", _pipeline_template(stages))
+
+    schema = {"properties": {"phase": {"enum": QUALITY_GATE_PHASES}}}
+    _write(root / "contracts/quality-gate.schema.json", json.dumps(schema, indent=2) + "\n")
+
+    docs = [f"- [doc {index}](docs/doc-{index:04d}.md)" for index in range(size.docs)]
+    _write(root / "README.md", "\n".join(["# Synthetic repository", "", *docs, ""]))
+    for index in range(size.docs):
+        _write(root / f"docs/doc-{index:04d}.md", _doc(index, size))
+    for index in range(max(1, size.docs // 50)):
+        _write(root / f"docs/pathological-{index:02d}.md", _pathological_doc(index))
+
+    for pattern in SCRIPT_FILES:
+        for source in sorted(REPO_ROOT.glob(pattern)):
+            target = root / source.relative_to(REPO_ROOT)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+
+
+def _measure(root: Path, command: list[str]) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        report = Path(handle.name)
+    try:
+        subprocess.run(
+            [sys.executable, "-c", _CHILD, str(report), *command],
+            cwd=root,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        return json.loads(report.read_text(encoding="utf-8"))
+    finally:
+        report.unlink(missing_ok=True)
+
+
+def run_size(name: str, size: Size, repeat: int, workdir: Path | None, keep: bool) -> dict[str, dict]:
+    root = Path(tempfile.mkdtemp(prefix=f"scripts-bench-{name}-", dir=workdir))
+    try:
+        generate_repo(root, size)
+        subprocess.run(
+            [sys.executable, "scripts/adapters/generate_adapters.py", "--no-cache"],
+            cwd=root,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        results: dict[str, dict] = {}
+        for scenario, command, warm in SCENARIOS:
+            shutil.rmtree(root / ".cache", ignore_errors=True)
+            if warm:
+                _measure(root, command)
+            runs = []
+            for _ in range(repeat):
+                if not warm:
+                    shutil.rmtree(root / ".cache", ignore_errors=True)
+                runs.append(_measure(root, command))
+            failed = [run for run in runs if run["code"] != 0]
+            if failed:
+                raise RuntimeError(f"{name}/{scenario} exited with code {failed[0]['code']} in {root}")
+            results[scenario] = {
+                "wall_s": round(min(run["wall_s"] for run in runs), 4),
+                "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+                "opens": max(run["opens"] for run in runs),
+            }
+        return results
+    finally:
+        if keep:
+            print(f"kept synthetic repository: {root}", file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def machine() -> dict[str, str]:
+    """Where a run was recorded; machine-dependent metrics only compare within one."""
+    return {"host": platform.node(), "platform": platform.platform(), "python": platform.python_version()}
+
+
+def compare(baseline: dict, current: dict, threshold: float, metrics: Iterable[str] = FLOORS) -> list[str]:
+    """Return one message per metric in ``metrics`` that regressed by more than ``threshold``."""
+    floors = {metric: FLOORS[metric] for metric in metrics}
+    regressions: list[str] = []
+    for size, scenarios in current.items():
+        for scenario, metrics in scenarios.items():
+            base = baseline.get(size, {}).get(scenario)
+            if not base:
+                continue
+            for metric, floor in floors.items():
+                old, new = base.get(metric), metrics[metric]
+                if old is None:
+                    continue
+                if new > old * (1 + threshold) and new - old > floor:
+                    growth = (new / old - 1) * 100 if old else 100
+                    regressions.append(f"{size}/{scenario}: {metric} {old} -> {new} (+{growth:.0f}%)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Python maintenance scripts on synthetic repositories."
+    )
+    parser.add_argument(
+        "--sizes",
+        default="small,medium",
+        help=f"Comma-separated size presets to run: {', '.join(SIZES)} (default: small,medium).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per scenario; the fastest is kept (default: 3)."
+    )
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE_PATH,
+        help=f"Baseline JSON, relative to the repository root (default: {DEFAULT_BASELINE_PATH}).",
+    )
+    parser.add_argument("--update", action="store_true", help="Write this run's results as the new baseline.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed fractional increase per metric before failing (default: 0.25).",
+    )
+    parser.add_argument("--output", help="Also write this run's results to PATH as JSON.")
+    parser.add_argument("--workdir", help="Directory for synthetic repositories (default: system temp dir).")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic repositories for inspection.")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.sizes.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SIZES]
+    if unknown or not names:
+        parser.error(f"unknown size preset(s): {', '.join(unknown) or '(none)'}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    current: dict[str, dict] = {}
+    for name in names:
+        try:
+            workdir = Path(args.workdir) if args.workdir else None
+            current[name] = run_size(name, SIZES[name], args.repeat, workdir, args.keep)
+        except (RuntimeError, subprocess.CalledProcessError) as exc:
+            print(f"FAIL: {exc}", file=sys.stderr)
+            return 2
+        print(f"{name}: {SIZES[name]}")
+        for scenario, metrics in current[name].items():
+            print(
+                f"  {scenario}: {metrics['wall_s'] * 1000:.1f}ms, "
+                f"peak RSS {metrics['peak_rss_kb'] / 1024:.1f}MiB, {metrics['opens']} file open(s)"
+            )
+
+    payload = {"version": BASELINE_VERSION, "machine": machine(), "results": current}
+    if args.output:
+        _write(Path(args.output), json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+    baseline_path = REPO_ROOT / args.baseline
+    baseline = None
+    if baseline_path.exists():
+        try:
+            data = json.loads(baseline_path.read_text(encoding="utf-8"))
+        except ValueError:
+            data = None
+        if isinstance(data, dict) and data.get("version") == BASELINE_VERSION:
+            baseline = data
+    if baseline is None or args.update:
+        # Sizes not run this time keep their previous baseline entries.
+        results = {**(baseline or {}).get("results", {}), **current}
+        _write(baseline_path, json.dumps({**payload, "results": results}, indent=2, sort_keys=True) + "\n")
+        print(f"OK: baseline written to {args.baseline}")
+        return 0
+
+    metrics = set(FLOORS)
+    if baseline.get("machine") != payload["machine"]:
+        recorded = baseline.get("machine") or {}
+        metrics -= MACHINE_METRICS
+        print(
+            f"note: baseline recorded on {recorded.get('host', '?')} ({recorded.get('platform', '?')}, "
+            f"Python {recorded.get('python', '?')}); comparing file opens only, "
+            "wall time and RSS are reported above but not gated"
+        )
+    regressions = compare(baseline.get("results", {}), current, args.threshold, sorted(metrics))
+    if regressions:
+        print(f"FAIL: {len(regressions)} metric(s) regressed more than {args.threshold:.0%}:", file=sys.stderr)
+        for entry in regressions:
+            print(f"  - {entry}", file=sys.stderr)
+        return 1
+    print(f"OK: no regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,14 +3,35 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import io
 import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.checks import files, gitobjects, profiling  # noqa: E402
+from scripts.checks.manifest import DEFAULT_CACHE_PATH as MANIFEST_CACHE_PATH  # noqa: E402
+from scripts.checks.manifest import ManifestError, load_manifest  # noqa: E402
 
 
 NAME_RE = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+NAME_FIELD_RE = re.compile(r"^name:\s*(.+?)\s*$")
+DESCRIPTION_FIELD_RE = re.compile(r"^description:\s*(.+?)\s*$")
+DEEP_REF_RE = re.compile(r"\b(assets|references|scripts)/[^\s)]+/[^\s)]+")
+MAX_LINES = 500
+# Bump whenever a validation rule changes so cached results are discarded.
+VALIDATOR_VERSION = 2
+DEFAULT_CACHE_PATH = ".cache/skills/validate-cache.json"
 
 
 @dataclass(frozen=True)
@@ -21,89 +42,307 @@ class SkillError:
 
 def _read_text(path: Path) -> str:
     try:
-        return path.read_text(encoding="utf-8")
+        return files.read_text(path)
     except UnicodeDecodeError:
-        return path.read_text(encoding="utf-8", errors="replace")
-
-
-def _parse_frontmatter(skill_md: Path) -> tuple[str | None, str | None, list[SkillError]]:
-    text = _read_text(skill_md)
-    lines = text.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return None, None, [SkillError(skill_md, "Missing YAML frontmatter (must start with ---).")]
-
-    end_idx = None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            end_idx = i
-            break
-    if end_idx is None:
-        return None, None, [SkillError(skill_md, "Unterminated YAML frontmatter (missing closing ---).")]
-
-    front = "\n".join(lines[1:end_idx])
-    name = None
-    description = None
-
-    for raw in front.splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
-            continue
+        return files.read_text(path, errors="replace")
+
+
+@dataclass
+class _SkillScan:
+    name: str | None = None
+    description: str | None = None
+    frontmatter_error: str | None = None
+    too_long: bool = False
+    deep_ref: str | None = None
+
+
+def _scan_lines(lines: Iterable[str]) -> _SkillScan:
+    """Scan SKILL.md content once, line by line.
+
+    Frontmatter fields, the line count and the first deep file reference are all
+    collected in the same pass. Scanning stops as soon as the content is known to
+    exceed MAX_LINES (or, when the frontmatter is still open, at its closing
+    ``---``), so memory and I/O stay bounded for oversized files.
+    """
+    scan = _SkillScan()
+    newlines = 0
+    scanned = 0
+    state = "start"
+    for scanned, line in enumerate(lines, 1):
+        if line.endswith("\n"):
+            newlines += 1
+
+        if state == "start":
+            state = "front" if line.strip() == "---" else "body"
+            if state == "body":
+                scan.frontmatter_error = "Missing YAML frontmatter (must start with ---)."
+        elif state == "front":
+            stripped = line.strip()
+            if stripped == "---":
+                state = "body"
+            elif stripped and not stripped.startswith("#"):
+                m = NAME_FIELD_RE.match(stripped) if scan.name is None else None
+                if m:
+                    scan.name = m.group(1).strip().strip('"').strip("'")
+                elif scan.description is None:
+                    m = DESCRIPTION_FIELD_RE.match(stripped)
+                    if m:
+                        scan.description = m.group(1).strip().strip('"').strip("'")
+
+        if scan.deep_ref is None:
+            deep_ref = DEEP_REF_RE.search(line)
+            if deep_ref:
+                scan.deep_ref = deep_ref.group(0)
+
+        if newlines >= MAX_LINES:
+            scan.too_long = True
+            # Frontmatter still open: read on to its closing line so it is not reported as unterminated.
+            if state != "front":
+                break
+
+    profiling.count("skills.scans")
+    profiling.count("skills.lines_scanned", scanned)
+    if state == "start":
+        scan.frontmatter_error = "Missing YAML frontmatter (must start with ---)."
+    elif state == "front":
+        scan.frontmatter_error = "Unterminated YAML frontmatter (missing closing ---)."
+        scan.name = None
+        scan.description = None
+    return scan
+
+
+def _scan_messages(scan: _SkillScan, dir_name: str) -> list[str]:
+    messages: list[str] = []
+    name = scan.name
+    description = scan.description
+    if scan.frontmatter_error:
+        messages.append(scan.frontmatter_error)
+    else:
         if name is None:
-            m = re.match(r"^name:\s*(.+?)\s*$", line)
-            if m:
-                name = m.group(1).strip().strip('"').strip("'")
-                continue
+            messages.append("Frontmatter missing required field: name")
         if description is None:
-            m = re.match(r"^description:\s*(.+?)\s*$", line)
-            if m:
-                description = m.group(1).strip().strip('"').strip("'")
-                continue
-
-    errors: list[SkillError] = []
-    if name is None:
-        errors.append(SkillError(skill_md, "Frontmatter missing required field: name"))
-    if description is None:
-        errors.append(SkillError(skill_md, "Frontmatter missing required field: description"))
-    return name, description, errors
-
-
-def _validate_skill_dir(skill_dir: Path) -> list[SkillError]:
-    errors: list[SkillError] = []
-    skill_md = skill_dir / "SKILL.md"
-    if not skill_md.exists():
-        errors.append(SkillError(skill_dir, "Missing SKILL.md"))
-        return errors
-
-    name, description, fm_errors = _parse_frontmatter(skill_md)
-    errors.extend(fm_errors)
+            messages.append("Frontmatter missing required field: description")
 
     if name is not None:
         if len(name) > 64:
-            errors.append(SkillError(skill_md, f"name too long ({len(name)} > 64)"))
+            messages.append(f"name too long ({len(name)} > 64)")
         if not NAME_RE.match(name):
-            errors.append(SkillError(skill_md, f"Invalid name: {name!r}"))
-        if name != skill_dir.name:
-            errors.append(SkillError(skill_md, f"name {name!r} does not match directory {skill_dir.name!r}"))
+            messages.append(f"Invalid name: {name!r}")
+        if name != dir_name:
+            messages.append(f"name {name!r} does not match directory {dir_name!r}")
 
     if description is not None and not (1 <= len(description) <= 1024):
-        errors.append(SkillError(skill_md, f"description length out of range ({len(description)}; must be 1..1024)"))
+        messages.append(f"description length out of range ({len(description)}; must be 1..1024)")
+
+    if scan.too_long:
+        messages.append(f"SKILL.md too long (more than {MAX_LINES} lines)")
 
-    body = _read_text(skill_md)
-    line_count = body.count("\n") + 1
-    if line_count > 500:
-        errors.append(SkillError(skill_md, f"SKILL.md too long ({line_count} lines > 500)"))
+    if scan.deep_ref:
+        messages.append(f"Deep file reference found: {scan.deep_ref!r}")
 
-    deep_ref = re.search(r"\b(assets|references|scripts)/[^\s)]+/[^\s)]+", body)
-    if deep_ref:
-        errors.append(SkillError(skill_md, f"Deep file reference found: {deep_ref.group(0)!r}"))
+    return messages
 
-    return errors
+
+def validate_skill_text(text: str, dir_name: str) -> list[str]:
+    """Validate in-memory SKILL.md ``text`` as if it lived in a directory named ``dir_name``."""
+    return _scan_messages(_scan_lines(io.StringIO(text, newline="\n")), dir_name)
+
+
+def validate_skill_dir(skill_dir: Path) -> list[SkillError]:
+    skill_md = skill_dir / "SKILL.md"
+    try:
+        with skill_md.open(encoding="utf-8", errors="replace", newline="\n") as handle:
+            scan = _scan_lines(handle)
+    except FileNotFoundError:
+        return [SkillError(skill_dir, "Missing SKILL.md")]
+    return [SkillError(skill_md, message) for message in _scan_messages(scan, skill_dir.name)]
+
+
+class ValidationCache:
+    """Content-addressed validation results, persisted between runs.
+
+    ``files`` maps a SKILL.md path to the (mtime, size) it had when its digest was
+    taken; ``results`` maps ``<digest>:<directory name>`` to the error messages for
+    that content (the directory name matters for the name-match rule). A file whose
+    stat is unchanged costs one ``stat`` call; identical copies are validated once.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.files: dict[str, dict] = {}
+        self.results: dict[str, list[str]] = {}
+        self.dirty = False
+        if path is None or not path.exists():
+            return
+        try:
+            data = json.loads(_read_text(path))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == VALIDATOR_VERSION:
+            if isinstance(data.get("files"), dict):
+                self.files = data["files"]
+            if isinstance(data.get("results"), dict):
+                self.results = data["results"]
+
+    def known_digest(self, key: str, stat: os.stat_result) -> str | None:
+        entry = self.files.get(key)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return entry.get("digest")
+        return None
+
+    def remember_file(self, key: str, stat: os.stat_result, digest: str) -> None:
+        self.files[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": digest}
+        self.dirty = True
+
+    def remember_result(self, result_key: str, messages: list[str]) -> None:
+        self.results[result_key] = messages
+        self.dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        live = {entry.get("digest") for entry in self.files.values()}
+        results = {key: value for key, value in self.results.items() if key.split(":", 1)[0] in live}
+        payload = {"version": VALIDATOR_VERSION, "files": dict(sorted(self.files.items())), "results": results}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".partial")
+        tmp.write_text(json.dumps(payload, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+        tmp.replace(self.path)
+
+
+def _validate_text_job(job: tuple[str, str]) -> tuple[list[str], float]:
+    started = time.perf_counter()
+    messages = validate_skill_text(*job)
+    return messages, time.perf_counter() - started
+
+
+def _validate_cached(
+    skill_dirs: list[Path], cache: ValidationCache, jobs: int
+) -> list[tuple[list[SkillError], float]]:
+    """Validate ``skill_dirs`` through ``cache``, in order.
+
+    Only content not already in the cache is validated, once per unique
+    (digest, directory name), optionally on a process pool.
+    """
+    pending: dict[str, tuple[str, str]] = {}
+    plan: list[tuple[Path, str | None, float]] = []
+    for skill_dir in skill_dirs:
+        started = time.perf_counter()
+        skill_md = skill_dir / "SKILL.md"
+        try:
+            stat = skill_md.stat()
+        except FileNotFoundError:
+            plan.append((skill_dir, None, time.perf_counter() - started))
+            continue
+        file_key = os.path.abspath(skill_md)
+        digest = cache.known_digest(file_key, stat)
+        data: bytes | None = None
+        profiling.count("skills.cache.stat_hits" if digest is not None else "skills.cache.stat_misses")
+        if digest is None:
+            data = files.read_bytes(skill_md)
+            digest = hashlib.sha256(data).hexdigest()
+            cache.remember_file(file_key, stat, digest)
+        result_key = f"{digest}:{skill_dir.name}"
+        hit = result_key in cache.results
+        profiling.count("skills.cache.result_hits" if hit else "skills.cache.result_misses")
+        if not hit and result_key not in pending:
+            if data is None:
+                data = files.read_bytes(skill_md)
+            pending[result_key] = (data.decode("utf-8", errors="replace"), skill_dir.name)
+        plan.append((skill_dir, result_key, time.perf_counter() - started))
+
+    spent: dict[str, float] = {}
+    if pending:
+        keys = list(pending)
+        jobs_in = [pending[key] for key in keys]
+        if jobs > 1 and len(jobs_in) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                outcomes = list(pool.map(_validate_text_job, jobs_in))
+        else:
+            outcomes = [_validate_text_job(job) for job in jobs_in]
+        for key, (messages, seconds) in zip(keys, outcomes):
+            cache.remember_result(key, messages)
+            spent[key] = seconds
+
+    results: list[tuple[list[SkillError], float]] = []
+    for skill_dir, result_key, seconds in plan:
+        if result_key is None:
+            results.append(([SkillError(skill_dir, "Missing SKILL.md")], seconds))
+            continue
+        skill_md = skill_dir / "SKILL.md"
+        errors = [SkillError(skill_md, message) for message in cache.results[result_key]]
+        results.append((errors, seconds + spent.pop(result_key, 0.0)))
+    return results
 
 
 def _iter_skill_dirs(root: Path) -> list[Path]:
-    if not root.exists():
+    try:
+        with os.scandir(root) as entries:
+            names = [entry.name for entry in entries if entry.is_dir() and not entry.name.startswith(".")]
+    except (FileNotFoundError, NotADirectoryError):
         return []
-    return sorted([p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")])
+    return [root / name for name in sorted(names)]
+
+
+def _discover_roots(roots: list[Path]) -> tuple[list[tuple[Path, list[Path]]], list[Path]]:
+    """Split ``roots`` into (root, skill directories) pairs and the roots that are missing or empty."""
+    per_root: list[tuple[Path, list[Path]]] = []
+    missing_roots: list[Path] = []
+    for root in roots:
+        skill_dirs = _iter_skill_dirs(root)
+        if skill_dirs:
+            per_root.append((root, skill_dirs))
+        else:
+            missing_roots.append(root)
+    return per_root, missing_roots
+
+
+def _timed_validate(skill_dir: Path) -> tuple[list[SkillError], float]:
+    started = time.perf_counter()
+    errors = validate_skill_dir(skill_dir)
+    return errors, time.perf_counter() - started
+
+
+def _validate_staged(roots: list[Path]) -> tuple[list[SkillError], int]:
+    """Validate the skills under ``roots`` touched by staged changes, reading SKILL.md from the index.
+
+    A touched skill directory whose index entries no longer include SKILL.md is
+    reported as missing it; one with no index entries left was removed and is skipped.
+    """
+    top = gitobjects.toplevel(Path.cwd()).resolve()
+    prefixes: dict[str, Path] = {}
+    for root in roots:
+        try:
+            prefixes[root.resolve().relative_to(top).as_posix() + "/"] = root
+        except ValueError:
+            continue
+    changed, deleted = gitobjects.staged_changes(top)
+    touched: dict[str, Path] = {}
+    for path in changed + deleted:
+        for prefix, root in prefixes.items():
+            if not path.startswith(prefix):
+                continue
+            name, sep, _ = path[len(prefix) :].partition("/")
+            if sep and not name.startswith("."):
+                touched[f"{prefix}{name}"] = root / name
+    if not touched:
+        return [], 0
+
+    index = gitobjects.index_paths(top)
+    present = {skill for skill in touched if any(path.startswith(skill + "/") for path in index)}
+    with gitobjects.BlobReader(top) as reader:
+        blobs = reader.read_many([f":{skill}/SKILL.md" for skill in sorted(present)])
+    errors: list[SkillError] = []
+    for skill in sorted(present):
+        skill_dir = touched[skill]
+        data = blobs.get(f":{skill}/SKILL.md")
+        if data is None:
+            errors.append(SkillError(skill_dir, "Missing SKILL.md"))
+            continue
+        text = data.decode("utf-8", errors="replace")
+        messages = validate_skill_text(text, skill_dir.name)
+        errors.extend(SkillError(skill_dir / "SKILL.md", message) for message in messages)
+    return errors, len(present)
 
 
 def _parse_roots(args: argparse.Namespace) -> list[Path]:
@@ -114,11 +353,12 @@ def _parse_roots(args: argparse.Namespace) -> list[Path]:
         if not manifest_path.exists():
             print(f"Manifest not found: {manifest_path}", file=sys.stderr)
             raise SystemExit(2)
-        manifest = json.loads(_read_text(manifest_path))
-        for runner in manifest.get("runners", []):
-            skills_root = runner.get("skills_root")
-            if skills_root:
-                chunks.append(skills_root)
+        try:
+            manifest = load_manifest(REPO_ROOT, manifest_path, REPO_ROOT / MANIFEST_CACHE_PATH)
+        except ManifestError as exc:
+            print(exc, file=sys.stderr)
+            raise SystemExit(2)
+        chunks.extend(runner.skills_root.rel for runner in manifest.runners.values())
 
     if args.roots:
         chunks.extend(args.roots.split(","))
@@ -141,7 +381,7 @@ def _parse_roots(args: argparse.Namespace) -> list[Path]:
     return cleaned
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Validate skill roots against AgentSkills constraints.")
     parser.add_argument(
         "--roots",
@@ -157,25 +397,79 @@ def main() -> int:
         "--manifest",
         help="Optional adapter manifest path. If set, include all runner skills_root entries.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Validate skill directories with N worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and do not update the validation result cache ({DEFAULT_CACHE_PATH}).",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Validate only skills touched by staged changes, reading SKILL.md from the git index.",
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.start("validate_skills", args, argv)
 
-    roots = _parse_roots(args)
+    with profiling.phase("skills.manifest_load"):
+        roots = _parse_roots(args)
     if not roots:
         print("No skill roots resolved from arguments.", file=sys.stderr)
         return 2
 
+    if args.staged:
+        try:
+            with profiling.phase("skills.staged"):
+                staged_errors, checked = _validate_staged(roots)
+        except gitobjects.GitError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        if staged_errors:
+            for error in staged_errors:
+                print(f"{error.path}: {error.message}", file=sys.stderr)
+            print(f"\nFAIL: {len(staged_errors)} error(s)", file=sys.stderr)
+            return 1
+        print(f"OK: validated {checked} staged skill(s) across {len(roots)} root(s)")
+        return 0
+
     all_errors: list[SkillError] = []
     total_skills = 0
-    missing_roots: list[Path] = []
-
-    for root in roots:
-        skill_dirs = _iter_skill_dirs(root)
-        if not skill_dirs:
-            missing_roots.append(root)
-            continue
+    timings: list[tuple[Path, int, float]] = []
+
+    with profiling.phase("skills.discover"):
+        per_root, missing_roots = _discover_roots(roots)
+
+    flat = [skill_dir for _, skill_dirs in per_root for skill_dir in skill_dirs]
+    if not args.no_cache:
+        with profiling.phase("skills.cache_load"):
+            cache = ValidationCache(REPO_ROOT / DEFAULT_CACHE_PATH)
+        with profiling.phase("skills.validate"):
+            results = iter(_validate_cached(flat, cache, args.jobs))
+        with profiling.phase("skills.cache_save"):
+            cache.save()
+    elif args.jobs > 1 and len(flat) > 1:
+        chunksize = max(1, len(flat) // (args.jobs * 4))
+        with profiling.phase("skills.validate"), ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = iter(list(pool.map(_timed_validate, flat, chunksize=chunksize)))
+    else:
+        with profiling.phase("skills.validate"):
+            results = iter([_timed_validate(skill_dir) for skill_dir in flat])
+
+    # Results come back in submission order, so errors merge exactly as in a serial run.
+    for root, skill_dirs in per_root:
         total_skills += len(skill_dirs)
-        for skill_dir in skill_dirs:
-            all_errors.extend(_validate_skill_dir(skill_dir))
+        elapsed = 0.0
+        for _ in skill_dirs:
+            errors, seconds = next(results)
+            all_errors.extend(errors)
+            elapsed += seconds
+        timings.append((root, len(skill_dirs), elapsed))
 
     if missing_roots:
         for root in missing_roots:
@@ -183,6 +477,10 @@ def main() -> int:
         print(f"\nFAIL: {len(missing_roots)} root(s) missing or empty", file=sys.stderr)
         return 2
 
+    print("timing per root:")
+    for root, count, elapsed in timings:
+        print(f"  {root}: {count} skill(s) in {elapsed * 1000:.1f}ms")
+
     if all_errors:
         for error in all_errors:
             print(f"{error.path}: {error.message}", file=sys.stderr)
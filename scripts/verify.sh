@@ -45,12 +45,15 @@ step_fail() { echo -e "${RED}FAIL${NC}: $1"; }
 step_info() { echo -e "${BOLD}==> $1${NC}"; }
 
 run_core_checks() {
-  python3 "$root_dir/scripts/skills/validate_skills.py" --manifest "$root_dir/adapters/spec/adapter-manifest.json"
+  local check_args=()
+  if [ "$CHANGED_ONLY" -eq 1 ]; then
+    check_args+=(--incremental)
+  fi
   "$root_dir/scripts/check-no-stale-refs.sh"
   "$root_dir/scripts/check-repo-hygiene.sh"
-  python3 "$root_dir/scripts/check-markdown-links.py" --root "$root_dir"
-  "$root_dir/scripts/check-adapter-sync.sh"
-  "$root_dir/scripts/check-orchestration-integrity.sh"
+  # Skills, links, adapter sync and orchestration integrity share one interpreter.
+  # The guarded expansion keeps an empty array legal under `set -u` on bash < 4.4.
+  (cd "$root_dir" && python3 -m scripts.checks ${check_args[@]+"${check_args[@]}"})
 }
 
 collect_changed_paths() {